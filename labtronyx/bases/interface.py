@@ -20,7 +20,20 @@ Interfaces require some attributes to be defined
 
    * `interfaceName` - str that names the interface.
    * `enumerable` - True if the interface supports resource enumeration. If False, the interface should implement the
-     :func:`openResource` method to manually open a resource given a string identifier.
+     :func:`getResource` method to manually open a resource given a string identifier.
+
+Enumeration
+-----------
+
+Enumerable interfaces implement two hooks:
+
+   * :func:`InterfaceBase.list_devices` - returns the identifiers of all devices currently known to the system
+   * :func:`InterfaceBase.createResource` - creates a resource object for a device identifier
+
+:func:`InterfaceBase.refresh` takes a single device listing and reconciles it with the resources owned by the
+interface. Resources are created for new devices and resources for devices that have disappeared are destroyed. A
+`resource.created` or `resource.destroyed` event is published for each resource, followed by a single
+`interface.changed` event with the UUIDs of all created and destroyed resources.
 """
 # Package relative imports
 from ..common import events
@@ -49,6 +62,9 @@ class InterfaceBase(PluginBase):
 
         self._manager = manager
 
+        # Resource objects by resource identifier
+        self._resource_index = {}
+
     @property
     def manager(self):
         return self._manager
@@ -64,6 +80,24 @@ class InterfaceBase(PluginBase):
                 in self.manager.plugin_manager.getPluginInstancesByType('resource').items()
                 if plugCls.interfaceName == self.interfaceName}
 
+    @property
+    def resources_by_id(self):
+        """
+        Dictionary of resource objects by resource identifier. Only includes resources created by the interface.
+
+        :rtype: dict{str: labtronyx.bases.resource.ResourceBase}
+        """
+        for resID, res_obj in self._resource_index.items():
+            # Drop resources that were destroyed without going through the interface
+            try:
+                if self.manager.plugin_manager.getPluginInstance(res_obj.uuid) is not res_obj:
+                    del self._resource_index[resID]
+
+            except KeyError:
+                del self._resource_index[resID]
+
+        return dict(self._resource_index)
+
     def getProperties(self):
         """
         Get the interface properties
@@ -79,11 +113,102 @@ class InterfaceBase(PluginBase):
 
     def refresh(self):
         """
-        Macro for interfaces that support enumeration. Calls `enumerate` then `prune` to get an updated list of
-        resources available to the interface
+        Get an updated list of resources available to the interface. Reconciles resources with a single device
+        listing if the interface implements :func:`list_devices`, otherwise calls `enumerate` then `prune`.
+        """
+        if self._implements('list_devices'):
+            self.reconcile()
+
+        else:
+            self.enumerate()
+            self.prune()
+
+    def reconcile(self, create=True, destroy=True):
+        """
+        Reconcile resources with the devices returned by :func:`list_devices`. New devices and missing devices are
+        found using set differences against the resource index, then resources are created and destroyed in bulk. A
+        `resource.created` or `resource.destroyed` event is published for each resource, followed by a single
+        `interface.changed` event if any resources were created or destroyed.
+
+        :param create:      Create resources for new devices
+        :type create:       bool
+        :param destroy:     Destroy resources for devices that are no longer listed
+        :type destroy:      bool
+        :returns:           UUIDs of created resources, UUIDs of destroyed resources
+        :rtype:             tuple(list, list)
+        :raises:            NotImplementedError if the interface does not implement `list_devices` or `createResource`
         """
-        self.enumerate()
-        self.prune()
+        # Check for support before anything is created or destroyed
+        if not self._implements('list_devices'):
+            raise NotImplementedError("Interface %s cannot list devices" % self.interfaceName)
+
+        if create and not self._implements('createResource'):
+            raise NotImplementedError("Interface %s cannot create resources" % self.interfaceName)
+
+        devices = set(self.list_devices())
+        known = self.resources_by_id
+
+        created = []
+        destroyed = []
+
+        if create:
+            for resID in sorted(devices.difference(known)):
+                try:
+                    res_obj = self.createResource(resID)
+
+                except ResourceUnavailable:
+                    continue
+
+                except InterfaceError as e:
+                    # One bad device should not prevent the rest from being reconciled
+                    self.logger.debug("Unable to create resource %s: %s", resID, e)
+                    continue
+
+                self._resource_index[resID] = res_obj
+                created.append(res_obj.uuid)
+
+                self.manager._publishEvent(events.EventCodes.resource.created, res_obj.uuid)
+
+        if destroy:
+            for resID in sorted(set(known).difference(devices)):
+                res_obj = known[resID]
+
+                self._destroyResource(res_obj)
+                destroyed.append(res_obj.uuid)
+
+                self.manager._publishEvent(events.EventCodes.resource.destroyed, res_obj.uuid)
+
+        if len(created) > 0 or len(destroyed) > 0:
+            self.logger.debug("Interface %s: %d resources created, %d resources destroyed",
+                              self.interfaceName, len(created), len(destroyed))
+
+            self.manager._publishEvent(events.EventCodes.interface.changed, self.interfaceName, created, destroyed)
+
+        return created, destroyed
+
+    def _implements(self, name):
+        # True if the interface overrides the hook `name` defined by InterfaceBase
+        method = getattr(type(self), name)
+        return getattr(method, '__func__', method) is not InterfaceBase.__dict__[name]
+
+    def _addResource(self, res_obj):
+        """
+        Add a resource created outside of :func:`reconcile` to the resource index and publish the `resource.created`
+        event.
+
+        :param res_obj:     Resource object
+        :type res_obj:      labtronyx.bases.resource.ResourceBase
+        """
+        self._resource_index[res_obj.resID] = res_obj
+
+        self.manager._publishEvent(events.EventCodes.resource.created, res_obj.uuid)
+
+    def _destroyResource(self, res_obj):
+        # Close and destroy a resource without publishing events
+        res_obj.close()
+
+        self.manager.plugin_manager.destroyPluginInstance(res_obj.uuid)
+        self._resource_index.pop(res_obj.resID, None)
 
     # ==========================================================================
     # Interface Methods
@@ -110,9 +235,7 @@ class InterfaceBase(PluginBase):
         :rtype: bool
         """
         for res_uuid, res_obj in self.resources.items():
-            res_obj.close()
-
-            self.manager.plugin_manager.destroyPluginInstance(res_uuid)
+            self._destroyResource(res_obj)
 
         return True
 
@@ -124,13 +247,37 @@ class InterfaceBase(PluginBase):
         """
         Refreshes the resource list by enumerating all of the available devices on the interface.
         """
-        pass
+        if self._implements('list_devices') and self._implements('createResource'):
+            self.reconcile(destroy=False)
 
     def prune(self):
         """
         Clear out any resources that are no longer known to the interface
         """
-        pass
+        if self._implements('list_devices'):
+            self.reconcile(create=False)
+
+    def list_devices(self):
+        """
+        Get the identifiers of all devices currently known to the interface. Implemented by enumerable interfaces.
+
+        :returns:       Resource identifiers
+        :rtype:         list[str]
+        :raises:        NotImplementedError if the interface cannot list devices
+        """
+        raise NotImplementedError
+
+    def createResource(self, resID):
+        """
+        Create a resource object for a device identifier. Used by :func:`reconcile`, events are published by the
+        caller. Implemented by enumerable interfaces.
+
+        :param resID:   Resource Identifier
+        :type resID:    str
+        :return:        object
+        :raises:        ResourceUnavailable
+        """
+        raise NotImplementedError
 
     def getResource(self, resID):
         """
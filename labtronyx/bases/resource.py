@@ -57,13 +57,74 @@ accessed directly from the resource object as if they were a single object. Some
    method returns a non-serializable data type, the method should be prefixed with an underscore ('_') to mark it as a
    protected function that cannot be accessed remotely.
 
+Asynchronous Operations
+-----------------------
+
+Resources may be used by several threads at once, such as RPC server threads, scripts and the GUI. Each resource has an
+I/O lock that is held for the duration of each data transmission method, so a query from one thread cannot interleave
+with a write from another thread.
+
+Operations can also be submitted to a dedicated I/O worker owned by the resource using :func:`ResourceBase.submit`, or
+the :func:`ResourceBase.write_async` and :func:`ResourceBase.query_async` shortcuts. Operations are executed in priority
+order, so interactive requests preempt queued bulk transfers at command boundaries. A `Future` is returned for each
+operation, which makes these methods usable only locally.
+
+Session Management
+------------------
+
+Opening a resource can be expensive. To avoid opening and closing the resource for every operation, the session manager
+can be enabled with :func:`ResourceBase.enableSessionManager`. While enabled, the resource is opened on first use and
+kept open until it has not been used for the idle timeout. Users that need the resource to stay open can use the
+resource as a context manager, nested users are reference counted::
+
+    with instr:
+        instr.write('*RST')
+
+Another process that needs the resource can call :func:`ResourceBase.requestRelease` to close it as soon as it is no
+longer in use.
+
+Tracing
+-------
+
+Each transfer made by a resource can be recorded in a trace ring buffer for debugging and latency analysis. Tracing is
+disabled by default and costs almost nothing while disabled. See :func:`ResourceBase.enableTrace`.
+
+A complete transcript of a session with an instrument, including the latency of each transfer, can be recorded with
+:func:`ResourceBase.startRecording` and :func:`ResourceBase.stopRecording`. Transcripts can be replayed without the
+instrument using the Replay interface.
+
+Adaptive Timeouts
+-----------------
+
+Resources can set the timeout of each transfer from the latency previously observed for the same command, see
+:func:`ResourceBase.enableAdaptiveTimeout`. A timeout passed explicitly to a read or query always takes priority.
+
+Health
+------
+
+A device that is powered off may still appear to be connected, so every transfer would wait for the full timeout. A
+circuit breaker that opens after a number of consecutive timeouts can be enabled with
+:func:`ResourceBase.enableCircuitBreaker`. It is disabled by default, because commands that are expected to time out,
+such as identification attempts and status polling, would open the breaker for a healthy device. While the breaker is
+open, reads and queries fail immediately with :class:`labtronyx.InterfaceTimeout`. The resource probes the device in the
+background and closes the breaker once the device responds again. The state of the breaker is available as the `health`
+property and changes are published as `resource.health.changed` events.
+
 Resources may implement more functions than just those which are defined in the API below, see the interface and
 resource class documentation to learn more.
 """
+import threading
+import time
+
 # Package relative imports
 from ..common import events
 from ..common.errors import *
 from ..common.plugin import PluginBase, PluginAttribute
+from ..common.ioqueue import IOWorker
+from ..common.rpc import local_only
+from ..common.trace import TraceBuffer, NULL_TRACE, save_transcript
+from ..common.latency import LatencyTracker, LatencyTimer
+from ..common.breaker import CircuitBreaker
 
 __all__ = ['ResourceBase']
 
@@ -83,6 +144,14 @@ class ResourceBase(PluginBase):
     """
     pluginType = 'resource'
     interfaceName = PluginAttribute(attrType=str, required=True)
+
+    # Priorities for asynchronous operations, lower values are executed first
+    PRIORITY_INTERACTIVE = 0
+    PRIORITY_NORMAL = 10
+    PRIORITY_BULK = 20
+
+    # Timeout (in seconds) for background health probes
+    PROBE_TIMEOUT = 0.25
     
     def __init__(self, manager, resID, **kwargs):
         super(ResourceBase, self).__init__(**kwargs)
@@ -92,6 +161,31 @@ class ResourceBase(PluginBase):
 
         # Instance variables
         self._driver = None
+
+        # Serializes data transmission between threads
+        self._io_lock = threading.RLock()
+        self._io_worker = None
+        self._io_worker_lock = threading.Lock()
+
+        # Session manager
+        self._session_timeout = None # Disabled
+        self._session_users = 0
+        self._session_last_used = 0.0
+        self._session_release = False
+        self._session_timer = None
+        self._session_lock = threading.Lock()
+
+        # Wire-level trace
+        self._trace_buffer = None # Disabled
+        self._recording = False
+
+        # Adaptive timeouts
+        self._latency = None # Disabled
+        self._last_command = None
+
+        # Health
+        self._breaker = None # Disabled
+        self._probe_timer = None
             
     def __del__(self):
         try:
@@ -100,8 +194,15 @@ class ResourceBase(PluginBase):
             pass
         
     def __getattr__(self, name):
+        # Avoid infinite recursion if the resource was only partially initialized
+        if name == '_driver':
+            raise AttributeError(name)
+
         if self._driver is not None:
             if hasattr(self._driver, name):
+                # Open the resource on first use if the session manager is enabled
+                self._sessionUse()
+
                 # Only call driver functions if the resource is open
                 if self.isOpen():
                     return getattr(self._driver, name)
@@ -117,10 +218,37 @@ class ResourceBase(PluginBase):
             raise AttributeError
 
     def __enter__(self):
-        self.open()
+        with self._session_lock:
+            self._session_users += 1
+
+        try:
+            if not self.isOpen():
+                self.open()
+
+        except:
+            self.__exit__(None, None, None)
+            raise
+
+        return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+        with self._session_lock:
+            self._session_users -= 1
+            users = self._session_users
+
+        self._session_last_used = time.time()
+
+        if users == 0:
+            if self._session_timeout is None or self._session_release:
+                # The worker waits for the I/O lock, it must be stopped before the lock is held
+                self._stopIOWorker()
+
+                with self._io_lock:
+                    self._session_release = False
+                    self.close()
+
+            else:
+                self._armSessionTimer(self._session_timeout)
 
     @property
     def manager(self):
@@ -147,7 +275,8 @@ class ResourceBase(PluginBase):
         res_prop = PluginBase.getProperties(self)
         res_prop.update({
             'interfaceName': self.interfaceName,
-            'resourceID': self._resID
+            'resourceID': self._resID,
+            'health': self.getHealth()
         })
 
         if self._driver is not None:
@@ -192,16 +321,451 @@ class ResourceBase(PluginBase):
     
     def close(self):
         """
-        Close the resource
+        Close the resource. Any asynchronous operations that have not started will fail.
         
         :returns: True if close was successful, False otherwise
         """
+        self._stopIOWorker()
+
         if self._driver is not None:
             return self._driver.close()
 
         else:
             return True
 
+    #===========================================================================
+    # Session Management
+    #===========================================================================
+
+    def enableSessionManager(self, idle_timeout=5.0):
+        """
+        Enable the session manager. The resource will be opened on first use and closed after it has not been used for
+        `idle_timeout` seconds.
+
+        :param idle_timeout:    Idle time (in seconds) before the resource is closed
+        :type idle_timeout:     float
+        """
+        self._session_timeout = float(idle_timeout)
+
+        if self.isOpen():
+            self._sessionUse()
+
+    def disableSessionManager(self):
+        """
+        Disable the session manager. The resource is left in its current state.
+        """
+        self._session_timeout = None
+
+        with self._session_lock:
+            if self._session_timer is not None:
+                self._session_timer.cancel()
+                self._session_timer = None
+
+    def requestRelease(self):
+        """
+        Request that the resource be closed as soon as it is no longer in use, so that it can be used by another
+        process. If the resource is not in use, it is closed immediately.
+        """
+        if self._session_users > 0:
+            self._session_release = True
+            return
+
+        self._stopIOWorker()
+
+        with self._io_lock:
+            if self._session_users > 0:
+                self._session_release = True
+
+            else:
+                self._session_release = False
+                self.close()
+
+    def _sessionUse(self):
+        # Called on each use of the resource, opens the resource if needed and keeps the session alive
+        if self._session_timeout is None:
+            return
+
+        self._session_last_used = time.time()
+
+        if not self.isOpen():
+            self.logger.debug("Opening session for resource [%s]", self._resID)
+            self.open()
+
+        if self._session_users == 0:
+            self._armSessionTimer(self._session_timeout)
+
+    def _sessionClose(self):
+        # Close the resource unless the session manager is keeping the session alive
+        if self._session_timeout is None:
+            return self.close()
+
+        return True
+
+    def _armSessionTimer(self, delay):
+        # A single timer is used, it is re-armed for the remaining time when it expires if the resource was used
+        with self._session_lock:
+            if self._session_timer is None:
+                self._session_timer = threading.Timer(delay, self._sessionIdle)
+                self._session_timer.setDaemon(True)
+                self._session_timer.start()
+
+    def _sessionIdle(self):
+        with self._session_lock:
+            self._session_timer = None
+
+        if self._session_timeout is None or self._session_users > 0:
+            return
+
+        remaining = self._session_last_used + self._session_timeout - time.time()
+
+        if remaining > 0:
+            self._armSessionTimer(remaining)
+            return
+
+        self._stopIOWorker()
+
+        with self._io_lock:
+            if self._session_timeout is None or self._session_users > 0:
+                return
+
+            remaining = self._session_last_used + self._session_timeout - time.time()
+
+            if remaining > 0:
+                self._armSessionTimer(remaining)
+
+            elif self.isOpen():
+                self.logger.debug("Closing idle session for resource [%s]", self._resID)
+                self.close()
+
+    def _stopIOWorker(self):
+        # Waits for the operation in progress. Must not be called while holding the I/O lock, as the worker holds it
+        # while each operation executes
+        with self._io_worker_lock:
+            io_worker, self._io_worker = self._io_worker, None
+
+        if io_worker is not None:
+            io_worker.stop()
+
+    #===========================================================================
+    # Tracing
+    #===========================================================================
+
+    def enableTrace(self, size=1000, data_length=64):
+        """
+        Start recording every transfer made by the resource. Existing trace entries are discarded.
+
+        :param size:            Maximum number of entries to keep. The oldest entries are discarded when full
+        :type size:             int
+        :param data_length:     Maximum number of bytes of data to keep for each entry
+        :type data_length:      int
+        """
+        self._trace_buffer = TraceBuffer(int(size), int(data_length))
+        self._recording = False
+
+    def disableTrace(self):
+        """
+        Stop recording transfers. Existing trace entries are discarded.
+        """
+        self._trace_buffer = None
+        self._recording = False
+
+    def isTraceEnabled(self):
+        """
+        Check if transfers are being recorded
+
+        :rtype:                 bool
+        """
+        return self._trace_buffer is not None
+
+    def getTrace(self):
+        """
+        Get all recorded transfers, oldest first. See :class:`labtronyx.common.trace.TraceBuffer` for a description of
+        each entry.
+
+        :rtype:                 list of dict
+        """
+        if self._trace_buffer is None:
+            return []
+
+        return self._trace_buffer.getEntries()
+
+    def clearTrace(self):
+        """
+        Discard all recorded transfers
+        """
+        if self._trace_buffer is not None:
+            self._trace_buffer.clear()
+
+    def exportTrace(self, filename):
+        """
+        Export all recorded transfers to a CSV file
+
+        :param filename:        Filename
+        :type filename:         str
+        :raises:                RuntimeError if tracing is not enabled
+        """
+        if self._trace_buffer is None:
+            raise RuntimeError("Tracing is not enabled")
+
+        self._trace_buffer.export(filename)
+
+    def startRecording(self):
+        """
+        Start recording a transcript of all transfers. A recording is an unbounded trace that keeps all data, so it
+        replaces any trace that is enabled. To capture driver initialization, start recording before the resource is
+        opened.
+        """
+        self._trace_buffer = TraceBuffer(size=None, data_length=None)
+        self._recording = True
+
+    def stopRecording(self, filename=None):
+        """
+        Stop recording and get the transcript. The transcript contains the properties of the resource and all
+        transfers since the recording was started.
+
+        :param filename:        JSON file to save the transcript to
+        :type filename:         str
+        :returns:               Transcript
+        :rtype:                 dict
+        :raises:                RuntimeError if not recording
+        """
+        if not self._recording:
+            raise RuntimeError("Not recording")
+
+        trace = self._trace_buffer
+        self.disableTrace()
+
+        try:
+            configuration = self.getConfiguration()
+        except AttributeError:
+            configuration = {}
+
+        return save_transcript(filename, self.getProperties(), trace.getEntries(), configuration)
+
+    def _traceTransfer(self, direction, data=None):
+        # Returns a context manager that records the transfer, or a shared no-op context if tracing is disabled
+        trace = self._trace_buffer
+
+        if trace is None:
+            return NULL_TRACE
+
+        return trace.transfer(direction, data)
+
+    #===========================================================================
+    # Adaptive Timeouts
+    #===========================================================================
+
+    def enableAdaptiveTimeout(self, percentile=95.0, factor=2.0, margin=0.05, window=100, samples=5):
+        """
+        Track the latency of each command and set the timeout of each transfer to a percentile of the observed latency
+        for that command, multiplied by `factor` plus `margin`. The configured timeout is used until `samples`
+        transfers have completed for a command. Existing latency statistics are discarded.
+
+        :param percentile:      Percentile of the observed latency
+        :type percentile:       float
+        :param factor:          Multiplier applied to the percentile latency
+        :type factor:           float
+        :param margin:          Time (in seconds) added to the timeout
+        :type margin:           float
+        :param window:          Number of recent samples kept for each command
+        :type window:           int
+        :param samples:         Minimum number of samples before an adaptive timeout is used
+        :type samples:          int
+        """
+        self._latency = LatencyTracker(percentile, factor, margin, window, samples)
+
+    def disableAdaptiveTimeout(self):
+        """
+        Stop tracking command latency and use the configured timeout for all transfers
+        """
+        self._latency = None
+
+    def isAdaptiveTimeoutEnabled(self):
+        """
+        Check if adaptive timeouts are enabled
+
+        :rtype:                 bool
+        """
+        return self._latency is not None
+
+    def getLatencyStatistics(self):
+        """
+        Get the observed latency of each command. See :func:`labtronyx.common.latency.LatencyTracker.getStatistics`
+
+        :rtype:                 dict
+        """
+        if self._latency is None:
+            return {}
+
+        return self._latency.getStatistics()
+
+    def clearLatencyStatistics(self):
+        """
+        Discard the observed latency of all commands
+        """
+        if self._latency is not None:
+            self._latency.clear()
+
+    def _latencyTimer(self, data=None, timeout=None, default=None):
+        # Returns a context manager that times a transfer waiting on `data`, or on the last command written if `data`
+        # is None. The timeout for the transfer is available as the `timeout` attribute
+        if data is None:
+            data = self._last_command
+
+        return LatencyTimer(self._latency, data, timeout, default, self._breaker)
+
+    #===========================================================================
+    # Health
+    #===========================================================================
+
+    def enableCircuitBreaker(self, threshold=3, reset_timeout=5.0):
+        """
+        Fail reads and queries immediately after `threshold` consecutive timeouts, until the device responds to a
+        probe. The circuit breaker is disabled by default.
+
+        :param threshold:       Number of consecutive timeouts before the breaker opens
+        :type threshold:        int
+        :param reset_timeout:   Time (in seconds) between probes while the breaker is open
+        :type reset_timeout:    float
+        """
+        self._breaker = CircuitBreaker(threshold, reset_timeout, callback=self._healthChanged)
+
+    def disableCircuitBreaker(self):
+        """
+        Disable the circuit breaker, all transfers wait for the full timeout
+        """
+        self._breaker = None
+
+    def getHealth(self):
+        """
+        Get the state of the circuit breaker: 'closed' if the device is responding, 'open' if transfers are failing
+        immediately or 'half-open' if the device is being probed.
+
+        :rtype:                 str
+        """
+        if self._breaker is None:
+            return CircuitBreaker.CLOSED
+
+        return self._breaker.state
+
+    def resetHealth(self):
+        """
+        Close the circuit breaker, so that transfers are attempted again immediately
+        """
+        if self._breaker is not None:
+            self._breaker.reset()
+
+    def _healthChanged(self, state):
+        self.logger.info("Resource [%s] health changed to %s", self._resID, state)
+
+        if state == CircuitBreaker.OPEN:
+            self._armProbeTimer()
+
+        self.manager._publishEvent(events.EventCodes.resource.health_changed, self.uuid, state)
+
+    def _armProbeTimer(self):
+        if self._probe_timer is not None:
+            self._probe_timer.cancel()
+
+        self._probe_timer = threading.Timer(self._breaker.reset_timeout, self._healthProbe)
+        self._probe_timer.daemon = True
+        self._probe_timer.start()
+
+    def _healthProbe(self):
+        # Runs in the probe timer thread while the breaker is open
+        breaker = self._breaker
+        self._probe_timer = None
+
+        if breaker is None or breaker.state != CircuitBreaker.OPEN:
+            return
+
+        breaker.trial()
+
+        try:
+            self._probe()
+
+        except InterfaceTimeout:
+            # Breaker opens again and re-arms the probe timer
+            pass
+
+        except Exception as e:
+            self.logger.debug("Health probe failed for resource [%s]: %s", self._resID, e)
+
+    def _probe(self):
+        # Send a transfer to the device while the circuit breaker is half-open. By default nothing is sent, so the next
+        # transfer is used as the trial. Subclasses should use a short timeout, see `PROBE_TIMEOUT`
+        pass
+
+    #===========================================================================
+    # Asynchronous Operations
+    #===========================================================================
+
+    @local_only
+    def submit(self, method, args=(), kwargs=None, priority=PRIORITY_NORMAL, timeout=None):
+        """
+        Queue a resource or driver method to be called by the I/O worker of the resource. Operations are executed one
+        at a time in priority order while holding the I/O lock, so each operation sees a clean command stream.
+
+        Returns a Future, so this method is only usable locally.
+
+        :param method:          Name of the resource or driver method
+        :type method:           str
+        :param args:            Positional arguments
+        :type args:             tuple
+        :param kwargs:          Keyword arguments
+        :type kwargs:           dict
+        :param priority:        Priority, lower values are executed first. See `PRIORITY_INTERACTIVE`,
+                                `PRIORITY_NORMAL` and `PRIORITY_BULK`
+        :type priority:         int
+        :param timeout:         Time (in seconds) after which the operation will fail with `InterfaceTimeout` if it
+                                has not been started
+        :type timeout:          float
+        :rtype:                 labtronyx.common.futures.Future
+        :raises:                AttributeError if the method does not exist
+        """
+        fn = getattr(self, method)
+        deadline = time.time() + timeout if timeout is not None else None
+
+        with self._io_worker_lock:
+            if self._io_worker is None:
+                self._io_worker = IOWorker('Labtronyx-IO-%s' % self._resID, self._io_lock, self.logger)
+
+            return self._io_worker.submit(fn, args, kwargs, priority, deadline)
+
+    @local_only
+    def write_async(self, data, priority=PRIORITY_NORMAL, timeout=None):
+        """
+        Queue a write operation. See :func:`submit`.
+
+        Returns a Future, so this method is only usable locally.
+
+        :param data:            Data to send
+        :type data:             str
+        :param priority:        Priority, lower values are executed first
+        :type priority:         int
+        :param timeout:         Time (in seconds) after which the operation will fail if it has not been started
+        :type timeout:          float
+        :rtype:                 labtronyx.common.futures.Future
+        """
+        return self.submit('write', (data,), priority=priority, timeout=timeout)
+
+    @local_only
+    def query_async(self, data, priority=PRIORITY_NORMAL, timeout=None):
+        """
+        Queue a query operation. The write and read are executed atomically. See :func:`submit`.
+
+        Returns a Future, so this method is only usable locally.
+
+        :param data:            Data to send
+        :type data:             str
+        :param priority:        Priority, lower values are executed first
+        :type priority:         int
+        :param timeout:         Time (in seconds) after which the operation will fail if it has not been started
+        :type timeout:          float
+        :rtype:                 labtronyx.common.futures.Future
+        """
+        return self.submit('query', (data,), priority=priority, timeout=timeout)
+
     #===========================================================================
     # Driver Helpers
     #===========================================================================
@@ -0,0 +1,406 @@
+"""
+Behavior shared by resources that communicate with instruments using SCPI messages, such as VISA and raw socket
+resources:
+
+   * Identification using the `*IDN?` query, and matching drivers using the identity check of VISA drivers
+   * IEEE 488.2 common commands and status reporting
+   * Write coalescing
+
+Resources use :class:`SCPIResourceMixin` as the first base class, ahead of :class:`labtronyx.ResourceBase`, call
+:func:`SCPIResourceMixin._initSCPI` from their constructor and implement `_write`, which sends a single program message.
+Queries must send commands that are waiting to be coalesced in the same transfer, see
+:func:`SCPIResourceMixin._joinPending`.
+"""
+import contextlib
+
+from ..common import ieee488
+from ..common.errors import InterfaceTimeout, ResourceNotOpen
+from ..common.rpc import local_only
+from ..common.timing import poll
+
+__all__ = ['SCPIResourceMixin']
+
+
+class SCPIResourceMixin(object):
+    """
+    Mixin for resources that communicate using SCPI messages
+    """
+
+    # Default maximum size (in bytes) of a coalesced transfer
+    COALESCE_LIMIT = 1024
+
+    # Timeout (in seconds) for the identify query, unless the instrument has been observed to respond slower. If None,
+    # the configured timeout is used
+    IDENTIFY_TIMEOUT = 0.25
+
+    # IEEE 488.2 status reporting
+    ESE_OPC = 0x01 # Operation Complete bit in the Standard Event Status Register
+    SRE_ESB = 0x20 # Event Status Bit in the Status Byte
+    STB_RQS = 0x40 # Request Service bit in the Status Byte
+
+    # Maximum interval (in seconds) when polling the status byte
+    SRQ_POLL_INTERVAL = 0.1
+
+    def _initSCPI(self):
+        self._identity = []
+
+        # Write coalescing
+        self._coalesce_auto = False
+        self._coalesce_depth = 0
+        self._coalesce_limit = self.COALESCE_LIMIT
+        self._coalesce_buffer = []
+
+        # Set a flag to initialize the resource when it is used
+        self.ready = False
+
+    #===========================================================================
+    # Identification
+    #===========================================================================
+
+    def identify(self):
+        """
+        Query the resource to find out what instrument it is. Uses the standard SCPI query string `*IDN?`. Will attempt
+        to load a driver using the information returned.
+        """
+        start_state = self.isOpen()
+        if not start_state:
+            self.open()
+
+        self.logger.debug("Identifying %s Resource: %s", self.interfaceName, self.resID)
+
+        self._identity = []
+
+        try:
+            timeout = self.IDENTIFY_TIMEOUT
+            if timeout is not None and self._latency is not None:
+                timeout = self._latency.timeout('*IDN?', timeout)
+
+            scpi_ident = self.query("*IDN?", timeout=timeout)
+
+            self._identity = [section.strip() for section in scpi_ident.strip().split(',')]
+
+            if len(self._identity) >= 4:
+                self.logger.debug("Identified %s Resource: %s", self.interfaceName, self.resID)
+                self.logger.debug("Vendor: %s", self._identity[0])
+                self.logger.debug("Model:  %s", self._identity[1])
+                self.logger.debug("Serial: %s", self._identity[2])
+                self.logger.debug("F/W:    %s", self._identity[3])
+
+            else:
+                self.logger.debug("%s Resource responded to identify in non-standard way: %s", self.interfaceName,
+                                  scpi_ident)
+
+        except InterfaceTimeout:
+            self.logger.debug("Resource did not respond to Identify: %s", self.resID)
+
+        self.ready = True
+
+        # Attempt to find a suitable driver if one is not already loaded
+        if self._driver is None:
+            self.loadDriver()
+
+        if start_state == False:
+            self._sessionClose()
+
+    def _probe(self):
+        # The device is healthy if it responds to identify
+        if self.isOpen():
+            self.query("*IDN?", timeout=self.PROBE_TIMEOUT)
+
+    def getIdentity(self, section=None):
+        """
+        Get the comma-delimited identity string returned from `*IDN?` command
+
+        :param section: Section of comma-split identity
+        :type section:  int
+        :rtype:         str
+        """
+        if not self.ready:
+            self.identify()
+
+        if section is None:
+            return self._identity
+        elif len(self._identity) > section:
+            return self._identity[section]
+        else:
+            return ''
+
+    def _setIdentityProperties(self, properties):
+        # Device properties are derived from the identity if the driver has not defined them. Instruments that respond
+        # to identify in a non-standard way leave them empty
+        identity = self.getIdentity()
+        if len(identity) < 4:
+            identity = [''] * 4
+
+        for key, value in zip(['deviceVendor', 'deviceModel', 'deviceSerial', 'deviceFirmware'], identity):
+            properties.setdefault(key, value)
+
+        return properties
+
+    def loadDriver(self, driverName=None, force=False):
+        """
+        Load a Driver.
+
+        If `driverName` is not specified, the instrument is identified and a compatible driver is searched for using
+        the identity check of VISA drivers. If more than one compatible driver is found, no driver will be loaded.
+
+        On startup, the resource will attempt to load a valid driver automatically. This function only needs to be
+        called to override the default driver. :func:`unloadDriver` must be called before loading a new driver for a
+        resource.
+
+        :param driverName:      Driver name to load
+        :type driverName:       str
+        :param force:           Force load driver by unloading existing driver
+        :returns:               True if successful, False otherwise
+        """
+        if driverName is None:
+            if not self.ready:
+                # Identifying the instrument loads a driver
+                self.identify()
+                return self._driver is not None
+
+            self.logger.debug("Searching for suitable drivers")
+
+            driverClasses = self.manager.plugin_manager.getPluginsByType('driver')
+            validDrivers = []
+
+            # Iterate through all driver classes to find compatible driver
+            for driver_fqn, driverCls in driverClasses.items():
+                try:
+                    if driverCls.VISA_validResource(self._identity):
+                        validDrivers.append(driver_fqn)
+                        self.logger.debug("Found match: %s", driver_fqn)
+                except:
+                    pass
+
+            # Only auto-load a model if a single model was found
+            if len(validDrivers) == 1:
+                return super(SCPIResourceMixin, self).loadDriver(validDrivers[0], force)
+
+            else:
+                self.logger.debug("Unable to load driver, %d matches found", len(validDrivers))
+                return False
+
+        else:
+            return super(SCPIResourceMixin, self).loadDriver(driverName, force)
+
+    #===========================================================================
+    # Common Commands
+    #===========================================================================
+
+    def getStatusByte(self):
+        """
+        Read the Status Byte Register (STB). Interpretation of the status byte varies by instrument
+
+        :return:
+        """
+        return self.query('*STB?')
+
+    def trigger(self):
+        """
+        Trigger the instrument using the common trigger command `*TRG`. Behavior varies by instrument
+        """
+        self.write('*TRG')
+
+    def reset(self):
+        """
+        Reset the instrument. Behavior varies by instrument, typically this will reset the instrument to factory
+        default settings.
+        """
+        self.write('*RST')
+
+    def wait_for_srq(self, timeout=None):
+        """
+        Wait for the instrument to request service. Unless the resource is notified of service requests, the status
+        byte is polled, starting with a sub-millisecond interval that backs off exponentially to `SRQ_POLL_INTERVAL`.
+
+        :param timeout:     Time (in seconds) to wait. Defaults to the configured timeout
+        :type timeout:      float
+        :returns:           Status byte
+        :rtype:             int
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        if timeout is None:
+            timeout = self._getTimeout()
+
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+
+            stb = self._waitSRQ(timeout)
+
+            if stb is None:
+                raise InterfaceTimeout("Timeout waiting for service request")
+
+            return stb
+
+    def _getTimeout(self):
+        # Configured timeout (in seconds)
+        timeout = self._conf.get('timeout')
+
+        if timeout is not None:
+            return timeout / 1000.0
+
+    def _waitSRQ(self, timeout):
+        # Wait for a service request. Returns the status byte, or None on timeout
+        return poll(self._pollSRQ, timeout, maximum=self.SRQ_POLL_INTERVAL)
+
+    def _pollSRQ(self):
+        # Returns the status byte if the instrument is requesting service
+        stb = self._readStatusByte()
+
+        if stb & self.STB_RQS:
+            return stb
+
+    def _readStatusByte(self):
+        return int(self.query('*STB?'))
+
+    def wait_for_opc(self, timeout=None):
+        """
+        Wait until all pending operations are complete.
+
+        If the resource has been notified of a service request, the instrument is set up to request service when the
+        Operation Complete event occurs (`*ESE` and `*SRE`), then `*OPC` is sent and :func:`wait_for_srq` waits for
+        the request. The Standard Event Status Register is cleared before and after waiting, and the previous event
+        enables are restored.
+
+        Otherwise the `*OPC?` query is used, the response is only sent once all pending operations are complete.
+
+        :param timeout:     Time (in seconds) to wait. Defaults to the configured timeout
+        :type timeout:      float
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        if self._useServiceRequests():
+            self._waitOPCServiceRequest(timeout)
+
+        else:
+            self.query('*OPC?', timeout=timeout)
+
+    def _useServiceRequests(self):
+        # Wait for pending operations with a service request instead of the `*OPC?` query
+        return False
+
+    def _waitOPCServiceRequest(self, timeout):
+        with self._io_lock:
+            # Clear events that occurred before this operation
+            ese, sre, _ = ieee488.split_response(self.query('*ESE?;*SRE?;*ESR?'))
+
+            try:
+                self.write('*ESE %d;*SRE %d;*OPC' % (self.ESE_OPC, self.SRE_ESB))
+                self.wait_for_srq(timeout)
+
+                self.query('*ESR?')
+
+            finally:
+                self.write('*ESE %d;*SRE %d' % (int(ese), int(sre)))
+
+    #===========================================================================
+    # Write Coalescing
+    #===========================================================================
+
+    def _configureCoalescing(self, kwargs):
+        # Remove the write coalescing parameters from configuration keyword arguments and apply them
+        if 'coalesce_writes' in kwargs:
+            self._coalesce_auto = bool(kwargs.pop('coalesce_writes'))
+
+            if not self._coalesce_auto and self.isOpen():
+                self.flush()
+
+        if 'coalesce_limit' in kwargs:
+            self._coalesce_limit = int(kwargs.pop('coalesce_limit'))
+
+    def _getCoalescingConfiguration(self):
+        return {
+            'coalesce_writes': self._coalesce_auto,
+            'coalesce_limit': self._coalesce_limit
+        }
+
+    @local_only
+    @contextlib.contextmanager
+    def coalesce(self):
+        """
+        Context manager that coalesces consecutive writes into as few transfers as possible. Commands are joined into a
+        single program message separated by `;`, up to the coalescing limit. Pending commands are sent before any read,
+        when a query is made or when the context exits, so the order of commands and queries is preserved.
+
+        Example::
+
+            with instr.coalesce():
+                instr.write("DATA:SOURCE CH1")
+                instr.write("DATA:START 1")
+                instr.write("DATA:STOP 10000")
+
+        The I/O lock is held for the whole context, so writes from other threads wait until the context exits instead
+        of being coalesced with these commands.
+
+        Context managers cannot be used remotely, so this method is only usable locally. Use the `coalesce_writes`
+        configuration parameter for remote resources.
+        """
+        with self._io_lock:
+            self._coalesce_depth += 1
+
+            try:
+                yield
+
+            finally:
+                self._coalesce_depth -= 1
+
+                if self._coalesce_depth == 0 and not self._coalesce_auto:
+                    self.flush()
+
+    def flush(self):
+        """
+        Send any commands waiting to be coalesced
+
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            if len(self._coalesce_buffer) > 0:
+                data = ieee488.join_commands(self._coalesce_buffer)
+                self._coalesce_buffer = []
+
+                self._write(data)
+
+    def _joinPending(self, data):
+        # Commands waiting to be coalesced are sent in the same transfer as a query
+        if len(self._coalesce_buffer) > 0:
+            data = ieee488.join_commands(self._coalesce_buffer + [data])
+            self._coalesce_buffer = []
+
+        return data
+
+    def write(self, data):
+        """
+        Send ASCII-encoded data to the instrument. Termination character is appended automatically, according to
+        `write_termination` property.
+
+        If write coalescing is active, the command is buffered and sent with other commands in a single transfer.
+
+        :param data:        Data to send
+        :type data:         str
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            self._last_command = data
+
+            if self._coalesce_auto or self._coalesce_depth > 0:
+                if not self.isOpen():
+                    raise ResourceNotOpen()
+
+                if len(ieee488.join_commands(self._coalesce_buffer + [data])) > self._coalesce_limit:
+                    self.flush()
+
+                self._coalesce_buffer.append(data)
+
+            else:
+                self._write(data)
@@ -0,0 +1,145 @@
+"""
+Circuit breaker for unresponsive devices
+
+A resource whose device stops responding would otherwise make every caller wait for the full timeout. The circuit
+breaker counts consecutive timeouts and opens once a threshold is reached. While open, transfers fail immediately with
+`InterfaceTimeout`. After the reset timeout, the breaker becomes half-open and only the next transfer is allowed through as
+a trial: if it succeeds the breaker closes, if it times out the breaker opens again. Other transfers fail immediately
+until the trial has completed.
+"""
+import threading
+
+from .errors import InterfaceTimeout
+from .timing import monotonic
+
+__all__ = ['CircuitBreaker']
+
+
+class CircuitBreaker(object):
+    """
+    Per-resource health state machine
+
+    :param threshold:       Number of consecutive timeouts before the breaker opens
+    :type threshold:        int
+    :param reset_timeout:   Time (in seconds) the breaker stays open before a trial transfer is allowed
+    :type reset_timeout:    float
+    :param callback:        Function called with the new state when the state changes
+    :type callback:         callable
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, threshold=3, reset_timeout=5.0, callback=None):
+        self.threshold = max(int(threshold), 1)
+        self.reset_timeout = float(reset_timeout)
+        self.callback = callback
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def failures(self):
+        return self._failures
+
+    def _transition(self, state):
+        # Must be called with the lock held. Returns the new state if it changed, otherwise None
+        if state == self._state:
+            return None
+
+        self._state = state
+
+        if state == self.OPEN:
+            self._opened = monotonic()
+
+        return state
+
+    def _notify(self, state):
+        if state is not None and self.callback is not None:
+            self.callback(state)
+
+    def allow(self):
+        """
+        Check if a transfer may proceed. Once the reset timeout has elapsed, an open breaker becomes half-open. While
+        half-open, only one transfer is allowed through until its outcome is recorded.
+
+        :raises:            InterfaceTimeout if the breaker is open, or if a trial transfer is already in progress
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            if self._state == self.OPEN:
+                if monotonic() - self._opened < self.reset_timeout:
+                    raise InterfaceTimeout("Device is not responding, circuit breaker is open")
+
+                changed = self._transition(self.HALF_OPEN)
+
+            else:
+                changed = None
+
+                if self._trial:
+                    raise InterfaceTimeout("Device is not responding, waiting for trial transfer")
+
+            self._trial = True
+
+        self._notify(changed)
+
+    def trial(self):
+        """
+        Make an open breaker half-open, so that the next transfer is allowed to probe the device
+        """
+        with self._lock:
+            changed = self._transition(self.HALF_OPEN) if self._state == self.OPEN else None
+
+        self._notify(changed)
+
+    def success(self):
+        """
+        Record a transfer that completed
+        """
+        with self._lock:
+            self._failures = 0
+            self._trial = False
+            changed = self._transition(self.CLOSED)
+
+        self._notify(changed)
+
+    def timeout(self):
+        """
+        Record a transfer that timed out
+        """
+        with self._lock:
+            self._failures += 1
+            self._trial = False
+
+            if self._state == self.HALF_OPEN or self._failures >= self.threshold:
+                # Restart the reset timeout even if the breaker was already open
+                self._opened = monotonic()
+                changed = self._transition(self.OPEN)
+
+            else:
+                changed = None
+
+        self._notify(changed)
+
+    def release(self):
+        """
+        Record a transfer that failed without timing out. The outcome of the trial is unknown, so the next transfer may
+        be used as the trial
+        """
+        with self._lock:
+            self._trial = False
+
+    def reset(self):
+        """
+        Close the breaker and clear the timeout count
+        """
+        self.success()
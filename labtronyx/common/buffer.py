@@ -0,0 +1,182 @@
+"""
+Receive buffer for stream based resources
+"""
+import time
+
+from .errors import InterfaceTimeout
+
+__all__ = ['ReceiveBuffer']
+
+
+class ReceiveBuffer(object):
+    """
+    Buffers data received from a stream so that terminated messages and fixed length frames can be extracted without
+    reading one byte at a time. Data is read from the stream in bulk and any data received beyond the end of a message
+    is kept for the next read.
+
+    :param read:        Function that returns all data currently available from the stream without blocking, or an
+                        empty string if no data is available
+    :type read:         callable
+    :param wait:        Function that blocks until data may be available to read or the timeout (in seconds) expires
+    :type wait:         callable
+    """
+
+    def __init__(self, read, wait):
+        self._read = read
+        self._wait = wait
+
+        self._buf = bytearray()
+
+    def __len__(self):
+        return len(self._buf)
+
+    def clear(self):
+        """
+        Discard all buffered data
+        """
+        del self._buf[:]
+
+    def drain(self, quiet):
+        """
+        Discard all buffered data and any data received from the stream until no data has been received for `quiet`
+        seconds. Used to discard the remainder of a response that was abandoned part way through.
+
+        :param quiet:       Time (in seconds) without data after which the stream is considered idle
+        :type quiet:        float
+        :returns:           Number of bytes discarded
+        :rtype:             int
+        """
+        discarded = len(self._buf)
+        self.clear()
+
+        try:
+            while True:
+                discarded += self.fill(time.time() + quiet)
+                self.clear()
+
+        except InterfaceTimeout:
+            return discarded
+
+    def fill(self, deadline=None):
+        """
+        Read all available data from the stream into the buffer. If no data is available, wait until data is received
+        or the deadline has passed.
+
+        :param deadline:    Absolute time (from `time.time`) after which to stop waiting. If None, only data that is
+                            immediately available is read
+        :type deadline:     float
+        :returns:           Number of bytes added to the buffer
+        :rtype:             int
+        :raises:            InterfaceTimeout
+        """
+        while True:
+            data = self._read()
+
+            if len(data) > 0:
+                self._buf.extend(data)
+                return len(data)
+
+            if deadline is None:
+                return 0
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise InterfaceTimeout("Timeout before requested bytes could be read")
+
+            self._wait(remaining)
+
+    def read_available(self):
+        """
+        Get all buffered data along with any data that is immediately available from the stream.
+
+        :rtype:             str
+        """
+        self.fill()
+
+        ret = str(self._buf)
+        self.clear()
+
+        return ret
+
+    def read_some(self, size, deadline):
+        """
+        Read at most `size` bytes, waiting until at least one byte is available.
+
+        :param size:        Maximum number of bytes to read
+        :type size:         int
+        :param deadline:    Absolute time (from `time.time`) after which to stop waiting
+        :type deadline:     float
+        :rtype:             str
+        :raises:            InterfaceTimeout
+        """
+        if len(self._buf) == 0:
+            self.fill(deadline)
+
+        ret = str(self._buf[:size])
+        del self._buf[:size]
+
+        return ret
+
+    def read_exact(self, size, deadline):
+        """
+        Read exactly `size` bytes.
+
+        :param size:        Number of bytes to read
+        :type size:         int
+        :param deadline:    Absolute time (from `time.time`) after which to stop waiting
+        :type deadline:     float
+        :rtype:             str
+        :raises:            InterfaceTimeout
+        """
+        while len(self._buf) < size:
+            self.fill(deadline)
+
+        ret = str(self._buf[:size])
+        del self._buf[:size]
+
+        return ret
+
+    def pop_until(self, terminator):
+        """
+        Remove and return a message ending with the terminator sequence if one is buffered. The terminator is consumed
+        but not included in the returned data. Does not read from the stream.
+
+        :param terminator:  Termination sequence
+        :type terminator:   str
+        :returns:           Message or None if the terminator has not been received
+        :rtype:             str
+        """
+        idx = self._buf.find(terminator)
+
+        if idx >= 0:
+            ret = str(self._buf[:idx])
+            del self._buf[:idx + len(terminator)]
+
+            return ret
+
+    def read_until(self, terminator, deadline):
+        """
+        Read until the terminator sequence is found. The terminator is consumed but not included in the returned data.
+
+        :param terminator:  Termination sequence
+        :type terminator:   str
+        :param deadline:    Absolute time (from `time.time`) after which to stop waiting
+        :type deadline:     float
+        :rtype:             str
+        :raises:            InterfaceTimeout
+        """
+        start = 0
+
+        while True:
+            idx = self._buf.find(terminator, start)
+
+            if idx >= 0:
+                ret = str(self._buf[:idx])
+                del self._buf[:idx + len(terminator)]
+
+                return ret
+
+            # Only search new data, allowing for a terminator split across reads
+            start = max(0, len(self._buf) - len(terminator) + 1)
+
+            self.fill(deadline)
@@ -204,6 +204,7 @@ class EventCodes:
         changed = "resource.changed"
         driver_loaded = "resource.driver.loaded"
         driver_unloaded = "resource.driver.unloaded"
+        health_changed = "resource.health.changed"
 
     class script:
         created = "script.created"
@@ -0,0 +1,113 @@
+"""
+Futures for asynchronous resource operations
+"""
+import threading
+
+from .errors import InterfaceTimeout
+
+__all__ = ['Future']
+
+
+class Future(object):
+    """
+    Result of an asynchronous operation. Modeled after `concurrent.futures.Future`, which is not available in the
+    Python 2 standard library.
+
+    Futures are not serializable, so methods that return them are only usable locally.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._done = False
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+
+    def done(self):
+        """
+        Check if the operation has completed
+
+        :rtype:             bool
+        """
+        return self._done
+
+    def result(self, timeout=None):
+        """
+        Wait for the operation to complete and return the result. If the operation raised an exception, that
+        exception is raised.
+
+        :param timeout:     Time to wait (in seconds). If None, wait forever
+        :type timeout:      float
+        :returns:           Result of the operation
+        :raises:            InterfaceTimeout if the operation did not complete in time
+        """
+        self._wait(timeout)
+
+        if self._exception is not None:
+            raise self._exception
+
+        return self._result
+
+    def exception(self, timeout=None):
+        """
+        Wait for the operation to complete and return the exception raised by the operation, if any.
+
+        :param timeout:     Time to wait (in seconds). If None, wait forever
+        :type timeout:      float
+        :returns:           Exception or None
+        :raises:            InterfaceTimeout if the operation did not complete in time
+        """
+        self._wait(timeout)
+
+        return self._exception
+
+    def add_done_callback(self, fn):
+        """
+        Attach a function that will be called with the future as its only argument when the operation completes. If
+        the operation has already completed, the function is called immediately.
+
+        :param fn:          Callback function
+        :type fn:           callable
+        """
+        with self._condition:
+            if not self._done:
+                self._callbacks.append(fn)
+                return
+
+        fn(self)
+
+    def set_result(self, result):
+        """
+        Mark the operation as completed with a result. Should only be called by the executor of the operation.
+        """
+        self._complete(result, None)
+
+    def set_exception(self, exception):
+        """
+        Mark the operation as completed with an exception. Should only be called by the executor of the operation.
+        """
+        self._complete(None, exception)
+
+    def _wait(self, timeout):
+        with self._condition:
+            if not self._done:
+                self._condition.wait(timeout)
+
+            if not self._done:
+                raise InterfaceTimeout("Operation did not complete within the timeout")
+
+    def _complete(self, result, exception):
+        with self._condition:
+            self._result = result
+            self._exception = exception
+            self._done = True
+
+            self._condition.notify_all()
+
+            callbacks, self._callbacks = self._callbacks, []
+
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception:
+                pass
@@ -0,0 +1,196 @@
+"""
+IEEE 488.2 data helpers
+
+Instruments return large binary payloads (waveforms, trace buffers, etc.) as definite length arbitrary block response
+data::
+
+    #<n><length><payload>
+
+Where `<n>` is a single digit that gives the number of digits in `<length>`, and `<length>` is the number of bytes in
+`<payload>`. The helpers in this module parse the block header from a resource and read the payload directly into a
+single preallocated buffer, so that a transfer of any size only allocates its payload once. Blocks sent to an
+instrument are encoded with :func:`encode_block`.
+
+Several program message units can be sent in a single program message by separating them with `;`. See
+:func:`join_commands`. The responses to several queries are separated the same way, see :func:`split_response`.
+"""
+import numpy
+
+from .errors import InvalidResponse
+
+__all__ = ['read_block_header', 'read_block', 'encode_block', 'join_commands', 'split_response']
+
+#: Default number of bytes requested from the resource for each payload read
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _read_exact(read, size):
+    """
+    Read exactly `size` bytes using the `read` function.
+
+    :param read:        Function that accepts a number of bytes and returns at most that many bytes
+    :type read:         callable
+    :param size:        Number of bytes to read
+    :type size:         int
+    :rtype:             str
+    :raises:            InvalidResponse
+    """
+    data = read(size)
+
+    while len(data) < size:
+        chunk = read(size - len(data))
+
+        if not chunk:
+            raise InvalidResponse("Unexpected end of data while reading block header")
+
+        data += chunk
+
+    return data
+
+
+def read_block_header(read):
+    """
+    Read a definite length arbitrary block header using the `read` function. Any data before the block marker (`#`),
+    such as a command header echoed by the instrument, is discarded.
+
+    :param read:        Function that accepts a number of bytes and returns at most that many bytes
+    :type read:         callable
+    :returns:           Length of the block payload in bytes
+    :rtype:             int
+    :raises:            InvalidResponse
+    """
+    marker = read(1)
+
+    while marker != '#':
+        if not marker:
+            raise InvalidResponse("Block marker not found")
+
+        marker = read(1)
+
+    num_digits = _read_exact(read, 1)
+
+    if not num_digits.isdigit():
+        raise InvalidResponse("Invalid block header: #%s" % num_digits)
+
+    num_digits = int(num_digits)
+
+    if num_digits == 0:
+        raise InvalidResponse("Indefinite length blocks are not supported")
+
+    length = _read_exact(read, num_digits)
+
+    if not length.isdigit():
+        raise InvalidResponse("Invalid block header: #%d%s" % (num_digits, length))
+
+    return int(length)
+
+
+def read_block(read, dtype='B', into=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read a definite length arbitrary block using the `read` function. The payload is read in chunks directly into a
+    single buffer and returned as a numpy array view of that buffer, no intermediate copies are made.
+
+    If `into` is provided, the payload is read into that buffer instead of a newly allocated one. The returned array
+    shares memory with `into`.
+
+    :param read:        Function that accepts a number of bytes and returns at most that many bytes
+    :type read:         callable
+    :param dtype:       numpy data type of the block payload, including byte order (e.g. '>i2')
+    :type dtype:        str or numpy.dtype
+    :param into:        Buffer to read the payload into
+    :type into:         bytearray, memoryview or numpy.ndarray
+    :param chunk_size:  Maximum number of bytes to request per read
+    :type chunk_size:   int
+    :rtype:             numpy.ndarray
+    :raises:            InvalidResponse
+    :raises:            ValueError if `into` is not large enough to hold the payload
+    """
+    dtype = numpy.dtype(dtype)
+    length = read_block_header(read)
+
+    if length % dtype.itemsize != 0:
+        raise InvalidResponse("Block length %d is not a multiple of the data size %d" % (length, dtype.itemsize))
+
+    if into is None:
+        buf = numpy.empty(length, dtype=numpy.uint8)
+
+    elif isinstance(into, numpy.ndarray):
+        if not into.flags.c_contiguous:
+            raise ValueError("Buffer must be contiguous")
+
+        buf = into.reshape(-1).view(numpy.uint8)
+
+    else:
+        buf = numpy.frombuffer(into, dtype=numpy.uint8)
+
+    if buf.size < length:
+        raise ValueError("Buffer too small for block of %d bytes" % length)
+
+    pos = 0
+    while pos < length:
+        chunk = read(min(length - pos, chunk_size))
+
+        if not chunk:
+            raise InvalidResponse("Unexpected end of data after %d of %d bytes" % (pos, length))
+
+        buf[pos:pos + len(chunk)] = numpy.frombuffer(chunk, dtype=numpy.uint8)
+        pos += len(chunk)
+
+    return buf[:length].view(dtype)
+
+
+def encode_block(data, dtype='B'):
+    """
+    Encode data as a definite length arbitrary block, to be sent as program data.
+
+    :param data:        Data to encode
+    :type data:         numpy.ndarray or list
+    :param dtype:       numpy data type of the block payload, including byte order (e.g. '>f8')
+    :type dtype:        str or numpy.dtype
+    :rtype:             str
+    """
+    payload = numpy.ascontiguousarray(data, dtype=dtype).tobytes()
+    length = str(len(payload))
+
+    return '#%d%s%s' % (len(length), length, payload)
+
+
+def join_commands(commands):
+    """
+    Join commands into a single program message. Commands after the first are relative to the previous command header
+    unless they are rooted (`:`) or common commands (`*`), so a leading `:` is added to all other commands.
+
+    :param commands:    Commands
+    :type commands:     list of str
+    :rtype:             str
+    """
+    return ';'.join(commands[:1] + [cmd if cmd[:1] in (':', '*') else ':' + cmd for cmd in commands[1:]])
+
+
+def split_response(data):
+    """
+    Split a response message into response message units. Separators inside quoted strings are ignored.
+
+    :param data:        Response message
+    :type data:         str
+    :rtype:             list of str
+    """
+    units = []
+    start = 0
+    quote = None
+
+    for idx, char in enumerate(data):
+        if quote is not None:
+            if char == quote:
+                quote = None
+
+        elif char in '"\'':
+            quote = char
+
+        elif char == ';':
+            units.append(data[start:idx].strip())
+            start = idx + 1
+
+    units.append(data[start:].strip())
+
+    return units
@@ -0,0 +1,119 @@
+"""
+Prioritized command queue for resource I/O
+"""
+import threading
+import itertools
+import time
+import Queue
+
+from .errors import InterfaceTimeout, ResourceNotOpen
+from .futures import Future
+
+__all__ = ['IOWorker']
+
+
+class IORequest(object):
+    """
+    Operation waiting in the queue of an I/O worker
+
+    :param fn:          Function to call
+    :type fn:           callable
+    :param args:        Positional arguments
+    :type args:         tuple
+    :param kwargs:      Keyword arguments
+    :type kwargs:       dict
+    :param deadline:    Absolute time (from `time.time`) after which the request should not be started
+    :type deadline:     float
+    """
+
+    def __init__(self, fn, args, kwargs, deadline):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.deadline = deadline
+        self.future = Future()
+
+
+class IOWorker(object):
+    """
+    Executes operations for a single resource on a dedicated thread. Operations are executed one at a time in priority
+    order (lowest value first) and in submission order for operations of the same priority, so a high priority
+    operation preempts queued lower priority operations at the next operation boundary.
+
+    :param name:        Thread name
+    :type name:         str
+    :param lock:        Lock held while each operation executes
+    :type lock:         threading.RLock
+    :param logger:      Logger instance
+    :type logger:       logging.Logger
+    """
+
+    def __init__(self, name, lock, logger):
+        self.logger = logger
+
+        self._lock = lock
+        self._queue = Queue.PriorityQueue()
+        self._counter = itertools.count()
+
+        self._thread = threading.Thread(name=name, target=self._run)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def submit(self, fn, args=(), kwargs=None, priority=0, deadline=None):
+        """
+        Queue an operation
+
+        :param fn:          Function to call
+        :type fn:           callable
+        :param args:        Positional arguments
+        :type args:         tuple
+        :param kwargs:      Keyword arguments
+        :type kwargs:       dict
+        :param priority:    Priority, lower values are executed first
+        :type priority:     int
+        :param deadline:    Absolute time (from `time.time`) after which the operation should not be started
+        :type deadline:     float
+        :rtype:             labtronyx.common.futures.Future
+        """
+        req = IORequest(fn, args, kwargs or {}, deadline)
+
+        self._queue.put((priority, next(self._counter), req))
+
+        return req.future
+
+    def stop(self):
+        """
+        Stop the worker thread after the current operation. Queued operations fail with `ResourceNotOpen`.
+        """
+        self._queue.put((-1, -1, None))
+
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            priority, count, req = self._queue.get()
+
+            if req is None:
+                break
+
+            if req.deadline is not None and time.time() > req.deadline:
+                req.future.set_exception(InterfaceTimeout("Request deadline expired before it was started"))
+                continue
+
+            try:
+                with self._lock:
+                    result = req.fn(*req.args, **req.kwargs)
+
+            except Exception as e:
+                req.future.set_exception(e)
+
+            else:
+                req.future.set_result(result)
+
+        # Fail any operations still in the queue
+        while not self._queue.empty():
+            priority, count, req = self._queue.get_nowait()
+
+            if req is not None:
+                req.future.set_exception(ResourceNotOpen("Resource was closed before the request was started"))
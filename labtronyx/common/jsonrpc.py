@@ -255,6 +255,13 @@ def decode(data):
 
     return (requests, responses, rpc_errors)
 
+def _encode_default(obj):
+    # Arrays and scalars returned by drivers (numpy) are converted to lists and Python types at the RPC boundary
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+
+    raise TypeError("%r is not JSON serializable" % obj)
+
 def encode(requests, responses):
     """
 
@@ -279,8 +286,8 @@ def encode(requests, responses):
         ret.append(rpc_dict)
 
     if len(ret) == 1:
-        return str(json.dumps(ret[0]))
+        return str(json.dumps(ret[0], default=_encode_default))
     elif len(ret) > 1:
-        return str(json.dumps(ret))
+        return str(json.dumps(ret, default=_encode_default))
     else:
         return ''
@@ -0,0 +1,251 @@
+"""
+Adaptive timeouts from observed command latency
+
+The latency of each command sent to a resource is tracked separately. Once enough samples have been collected for a
+command, the timeout for that command is set to a percentile of the observed latency, multiplied by a safety factor
+plus a fixed margin. Fast instruments no longer wait for a worst-case timeout to detect a failure, and slow commands
+are given as long as they usually take instead of timing out spuriously.
+
+If a command times out while an adaptive timeout is in effect, the samples for that command are discarded so that the
+configured timeout is used until new samples are collected.
+"""
+import bisect
+import collections
+import threading
+
+from .errors import InterfaceTimeout
+from .timing import monotonic
+
+__all__ = ['LatencyTracker', 'command_key']
+
+
+def command_key(data):
+    """
+    Get the key used to track the latency of a command. Arguments are removed from each command, so that
+    `MEAS:VOLT? 10` and `MEAS:VOLT? 100` are tracked together.
+
+    :param data:        Command or commands separated by ';'
+    :type data:         str
+    :rtype:             str
+    """
+    headers = []
+
+    for command in data.split(';'):
+        command = command.strip()
+
+        if len(command) > 0:
+            headers.append(command.split(None, 1)[0].upper())
+
+    return ';'.join(headers)
+
+
+class LatencyTracker(object):
+    """
+    Tracks the latency distribution of each command sent to a resource
+
+    :param percentile:  Percentile of the observed latency used to calculate the timeout
+    :type percentile:   float
+    :param factor:      Multiplier applied to the percentile latency
+    :type factor:       float
+    :param margin:      Time (in seconds) added to the timeout
+    :type margin:       float
+    :param window:      Number of recent samples kept for each command
+    :type window:       int
+    :param samples:     Minimum number of samples before an adaptive timeout is used
+    :type samples:      int
+    """
+
+    def __init__(self, percentile=95.0, factor=2.0, margin=0.05, window=100, samples=5):
+        self.percentile = float(percentile)
+        self.factor = float(factor)
+        self.margin = float(margin)
+        self.window = int(window)
+        self.samples = max(int(samples), 1)
+
+        # Samples in the order they were recorded, and the same samples sorted for percentile calculations
+        self._history = {}
+        self._sorted = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, latency):
+        """
+        Add a latency sample for a command
+
+        :param key:         Command key
+        :type key:          str
+        :param latency:     Latency (in seconds)
+        :type latency:      float
+        """
+        with self._lock:
+            history = self._history.get(key)
+
+            if history is None:
+                history = self._history[key] = collections.deque()
+                self._sorted[key] = []
+
+            ordered = self._sorted[key]
+
+            if len(history) >= self.window:
+                oldest = history.popleft()
+                del ordered[bisect.bisect_left(ordered, oldest)]
+
+            history.append(latency)
+            bisect.insort(ordered, latency)
+
+    def discard(self, key):
+        """
+        Discard all samples for a command
+
+        :param key:         Command key
+        :type key:          str
+        """
+        with self._lock:
+            self._history.pop(key, None)
+            self._sorted.pop(key, None)
+
+    def clear(self):
+        """
+        Discard all samples
+        """
+        with self._lock:
+            self._history.clear()
+            self._sorted.clear()
+
+    def estimate(self, key, percentile=None):
+        """
+        Get a percentile of the observed latency for a command
+
+        :param key:         Command key
+        :type key:          str
+        :param percentile:  Percentile. Defaults to the configured percentile
+        :type percentile:   float
+        :returns:           Latency (in seconds), or None if not enough samples have been collected
+        :rtype:             float
+        """
+        if percentile is None:
+            percentile = self.percentile
+
+        with self._lock:
+            ordered = self._sorted.get(key)
+
+            if ordered is None or len(ordered) < self.samples:
+                return None
+
+            # Nearest-rank percentile
+            index = int(round(percentile / 100.0 * (len(ordered) - 1)))
+            return ordered[min(max(index, 0), len(ordered) - 1)]
+
+    def timeout(self, key, default=None):
+        """
+        Get the adaptive timeout for a command
+
+        :param key:         Command key
+        :type key:          str
+        :param default:     Value returned if not enough samples have been collected
+        :returns:           Timeout (in seconds)
+        :rtype:             float
+        """
+        latency = self.estimate(key)
+
+        if latency is None:
+            return default
+
+        return latency * self.factor + self.margin
+
+    def getStatistics(self):
+        """
+        Get latency statistics for each command
+
+        :returns:           dict of command key to a dict with keys `samples`, `minimum`, `median`, `maximum`,
+                            `percentile` and `timeout`
+        :rtype:             dict
+        """
+        with self._lock:
+            keys = self._sorted.keys()
+
+        stats = {}
+
+        for key in keys:
+            with self._lock:
+                ordered = list(self._sorted.get(key, []))
+
+            if len(ordered) == 0:
+                continue
+
+            stats[key] = {
+                'samples':      len(ordered),
+                'minimum':      ordered[0],
+                'median':       ordered[len(ordered) // 2],
+                'maximum':      ordered[-1],
+                'percentile':   self.estimate(key),
+                'timeout':      self.timeout(key)
+            }
+
+        return stats
+
+
+class LatencyTimer(object):
+    """
+    Context manager that times a single transfer. The timeout that should be used for the transfer is available as the
+    `timeout` attribute, None if the configured timeout of the resource should be used.
+
+    If a circuit breaker is given, entering the context fails immediately while the breaker is open, and the outcome of
+    the transfer is reported to the breaker.
+
+    :param tracker:     Latency tracker, or None if adaptive timeouts are disabled
+    :type tracker:      LatencyTracker
+    :param data:        Command the transfer is waiting on
+    :type data:         str
+    :param timeout:     Explicit timeout (in seconds)
+    :type timeout:      float
+    :param default:     Timeout (in seconds) used if no adaptive timeout is available
+    :type default:      float
+    :param breaker:     Circuit breaker of the resource
+    :type breaker:      labtronyx.common.breaker.CircuitBreaker
+    """
+
+    def __init__(self, tracker, data, timeout=None, default=None, breaker=None):
+        self.tracker = tracker
+        self.breaker = breaker
+        self.key = None
+        self.adaptive = False
+        self.timeout = timeout
+        self.start = None
+
+        if tracker is not None and data:
+            self.key = command_key(data)
+
+            if timeout is None:
+                self.timeout = tracker.timeout(self.key)
+                self.adaptive = self.timeout is not None
+
+        if self.timeout is None:
+            self.timeout = default
+
+    def __enter__(self):
+        if self.breaker is not None:
+            self.breaker.allow()
+
+        self.start = monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if self.breaker is not None:
+            if exc_type is None:
+                self.breaker.success()
+
+            elif issubclass(exc_type, InterfaceTimeout):
+                self.breaker.timeout()
+
+            else:
+                self.breaker.release()
+
+        if self.key is not None:
+            if exc_type is None:
+                self.tracker.record(self.key, monotonic() - self.start)
+
+            elif self.adaptive and issubclass(exc_type, InterfaceTimeout):
+                # The command may have become slower, fall back to the configured timeout until new samples arrive
+                self.tracker.discard(self.key)
+
+        return False
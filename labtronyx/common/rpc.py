@@ -7,7 +7,16 @@ import requests
 # Local imports
 from . import errors
 
-__all__ = ['RpcClient', 'RpcRequest', 'RpcResponse']
+__all__ = ['RpcClient', 'RpcRequest', 'RpcResponse', 'local_only']
+
+
+def local_only(method):
+    """
+    Decorator for methods that return objects which cannot be sent to a remote client, such as futures, generators or
+    context managers. The RPC server does not list or dispatch local only methods.
+    """
+    method.rpc_local_only = True
+    return method
 
 
 class RpcRequest(object):
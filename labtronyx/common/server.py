@@ -84,7 +84,8 @@ def rpc_process(uuid=None):
             import inspect
             # Check for bound and unbound methods
             validMethod = lambda mem: inspect.ismethod(mem) or inspect.isfunction(mem)
-            return [attr for attr, val in inspect.getmembers(target) if validMethod(val) and not attr.startswith('_')]
+            return [attr for attr, val in inspect.getmembers(target) if validMethod(val) and not attr.startswith('_')
+                    and not getattr(val, 'rpc_local_only', False)]
 
         man = current_app.config.get('LABTRONYX_MANAGER')
 
@@ -162,7 +163,8 @@ def rpc_process(uuid=None):
                         if hasattr(target, '_rpc'):
                             result = target._rpc(req)
 
-                        elif not method_name.startswith('_') and hasattr(target, method_name):
+                        elif not method_name.startswith('_') and hasattr(target, method_name) and \
+                                not getattr(getattr(target, method_name), 'rpc_local_only', False):
                             method = getattr(target, method_name)
                             result = req.call(method)
 
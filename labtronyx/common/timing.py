@@ -0,0 +1,102 @@
+"""
+Timing helpers
+
+Python 2 does not provide a monotonic clock, which is needed to measure intervals that are not affected by system clock
+adjustments.
+
+Devices that cannot signal completion are polled with :func:`poll`, which starts with a very short interval and backs
+off exponentially, so that fast operations are detected quickly without flooding the bus during slow operations.
+"""
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+
+__all__ = ['monotonic', 'poll']
+
+
+def _clock_gettime_monotonic():
+    # CLOCK_MONOTONIC
+    clock_id = 6 if sys.platform == 'darwin' else 1
+
+    class timespec(ctypes.Structure):
+        _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or ctypes.util.find_library('rt'), use_errno=True)
+    clock_gettime = libc.clock_gettime
+    clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
+
+    ts = timespec()
+
+    def monotonic():
+        """
+        Get the value (in seconds) of a monotonic clock. Only the difference between two values is meaningful.
+
+        :rtype: float
+        """
+        if clock_gettime(clock_id, ctypes.byref(ts)) != 0:
+            raise OSError(ctypes.get_errno(), "clock_gettime failed")
+
+        return ts.tv_sec + ts.tv_nsec * 1e-9
+
+    # Make sure the clock works on this platform
+    monotonic()
+
+    return monotonic
+
+
+try:
+    from time import monotonic
+
+except ImportError:
+    if os.name == 'nt':
+        # time.clock is a high resolution monotonic counter on Windows
+        monotonic = time.clock
+
+    else:
+        try:
+            monotonic = _clock_gettime_monotonic()
+
+        except (OSError, AttributeError, TypeError):
+            monotonic = time.time
+
+
+def poll(condition, timeout, initial=0.0005, maximum=0.1, factor=2.0):
+    """
+    Call `condition` until it returns a true value or `timeout` seconds have passed. The interval between calls starts
+    at `initial` seconds and is multiplied by `factor` after each call, up to `maximum` seconds.
+
+    :param condition:   Function with no arguments
+    :type condition:    callable
+    :param timeout:     Time (in seconds) to wait. If None, wait forever
+    :type timeout:      float
+    :param initial:     Initial interval (in seconds)
+    :type initial:      float
+    :param maximum:     Maximum interval (in seconds)
+    :type maximum:      float
+    :param factor:      Interval multiplier
+    :type factor:       float
+    :returns:           Value returned by `condition`, or None if the timeout expired
+    """
+    deadline = monotonic() + timeout if timeout is not None else None
+    interval = initial
+
+    while True:
+        result = condition()
+
+        if result:
+            return result
+
+        if deadline is not None:
+            remaining = deadline - monotonic()
+
+            if remaining <= 0:
+                return None
+
+            time.sleep(min(interval, remaining))
+
+        else:
+            time.sleep(interval)
+
+        interval = min(interval * factor, maximum)
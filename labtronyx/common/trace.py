@@ -0,0 +1,245 @@
+"""
+Wire-level I/O tracing for resources
+
+A recording is an unbounded trace with untruncated data, saved as a JSON transcript along with the properties of the
+resource it was recorded from. Transcripts can be replayed using the Replay interface.
+"""
+import collections
+import csv
+import json
+import threading
+
+from .timing import monotonic
+
+__all__ = ['TraceBuffer', 'NULL_TRACE', 'save_transcript', 'load_transcript']
+
+#: Transcript file format version
+TRANSCRIPT_VERSION = 1
+
+#: Resource properties saved in a transcript
+TRANSCRIPT_PROPERTIES = ['resourceID', 'resourceType', 'interfaceName', 'driver', 'deviceType', 'deviceVendor',
+                         'deviceModel', 'deviceSerial', 'deviceFirmware']
+
+#: Resource configuration saved in a transcript, needed to replay transfers the way they were recorded
+TRANSCRIPT_CONFIGURATION = ['coalesce_writes', 'coalesce_limit']
+
+
+class TraceBuffer(object):
+    """
+    Ring buffer of I/O transfers for a single resource. When the buffer is full, the oldest entries are discarded.
+
+    Each entry is a dictionary with the following keys:
+
+      * `direction` - 'write', 'read' or 'query'
+      * `data` - Data sent to the device, truncated and escaped
+      * `response` - Data received from the device, truncated and escaped
+      * `bytes` - Total number of bytes transferred
+      * `start` - Monotonic timestamp (in seconds) when the transfer started
+      * `end` - Monotonic timestamp (in seconds) when the transfer completed or failed
+      * `outcome` - 'ok' or the name of the exception that was raised
+
+    Data is escaped using the `string_escape` codec, so that binary data can be serialized.
+
+    :param size:        Maximum number of entries to keep. If None, the buffer is unbounded
+    :type size:         int
+    :param data_length: Maximum number of bytes of data to keep for each entry. If None, data is not truncated
+    :type data_length:  int
+    """
+    FIELDS = ['direction', 'data', 'response', 'bytes', 'start', 'end', 'outcome']
+
+    def __init__(self, size=1000, data_length=64):
+        self.data_length = data_length
+
+        self._entries = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def transfer(self, direction, data=None):
+        """
+        Get a context manager that traces a transfer. The transfer is timed from entering the context until it exits,
+        and the outcome is taken from any exception raised within the context.
+
+        :param direction:   'write', 'read' or 'query'
+        :type direction:    str
+        :param data:        Data sent to the device
+        :type data:         str
+        :rtype:             TraceTransfer
+        """
+        return TraceTransfer(self, direction, data)
+
+    def append(self, entry):
+        """
+        Add an entry to the buffer
+
+        :param entry:       Trace entry
+        :type entry:        dict
+        """
+        with self._lock:
+            self._entries.append(entry)
+
+    def getEntries(self):
+        """
+        Get a copy of all entries in the buffer, oldest first
+
+        :rtype:             list of dict
+        """
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        """
+        Discard all entries
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def export(self, filename):
+        """
+        Export all entries to a CSV file
+
+        :param filename:    Filename
+        :type filename:     str
+        """
+        with open(filename, 'wb') as f:
+            writer = csv.DictWriter(f, self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.getEntries())
+
+    def format(self, data):
+        """
+        Truncate and escape data so that it can be serialized
+
+        :param data:        Data
+        :type data:         str or numpy.ndarray
+        :rtype:             str
+        """
+        if data is None:
+            return ''
+
+        if hasattr(data, 'nbytes'):
+            # Avoid copying a large array just to truncate it
+            data = buffer(data)
+
+        if self.data_length is not None and len(data) > self.data_length:
+            return str(data[:self.data_length]).encode('string_escape') + '...'
+
+        return str(data).encode('string_escape')
+
+
+class TraceTransfer(object):
+    """
+    Context manager that records a single transfer in a trace buffer
+    """
+
+    def __init__(self, trace, direction, data):
+        self.trace = trace
+        self.direction = direction
+        self.data = data
+        self.response = None
+        self.nbytes = len(data) if data is not None else 0
+        self.start = None
+
+    def __enter__(self):
+        self.start = monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        end = monotonic()
+
+        self.trace.append({
+            'direction': self.direction,
+            'data':      self.trace.format(self.data),
+            'response':  self.trace.format(self.response),
+            'bytes':     self.nbytes,
+            'start':     self.start,
+            'end':       end,
+            'outcome':   'ok' if exc_type is None else exc_type.__name__
+        })
+
+        return False
+
+    def received(self, data, nbytes=None):
+        """
+        Record data received from the device
+
+        :param data:        Data received
+        :type data:         str or numpy.ndarray
+        :param nbytes:      Number of bytes received, if different from the length of `data`
+        :type nbytes:       int
+        """
+        self.response = data
+        self.nbytes += len(data) if nbytes is None else nbytes
+
+
+class _NullTransfer(object):
+    """
+    Transfer context used when tracing is disabled. Does nothing.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+    def received(self, data, nbytes=None):
+        pass
+
+
+NULL_TRACE = _NullTransfer()
+
+
+def save_transcript(filename, properties, entries, configuration=None):
+    """
+    Save a transcript to a JSON file
+
+    :param filename:        Filename
+    :type filename:         str
+    :param properties:      Resource properties
+    :type properties:       dict
+    :param entries:         Trace entries
+    :type entries:          list of dict
+    :param configuration:   Resource configuration
+    :type configuration:    dict
+    :returns:               Transcript
+    :rtype:                 dict
+    """
+    configuration = configuration or {}
+
+    transcript = {
+        'version':          TRANSCRIPT_VERSION,
+        'properties':       {key: properties[key] for key in TRANSCRIPT_PROPERTIES if key in properties},
+        'configuration':    {key: configuration[key] for key in TRANSCRIPT_CONFIGURATION if key in configuration},
+        'transfers':        entries
+    }
+
+    if filename is not None:
+        with open(filename, 'w') as f:
+            json.dump(transcript, f, indent=1)
+
+    return transcript
+
+
+def load_transcript(filename):
+    """
+    Load a transcript from a JSON file. Data in each transfer is unescaped.
+
+    :param filename:    Filename
+    :type filename:     str
+    :rtype:             dict
+    :raises:            ValueError if the file is not a valid transcript
+    """
+    with open(filename, 'r') as f:
+        transcript = json.load(f)
+
+    if transcript.get('version') != TRANSCRIPT_VERSION:
+        raise ValueError("Unsupported transcript version")
+
+    for entry in transcript['transfers']:
+        entry['data'] = str(entry['data']).decode('string_escape')
+        entry['response'] = str(entry['response']).decode('string_escape')
+
+    return transcript
@@ -0,0 +1,403 @@
+"""
+Streaming waveform export
+
+Waveforms are written window by window as they are transferred from an instrument, so that a record never has to be
+held in memory and the time axis is never materialized. Each window is passed to the writer as the raw data points of
+every channel, together with the offset of the first point. Channel metadata describes how raw data points are scaled:
+
+    value = (raw - offset) * scale + zero
+
+The time of point `n` is `t0 + n * dt`.
+
+Supported formats:
+
+    * `csv` - Text file with a time column followed by a column for each channel
+    * `npy` - Memory-mapped numpy array. The first row is the time axis, followed by a row for each channel
+    * `npz` - numpy archive with an array for each channel, and the time axis and channel metadata as arrays
+    * `bin` - Chunked columnar binary file of raw data points with a JSON header containing the channel metadata. Use
+      :func:`load_waveform` to read the file
+
+Example::
+
+    channels = [WaveformChannel('CH1', scale=0.5, units='V', dtype='>i2')]
+
+    with open_writer('capture.bin', channels, samples, t0, dt) as writer:
+        for offset, data in chunks:
+            writer.write(offset, [data])
+
+The binary format is made up of the following sections, all integers are little-endian:
+
+    * Magic `LTXWFM01`
+    * Header length (uint32) followed by the UTF-8 encoded JSON header
+    * Any number of chunks, each made up of the offset of the first point (uint64), the number of points (uint32) and
+      then the raw data points of each channel in channel order
+"""
+import os
+import json
+import shutil
+import struct
+import zipfile
+import tempfile
+
+import numpy
+
+__all__ = ['WaveformChannel', 'open_writer', 'load_waveform']
+
+
+class WaveformChannel(object):
+    """
+    Channel metadata
+
+    :param name:        Channel name
+    :type name:         str
+    :param scale:       Value of one raw increment
+    :type scale:        float
+    :param offset:      Raw value offset
+    :type offset:       float
+    :param zero:        Value offset
+    :type zero:         float
+    :param units:       Units of the scaled values
+    :type units:        str
+    :param dtype:       numpy data type of the raw data points, including byte order
+    :type dtype:        str
+    """
+
+    def __init__(self, name, scale=1.0, offset=0.0, zero=0.0, units='', dtype='float64'):
+        self.name = name
+        self.scale = float(scale)
+        self.offset = float(offset)
+        self.zero = float(zero)
+        self.units = units
+        self.dtype = numpy.dtype(dtype)
+
+    def scaled(self, data, dtype='float64'):
+        """
+        Convert raw data points to scaled values
+
+        :param data:        Raw data points
+        :type data:         numpy.ndarray
+        :param dtype:       Data type of the scaled values
+        :type dtype:        str
+        :rtype:             numpy.ndarray
+        """
+        # Scale in place so that only one copy of the data points is made
+        ret = numpy.asarray(data).astype(dtype)
+        ret -= self.offset
+        ret *= self.scale
+        ret += self.zero
+
+        return ret
+
+    def toDict(self):
+        return {
+            'name': self.name,
+            'scale': self.scale,
+            'offset': self.offset,
+            'zero': self.zero,
+            'units': self.units,
+            'dtype': self.dtype.str
+        }
+
+    @classmethod
+    def fromDict(cls, d):
+        return cls(d['name'], d['scale'], d['offset'], d['zero'], d['units'], d['dtype'])
+
+
+class WaveformWriter(object):
+    """
+    Base class for waveform writers
+
+    :param filename:    Output filename
+    :type filename:     str
+    :param channels:    Channel metadata, in the order channel data is passed to :func:`write`
+    :type channels:     list[WaveformChannel]
+    :param samples:     Number of points in the record
+    :type samples:      int
+    :param t0:          Time of the first point
+    :type t0:           float
+    :param dt:          Time between points
+    :type dt:           float
+    :param dtype:       Data type of scaled values
+    :type dtype:        str
+    """
+    extension = None
+
+    def __init__(self, filename, channels, samples, t0, dt, dtype='float64'):
+        self.filename = filename
+        self.channels = list(channels)
+        self.samples = int(samples)
+        self.t0 = float(t0)
+        self.dt = float(dt)
+        self.dtype = numpy.dtype(dtype)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+        return False
+
+    def timeAxis(self, offset, count):
+        """
+        Get the time of `count` points starting at `offset`
+
+        :rtype:             numpy.ndarray
+        """
+        ret = numpy.arange(offset, offset + count, dtype=numpy.float64)
+        ret *= self.dt
+        ret += self.t0
+
+        return ret
+
+    def write(self, offset, data):
+        """
+        Write a window of the record
+
+        :param offset:      Offset of the first point in the window
+        :type offset:       int
+        :param data:        Raw data points of each channel, in channel order. All channels must be the same length
+        :type data:         list[numpy.ndarray]
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Finish writing the file
+        """
+        pass
+
+
+class CSVWriter(WaveformWriter):
+    """
+    Write a text file with a time column followed by a column for each channel. Rows are formatted in blocks with a
+    single string formatting operation instead of one row at a time.
+    """
+    extension = 'csv'
+
+    # Number of rows formatted at a time
+    BLOCK_SIZE = 65536
+
+    # Format of each value
+    VALUE_FORMAT = '%.9g'
+
+    def __init__(self, filename, channels, samples, t0, dt, dtype='float64'):
+        super(CSVWriter, self).__init__(filename, channels, samples, t0, dt, dtype)
+
+        self._row_format = ','.join([self.VALUE_FORMAT] * (len(self.channels) + 1)) + '\n'
+
+        self._file = open(filename, 'wb')
+        self._file.write(','.join(['Time'] + [ch.name for ch in self.channels]) + '\n')
+
+    def write(self, offset, data):
+        count = min([len(col) for col in data] or [0])
+
+        for start in range(0, count, self.BLOCK_SIZE):
+            stop = min(start + self.BLOCK_SIZE, count)
+
+            block = numpy.empty((stop - start, len(self.channels) + 1), dtype=numpy.float64)
+            block[:, 0] = self.timeAxis(offset + start, stop - start)
+
+            for idx, (ch, col) in enumerate(zip(self.channels, data)):
+                block[:, idx + 1] = ch.scaled(col[start:stop])
+
+            self._file.write((self._row_format * len(block)) % tuple(block.ravel()))
+
+    def close(self):
+        self._file.close()
+
+
+class NPYWriter(WaveformWriter):
+    """
+    Write a memory-mapped numpy array. The first row is the time axis, followed by a row for each channel, so that
+    each row is contiguous in the file.
+    """
+    extension = 'npy'
+
+    def __init__(self, filename, channels, samples, t0, dt, dtype='float64'):
+        super(NPYWriter, self).__init__(filename, channels, samples, t0, dt, dtype)
+
+        self._array = numpy.lib.format.open_memmap(filename, mode='w+', dtype=self.dtype,
+                                                   shape=(len(self.channels) + 1, self.samples))
+
+    def write(self, offset, data):
+        count = min([len(col) for col in data] or [0])
+
+        self._array[0, offset:offset + count] = self.timeAxis(offset, count)
+
+        for idx, (ch, col) in enumerate(zip(self.channels, data)):
+            self._array[idx + 1, offset:offset + count] = ch.scaled(col[:count], self.dtype)
+
+    def close(self):
+        self._array.flush()
+        del self._array
+
+
+class NPZWriter(WaveformWriter):
+    """
+    Write a numpy archive with an array of scaled values for each channel. The time axis is stored as the scalars `t0`
+    and `dt`, and channel metadata as the arrays `channels` and `units`. Channels are written to memory-mapped
+    temporary files and added to the archive when the writer is closed.
+    """
+    extension = 'npz'
+
+    def __init__(self, filename, channels, samples, t0, dt, dtype='float64'):
+        super(NPZWriter, self).__init__(filename, channels, samples, t0, dt, dtype)
+
+        self._tempdir = tempfile.mkdtemp(prefix='labtronyx-')
+        self._arrays = []
+
+        for idx, ch in enumerate(self.channels):
+            path = os.path.join(self._tempdir, '%d.npy' % idx)
+            self._arrays.append(numpy.lib.format.open_memmap(path, mode='w+', dtype=self.dtype,
+                                                             shape=(self.samples,)))
+
+    def write(self, offset, data):
+        for ch, array, col in zip(self.channels, self._arrays, data):
+            array[offset:offset + len(col)] = ch.scaled(col, self.dtype)
+
+    def close(self):
+        try:
+            with zipfile.ZipFile(self.filename, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+                for idx, ch in enumerate(self.channels):
+                    self._arrays[idx].flush()
+                    zf.write(os.path.join(self._tempdir, '%d.npy' % idx), '%s.npy' % ch.name)
+
+                metadata = {
+                    't0': numpy.float64(self.t0),
+                    'dt': numpy.float64(self.dt),
+                    'channels': numpy.array([ch.name for ch in self.channels]),
+                    'units': numpy.array([ch.units for ch in self.channels])
+                }
+
+                for name, value in metadata.items():
+                    path = os.path.join(self._tempdir, name + '.npy')
+                    numpy.save(path, value)
+                    zf.write(path, name + '.npy')
+
+        finally:
+            self._arrays = []
+            shutil.rmtree(self._tempdir, ignore_errors=True)
+
+
+class BinaryWriter(WaveformWriter):
+    """
+    Write a chunked columnar binary file of raw data points. See the module documentation for the file format.
+    """
+    extension = 'bin'
+
+    MAGIC = 'LTXWFM01'
+    CHUNK_HEADER = struct.Struct('<QI')
+
+    def __init__(self, filename, channels, samples, t0, dt, dtype='float64'):
+        super(BinaryWriter, self).__init__(filename, channels, samples, t0, dt, dtype)
+
+        header = json.dumps({
+            'version': 1,
+            'samples': self.samples,
+            't0': self.t0,
+            'dt': self.dt,
+            'channels': [ch.toDict() for ch in self.channels]
+        }).encode('utf-8')
+
+        self._file = open(filename, 'wb')
+        self._file.write(self.MAGIC)
+        self._file.write(struct.pack('<I', len(header)))
+        self._file.write(header)
+
+    def write(self, offset, data):
+        count = min([len(col) for col in data] or [0])
+
+        self._file.write(self.CHUNK_HEADER.pack(offset, count))
+
+        for ch, col in zip(self.channels, data):
+            self._file.write(numpy.asarray(col[:count], dtype=ch.dtype).tobytes())
+
+    def close(self):
+        self._file.close()
+
+
+WRITERS = dict((cls.extension, cls) for cls in [CSVWriter, NPYWriter, NPZWriter, BinaryWriter])
+
+
+def open_writer(filename, channels, samples, t0, dt, fmt=None, dtype='float64'):
+    """
+    Create a waveform writer
+
+    :param filename:    Output filename. The format extension is appended if it is missing
+    :type filename:     str
+    :param channels:    Channel metadata
+    :type channels:     list[WaveformChannel]
+    :param samples:     Number of points in the record
+    :type samples:      int
+    :param t0:          Time of the first point
+    :type t0:           float
+    :param dt:          Time between points
+    :type dt:           float
+    :param fmt:         Format - ['csv', 'npy', 'npz', 'bin']. Defaults to the filename extension, or `csv`
+    :type fmt:          str
+    :param dtype:       Data type of scaled values
+    :type dtype:        str
+    :rtype:             WaveformWriter
+    :raises:            ValueError if the format is not supported
+    """
+    ext = os.path.splitext(filename)[1].lstrip('.').lower()
+
+    if fmt is None:
+        fmt = ext if ext in WRITERS else 'csv'
+
+    fmt = fmt.lower()
+
+    if fmt not in WRITERS:
+        raise ValueError("Unsupported waveform format: %s" % fmt)
+
+    if ext != fmt:
+        filename = '%s.%s' % (filename, fmt)
+
+    return WRITERS[fmt](filename, channels, samples, t0, dt, dtype)
+
+
+def load_waveform(filename, dtype='float64'):
+    """
+    Load a waveform written in the binary format
+
+    :param filename:    Filename
+    :type filename:     str
+    :param dtype:       Data type of scaled values
+    :type dtype:        str
+    :returns:           dict with keys `t0`, `dt`, `channels` (list of WaveformChannel) and an array of scaled values
+                        for each channel name
+    :rtype:             dict
+    :raises:            ValueError if the file is not a binary waveform file
+    """
+    with open(filename, 'rb') as f:
+        if f.read(len(BinaryWriter.MAGIC)) != BinaryWriter.MAGIC:
+            raise ValueError("Not a waveform file: %s" % filename)
+
+        header_len, = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_len).decode('utf-8'))
+
+        channels = [WaveformChannel.fromDict(d) for d in header['channels']]
+        raw = [numpy.zeros(header['samples'], dtype=ch.dtype) for ch in channels]
+        samples = 0
+
+        while True:
+            chunk_header = f.read(BinaryWriter.CHUNK_HEADER.size)
+
+            if len(chunk_header) < BinaryWriter.CHUNK_HEADER.size:
+                break
+
+            offset, count = BinaryWriter.CHUNK_HEADER.unpack(chunk_header)
+
+            for ch, array in zip(channels, raw):
+                col = numpy.fromfile(f, dtype=ch.dtype, count=count)
+                array[offset:offset + len(col)] = col
+
+            samples = max(samples, offset + count)
+
+    ret = {'t0': header['t0'], 'dt': header['dt'], 'channels': channels}
+
+    for ch, array in zip(channels, raw):
+        ret[ch.name] = ch.scaled(array[:samples], dtype)
+
+    return ret
@@ -1,17 +1,34 @@
 """
 .. codeauthor:: Kevin Kennedy <protonyx@users.noreply.github.com>
 
+Arbitrary Waveforms
+-------------------
+
+Arbitrary waveforms are uploaded to the volatile memory of a channel as binary blocks of DAC codes. Waveforms are named
+after a hash of their contents, so uploading a waveform that is already in instrument memory is skipped. This also
+holds after the driver is reloaded, as the names in volatile memory are read when the driver is opened::
+
+    t = numpy.linspace(0, 1, 1000)
+    name = fgen.uploadArbitraryWaveform(1, numpy.sin(2 * numpy.pi * t) * numpy.exp(-5 * t))
+    fgen.setArbitraryWaveform(1, name, sample_rate=1e6)
+    fgen.enableOutput(1)
+
+Waveforms can be played in sequence::
+
+    fgen.uploadSequence(1, 'PULSES', [(name_a, 10), (name_b, 1, 'repeatTilTrig')])
+    fgen.setArbitraryWaveform(1, 'PULSES')
 """
 import labtronyx
 
+import re
+import hashlib
 
-class d_335XX(labtronyx.DriverBase):
-    """
-    Driver for Agilent Function Generators
+import numpy
 
-    .. warning::
 
-       This driver is a stub and has no implemented functionality
+class d_335XX(labtronyx.DriverBase):
+    """
+    Driver for Agilent 33500 Series Function Generators
     """
     author = 'KKENNEDY'
     version = '1.0'
@@ -25,5 +42,310 @@ class d_335XX(labtronyx.DriverBase):
     def VISA_validResource(cls, identity):
         return identity[0] == 'Agilent Technologies' and identity[1] in cls.compatibleInstruments['Agilent']
 
+    VALID_FUNCTIONS = {
+        'Sine':         'SIN',
+        'Square':       'SQU',
+        'Triangle':     'TRI',
+        'Ramp':         'RAMP',
+        'Pulse':        'PULS',
+        'PRBS':         'PRBS',
+        'Noise':        'NOIS',
+        'Arbitrary':    'ARB',
+        'DC':           'DC'
+    }
+
+    # Sequence step play control and marker modes
+    VALID_PLAY_CONTROLS = ['once', 'onceWaitTrig', 'repeat', 'repeatInf', 'repeatTilTrig']
+    VALID_MARKER_MODES = ['maintain', 'lowAtStart', 'highAtStart', 'highStartGoLow']
+
+    # Instrument Constants
+    MIN_ARB_POINTS = 8
+    MAX_DAC_CODE = 32767
+
+    # Models with two channels
+    TWO_CHANNEL_MODELS = ['33510B', '33512B', '33520B', '33522A', '33522B']
+
+    # Names of uploaded waveforms are derived from the content hash
+    ARB_NAME_PREFIX = 'H'
+    ARB_NAME_RE = re.compile(r'^H[0-9A-F]{11}$')
+
+    def __init__(self, resource, **kwargs):
+        super(d_335XX, self).__init__(resource, **kwargs)
+
+        self.NUM_CHANNELS = 1
+
+        # Names of waveforms and sequences in volatile memory of each channel, mapped to their content hash
+        self._arbs = {}
+
+    def open(self):
+        prop = self.resource.getProperties()
+
+        # Identify the number of channels available
+        if prop.get('deviceModel') in self.TWO_CHANNEL_MODELS:
+            self.NUM_CHANNELS = 2
+        else:
+            self.NUM_CHANNELS = 1
+
+        # Binary blocks are sent most significant byte first
+        self.write("FORM:BORD NORM")
+
+        # Waveforms uploaded by this driver are identified by name
+        self._arbs = {}
+        for idx in range(1, self.NUM_CHANNELS + 1):
+            self._arbs[idx] = {}
+
+            for name in self.getArbitraryWaveformCatalog(idx):
+                if self.ARB_NAME_RE.match(name):
+                    self._arbs[idx][name] = name[len(self.ARB_NAME_PREFIX):]
+
+    def close(self):
+        pass
+
     def getProperties(self):
-        pass
\ No newline at end of file
+        return dict(
+            deviceVendor='Agilent Technologies',
+            validFunctions=self.VALID_FUNCTIONS,
+            numChannels=self.NUM_CHANNELS
+        )
+
+    def getError(self):
+        """
+        Get the last recorded error from the instrument
+
+        :return: error code, error message
+        """
+        err = self.query('SYST:ERR?')
+        return err.split(',', 1)
+
+    # ===========================================================================
+    # Output
+    # ===========================================================================
+
+    def setFunction(self, channel, func):
+        """
+        Set the output function
+
+        :param channel:         Channel
+        :type channel:          int
+        :param func:            Output function
+        :type func:             str
+        """
+        func = self.VALID_FUNCTIONS.get(func, func)
+
+        if func not in self.VALID_FUNCTIONS.values():
+            raise ValueError('Invalid function')
+
+        self.write("SOUR{0}:FUNC {1}".format(channel, func))
+
+    def getFunction(self, channel):
+        """
+        Get the output function
+
+        :param channel:         Channel
+        :type channel:          int
+        :rtype:                 str
+        """
+        return self.query("SOUR{0}:FUNC?".format(channel)).strip()
+
+    def setFrequency(self, channel, frequency):
+        """
+        Set the output frequency. Does not apply to arbitrary waveforms, which are set by sample rate.
+
+        :param channel:         Channel
+        :type channel:          int
+        :param frequency:       Frequency (in Hz)
+        :type frequency:        float
+        """
+        self.write("SOUR{0}:FREQ {1!r}".format(channel, float(frequency)))
+
+    def setAmplitude(self, channel, amplitude, offset=None):
+        """
+        Set the output amplitude and offset
+
+        :param channel:         Channel
+        :type channel:          int
+        :param amplitude:       Amplitude (in Vpp)
+        :type amplitude:        float
+        :param offset:          DC offset (in V)
+        :type offset:           float
+        """
+        with self.coalesce():
+            self.write("SOUR{0}:VOLT {1!r}".format(channel, float(amplitude)))
+
+            if offset is not None:
+                self.write("SOUR{0}:VOLT:OFFS {1!r}".format(channel, float(offset)))
+
+    def enableOutput(self, channel):
+        """
+        Enable the output of a channel
+
+        :param channel:         Channel
+        :type channel:          int
+        """
+        self.write("OUTP{0} ON".format(channel))
+
+    def disableOutput(self, channel):
+        """
+        Disable the output of a channel
+
+        :param channel:         Channel
+        :type channel:          int
+        """
+        self.write("OUTP{0} OFF".format(channel))
+
+    # ===========================================================================
+    # Arbitrary Waveforms
+    # ===========================================================================
+
+    def getArbitraryWaveformCatalog(self, channel):
+        """
+        Get the names of the waveforms and sequences in volatile memory
+
+        :param channel:         Channel
+        :type channel:          int
+        :rtype:                 list of str
+        """
+        resp = self.query("SOUR{0}:DATA:VOL:CAT?".format(channel))
+
+        return [name.upper() for name in re.findall(r'"([^"]*)"', resp) if len(name) > 0]
+
+    def clearArbitraryWaveforms(self, channel):
+        """
+        Remove all waveforms and sequences from volatile memory
+
+        :param channel:         Channel
+        :type channel:          int
+        """
+        self.write("SOUR{0}:DATA:VOL:CLE".format(channel))
+
+        self._arbs[channel] = {}
+
+    def uploadArbitraryWaveform(self, channel, data, name=None):
+        """
+        Upload an arbitrary waveform to volatile memory as a binary block of DAC codes. If a waveform with the same
+        content has already been uploaded, the upload is skipped.
+
+        Floating point data is normalized, values between -1.0 and 1.0 span the full output amplitude. Integer data
+        is sent as DAC codes between -32767 and 32767.
+
+        :param channel:         Channel
+        :type channel:          int
+        :param data:            Waveform points
+        :type data:             numpy.ndarray or list
+        :param name:            Waveform name. Defaults to a name derived from the content hash
+        :type name:             str
+        :returns:               Waveform name
+        :rtype:                 str
+        :raises:                ValueError if the waveform is too short, or the name is in use by different data
+        """
+        data = numpy.asarray(data).ravel()
+
+        if len(data) < self.MIN_ARB_POINTS:
+            raise ValueError("Arbitrary waveforms must have at least %d points" % self.MIN_ARB_POINTS)
+
+        if data.dtype.kind in 'iu':
+            dac = numpy.clip(data, -self.MAX_DAC_CODE, self.MAX_DAC_CODE)
+        else:
+            dac = numpy.round(numpy.clip(data, -1.0, 1.0) * self.MAX_DAC_CODE)
+
+        # DAC codes are signed, most significant byte first
+        dac = dac.astype('>i2')
+
+        digest = hashlib.sha1(dac.tobytes()).hexdigest().upper()[:11]
+        if name is None:
+            name = self.ARB_NAME_PREFIX + digest
+        name = name.upper()
+
+        if self._checkArbName(channel, name, digest):
+            self.write_block("SOUR{0}:DATA:ARB:DAC {1},".format(channel, name), dac, '>i2')
+            self._arbs.setdefault(channel, {})[name] = digest
+
+        return name
+
+    def uploadSequence(self, channel, name, steps):
+        """
+        Upload a sequence of waveforms in volatile memory. If the same sequence has already been uploaded, the upload
+        is skipped.
+
+        Each step is a tuple of (waveform name, repeat count, play control, marker mode, marker point). Only the
+        waveform name is required, the remaining values default to (1, 'repeat', 'maintain', 10).
+
+        :param channel:         Channel
+        :type channel:          int
+        :param name:            Sequence name
+        :type name:             str
+        :param steps:           Sequence steps
+        :type steps:            list of tuple
+        :returns:               Sequence name
+        :rtype:                 str
+        :raises:                ValueError if a step is invalid, or the name is in use by a different sequence
+        """
+        defaults = ('', 1, 'repeat', 'maintain', 10)
+        entries = ['"%s"' % name]
+
+        for step in steps:
+            if isinstance(step, basestring):
+                step = (step,)
+
+            arb, count, play, marker, point = tuple(step) + defaults[len(step):]
+
+            if play not in self.VALID_PLAY_CONTROLS:
+                raise ValueError('Invalid play control: %s' % play)
+            if marker not in self.VALID_MARKER_MODES:
+                raise ValueError('Invalid marker mode: %s' % marker)
+
+            entries.append('"%s",%d,%s,%s,%d' % (arb, int(count), play, marker, int(point)))
+
+        content = ','.join(entries)
+
+        digest = hashlib.sha1(content).hexdigest().upper()[:11]
+
+        if self._checkArbName(channel, name.upper(), digest):
+            # Sequence descriptors are sent as a block of ASCII text
+            self.write_block("SOUR{0}:DATA:SEQ".format(channel), numpy.frombuffer(content, dtype=numpy.uint8))
+            self._arbs.setdefault(channel, {})[name.upper()] = digest
+
+        return name
+
+    def _checkArbName(self, channel, name, digest):
+        # Returns False if the same content is already in volatile memory under this name
+        existing = self._arbs.setdefault(channel, {}).get(name)
+
+        if existing == digest:
+            self.logger.debug("%s is already in volatile memory", name)
+            return False
+
+        elif existing is not None:
+            raise ValueError("%s is already in use, clear volatile memory first" % name)
+
+        return True
+
+    def setArbitraryWaveform(self, channel, name, sample_rate=None):
+        """
+        Output a waveform or sequence from volatile memory
+
+        :param channel:         Channel
+        :type channel:          int
+        :param name:            Waveform or sequence name
+        :type name:             str
+        :param sample_rate:     Sample rate (in Sa/s)
+        :type sample_rate:      float
+        """
+        with self.coalesce():
+            self.write("SOUR{0}:FUNC:ARB {1}".format(channel, name))
+
+            if sample_rate is not None:
+                self.write("SOUR{0}:FUNC:ARB:SRAT {1!r}".format(channel, float(sample_rate)))
+
+            self.write("SOUR{0}:FUNC ARB".format(channel))
+
+    def setArbitrarySampleRate(self, channel, sample_rate):
+        """
+        Set the sample rate of arbitrary waveforms
+
+        :param channel:         Channel
+        :type channel:          int
+        :param sample_rate:     Sample rate (in Sa/s)
+        :type sample_rate:      float
+        """
+        self.write("SOUR{0}:FUNC:ARB:SRAT {1!r}".format(channel, float(sample_rate)))
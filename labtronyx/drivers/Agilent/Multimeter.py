@@ -4,9 +4,13 @@
 
 """
 import labtronyx
+from labtronyx.common.timing import monotonic
+from labtronyx.common.rpc import local_only
 
-import time
 import re
+import time
+
+import numpy
 
 
 class d_3441XA(labtronyx.DriverBase):
@@ -44,6 +48,12 @@ class d_3441XA(labtronyx.DriverBase):
         'Bus': 'BUS', 
         'External': 'EXT'
     }
+
+    # Readings with timestamps, see :func:`getBurst`
+    BURST_DTYPE = numpy.dtype([('time', 'f8'), ('value', 'f8')])
+
+    # Interval (in seconds) between checks for new readings during a burst
+    BURST_POLL_INTERVAL = 0.01
     
     ERROR_CODES = {
         0: "No error",
@@ -89,6 +99,11 @@ class d_3441XA(labtronyx.DriverBase):
         550: "Not able to execute command in local mode",
         624: "Unable to sense line frequency"}
     
+    def __init__(self, resource, **kwargs):
+        super(d_3441XA, self).__init__(resource, **kwargs)
+
+        self._burst = None
+
     def open(self):
         self._mode = ''
         self.getMode()
@@ -347,7 +362,8 @@ class d_3441XA(labtronyx.DriverBase):
             try:
                 # Initiate a measurement
                 self.write("INIT")
-                time.sleep(0.01)
+
+                # FETC? does not return until the measurement is complete
                 data = str(self.query("FETC?"))
                 if ',' in data:
                     data = data.split(',')
@@ -359,6 +375,178 @@ class d_3441XA(labtronyx.DriverBase):
                 # Try again
                 pass
 
+    def startBurst(self, samples, triggers=1, sample_interval=None):
+        """
+        Configure and start a burst of readings. Readings are returned in binary format and are read from reading
+        memory while the measurement continues, using :func:`iterBurst` or :func:`getBurst`.
+
+        :param samples: Number of readings per trigger
+        :type samples: int
+        :param triggers: Number of triggers to accept, 0 to measure continuously until :func:`abortBurst` is called
+        :type triggers: int
+        :param sample_interval: Time (in seconds) between readings. If not provided, readings are taken as fast as
+                                the integration rate and trigger delay allow
+        :type sample_interval: float
+        """
+        with self.coalesce():
+            # Binary readings, most significant byte first
+            self.write("FORM REAL,64")
+            self.write("FORM:BORD NORM")
+
+            self.write("SAMP:COUN %i" % int(samples))
+            self.write("TRIG:COUN %s" % (int(triggers) if triggers > 0 else 'INF'))
+
+            if sample_interval is not None:
+                self.write("SAMP:SOUR TIM")
+                self.write("SAMP:TIM %r" % float(sample_interval))
+            else:
+                self.write("SAMP:SOUR IMM")
+
+            self.write("INIT")
+
+        self._burst = {
+            'total': int(samples) * int(triggers) if triggers > 0 else None,
+            'interval': sample_interval,
+            'received': 0,
+            'start': monotonic()
+        }
+
+        self.checkForError()
+
+    def abortBurst(self):
+        """
+        Stop a burst and return to single ASCII readings. Readings that have not been read remain in reading memory.
+        """
+        self.write("ABOR")
+
+        self._endBurst()
+
+    def _endBurst(self):
+        # Restore the reading format and counts used by getMeasurement
+        with self.coalesce():
+            self.write("FORM ASC")
+            self.write("SAMP:COUN 1")
+            self.write("TRIG:COUN 1")
+            self.write("SAMP:SOUR IMM")
+
+        self._burst = None
+
+    @local_only
+    def iterBurst(self, block_size=1000, timestamps=False, timeout=10.0):
+        """
+        Read the readings of a burst started with :func:`startBurst` in blocks of at most `block_size` readings, as
+        soon as they are available. Readings are removed from reading memory as they are read, so measurements can
+        continue indefinitely while the readings are logged.
+
+        Iteration stops when all readings of the burst have been read, and the instrument returns to single ASCII
+        readings. Continuous bursts never complete, stop iterating and call :func:`abortBurst` to stop the
+        measurement.
+
+        Timestamps are relative to the start of the burst. If a sample interval was configured, timestamps are
+        calculated from the interval, otherwise the time at which each block was received is used.
+
+        Example::
+
+            dmm.startBurst(1000, triggers=0, sample_interval=0.001)
+
+            for block in dmm.iterBurst(timestamps=True):
+                log.write(block.tobytes())
+
+        Returns a generator, so this method is only usable locally.
+
+        :param block_size: Maximum number of readings read at a time
+        :type block_size: int
+        :param timestamps: Return structured arrays with the fields `time` and `value`
+        :type timestamps: bool
+        :param timeout: Time (in seconds) without new readings before the burst is considered failed
+        :type timeout: float
+        :returns: generator of numpy arrays
+        :raises: labtronyx.InterfaceTimeout
+        """
+        burst = self._burst
+        if burst is None:
+            raise RuntimeError("Burst has not been started")
+
+        last_data = monotonic()
+
+        while burst['total'] is None or burst['received'] < burst['total']:
+            size = block_size
+            if burst['total'] is not None:
+                size = min(size, burst['total'] - burst['received'])
+
+            # R? returns at most the requested number of readings, without waiting for more readings to arrive
+            self.write("R? %i" % size)
+            data = self.read_block('>f8')
+            now = monotonic()
+
+            if len(data) == 0:
+                if now - last_data >= timeout:
+                    raise labtronyx.InterfaceTimeout("No readings received for %.1f seconds" % timeout)
+
+                time.sleep(self.BURST_POLL_INTERVAL)
+                continue
+
+            last_data = now
+
+            if timestamps:
+                block = numpy.empty(len(data), dtype=self.BURST_DTYPE)
+                block['value'] = data
+
+                if burst['interval'] is not None:
+                    block['time'] = numpy.arange(burst['received'], burst['received'] + len(data)) * burst['interval']
+                else:
+                    block['time'] = now - burst['start']
+
+            else:
+                block = data.astype(numpy.float64)
+
+            burst['received'] += len(data)
+
+            yield block
+
+        if self._burst is burst:
+            self._endBurst()
+
+    def getBurst(self, samples, triggers=1, sample_interval=None, timestamps=False, timeout=10.0):
+        """
+        Take a burst of readings and return them when the burst is complete. See :func:`startBurst` and
+        :func:`iterBurst`.
+
+        Returns a numpy array, converted to a list when called remotely.
+
+        :param samples: Number of readings per trigger
+        :type samples: int
+        :param triggers: Number of triggers to accept
+        :type triggers: int
+        :param sample_interval: Time (in seconds) between readings
+        :type sample_interval: float
+        :param timestamps: Return a structured array with the fields `time` and `value`
+        :type timestamps: bool
+        :param timeout: Time (in seconds) without new readings before the burst is considered failed
+        :type timeout: float
+        :rtype: numpy.ndarray
+        :raises: labtronyx.InterfaceTimeout
+        """
+        if int(triggers) < 1:
+            raise ValueError("Continuous bursts must be read with iterBurst")
+
+        total = int(samples) * int(triggers)
+        ret = numpy.empty(total, dtype=self.BURST_DTYPE if timestamps else numpy.float64)
+        received = 0
+
+        self.startBurst(samples, triggers, sample_interval)
+
+        try:
+            for block in self.iterBurst(timestamps=timestamps, timeout=timeout):
+                ret[received:received + len(block)] = block
+                received += len(block)
+
+        except:
+            self.abortBurst()
+            raise
+
+        return ret
+
     def setIntegrationRate(self, value):
         """
         Set the integration period (measurement speed) for the basic measurement
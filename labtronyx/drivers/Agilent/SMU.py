@@ -3,6 +3,12 @@
 
 """
 import labtronyx
+from labtronyx.common.timing import monotonic
+from labtronyx.common.rpc import local_only
+
+import time
+
+import numpy
 
 
 class d_B29XX(labtronyx.DriverBase):
@@ -12,7 +18,7 @@ class d_B29XX(labtronyx.DriverBase):
     author = 'KKENNEDY'
     version = '1.0'
     deviceType = 'Source Measurement Unit'
-    compatibleInterfaces = ['VISA']
+    compatibleInterfaces = ['VISA', 'Socket']
     compatibleInstruments = {
         'Agilent': ['B2901A', 'B2902A']
     }
@@ -73,6 +79,23 @@ class d_B29XX(labtronyx.DriverBase):
     # Instrument Constants
     MIN_APERTURE_TIME = 0.000008
     MAX_APERTURE_TIME = 2.0
+    MAX_TRACE_POINTS = 100000
+
+    # Binary data points, in the order set by :FORM:ELEM:SENS. REAL64 data is big-endian with :FORM:BORD NORM
+    TRACE_DTYPE = numpy.dtype([('voltage', '>f8'), ('current', '>f8'), ('time', '>f8')])
+
+    # Interval (in seconds) between checks for new data points in the trace buffer
+    TRACE_POLL_INTERVAL = 0.1
+
+    # Maximum number of points in a list, and the number of points sent per command when a list is sent as ASCII
+    MAX_LIST_POINTS = 100000
+    LIST_CHUNK_POINTS = 500
+
+    def __init__(self, resource, **kwargs):
+        super(d_B29XX, self).__init__(resource, **kwargs)
+
+        # Instrument support for lists sent as binary blocks, None until it has been tried
+        self._binary_lists = None
 
     def open(self):
         prop = self.resource.getProperties()
@@ -340,12 +363,13 @@ class d_B29XX(labtronyx.DriverBase):
 
         outp_mode = self._mode_source.get(channel)
 
-        self.write(":SOUR{0}:{1}:START {2}".format(channel, outp_mode, start))
-        self.write(":SOUR{0}:{1}:STOP {2}".format(channel, outp_mode, stop))
-        self.write(":SOUR{0}:{1}:POIN {2}".format(channel, outp_mode, points))
+        with self.coalesce():
+            self.write(":SOUR{0}:{1}:START {2!r}".format(channel, outp_mode, float(start)))
+            self.write(":SOUR{0}:{1}:STOP {2!r}".format(channel, outp_mode, float(stop)))
+            self.write(":SOUR{0}:{1}:POIN {2}".format(channel, outp_mode, int(points)))
 
-        # Direction is UP (start -> stop)
-        self.write(":SOUR{0}:SWE:DIR UP".format(channel))
+            # Direction is UP (start -> stop)
+            self.write(":SOUR{0}:SWE:DIR UP".format(channel))
 
     def setSourceList(self, channel, source_points=()):
         """
@@ -359,19 +383,65 @@ class d_B29XX(labtronyx.DriverBase):
            powerOn(1)
            startProgram(1)
 
+        Points are sent as a binary block of double precision values. The error queue is cleared before the block is
+        sent and checked afterwards, so a rejected block is not mistaken for the previous list if it has the same
+        number of points. If the instrument or resource does not accept binary blocks, points are sent as ASCII in
+        chunks of `LIST_CHUNK_POINTS` points. The number of points is verified once all points have been sent.
+
         :param channel:         SMU Channel
         :type channel:          int
         :param source_points:   List of points to traverse
-        :type source_points:    list
+        :type source_points:    list or numpy.ndarray
+        :raises:                ValueError if the list is empty or too long
+        :raises:                RuntimeError if the number of points on the instrument does not match
         """
+        points = numpy.asarray(source_points, dtype=numpy.float64).ravel()
+
+        if not 0 < len(points) <= self.MAX_LIST_POINTS:
+            raise ValueError("Lists must have between 1 and %d points" % self.MAX_LIST_POINTS)
+
         # Sweep mode
         self._setSourceMode(channel, 'LIST')
 
         outp_mode = self._mode_source.get(channel)
-        str_points = [str(x) for x in source_points]
-        flat_points = ','.join(str_points)
+        command = ":SOUR{0}:LIST:{1}".format(channel, outp_mode)
+
+        if self._binary_lists is not False and hasattr(self.resource, 'write_block'):
+            with self.coalesce():
+                self.write("*CLS")
+                self.write(":FORM REAL64")
+                self.write(":FORM:BORD NORM")
+
+            self.write_block(command, points, '>f8')
+
+            # The list is unchanged if the block was rejected
+            error = self.getError()
+
+            if float(error[0]) == 0 and self._getListPoints(command) == len(points):
+                self._binary_lists = True
+                return
 
-        self.write(":SOUR{0}:LIST:{1} {2}".format(channel, outp_mode, flat_points))
+            if self._binary_lists:
+                raise RuntimeError('Set value failed verification: %s' % ','.join(error))
+
+            self.logger.info("Binary lists are not supported, sending list as ASCII")
+            self._binary_lists = False
+
+            # Discard the error caused by the binary block
+            self.write("*CLS")
+
+        for start in range(0, len(points), self.LIST_CHUNK_POINTS):
+            chunk = points[start:start + self.LIST_CHUNK_POINTS]
+
+            # The first chunk replaces the list, the rest are appended. repr preserves full precision
+            self.write("{0}{1} {2}".format(command, ':APP' if start > 0 else '', ','.join(map(repr, chunk.tolist()))))
+
+        if self._getListPoints(command) != len(points):
+            raise RuntimeError('Set value failed verification')
+
+    def _getListPoints(self, command):
+        # Number of points in a source list
+        return int(float(self.query(command + ":POIN?")))
 
     def setMeasureMode(self, channel, measure_mode):
         """
@@ -546,32 +616,29 @@ class d_B29XX(labtronyx.DriverBase):
 
         self.write(":SENS{0}:{1}:RANG:AUTO ON".format(channel, meas_mode))
 
+    def _queryBinary(self, query):
+        # Send a query with the binary data format and read the data points
+        with self.coalesce():
+            # Use binary data format for speed
+            self.write(":FORM:ELEM:SENS VOLT,CURR,TIME")
+            self.write(":FORM REAL64")
+            self.write(":FORM:BORD NORM")
+            self.write(query)
+
+        return self.read_block(self.TRACE_DTYPE)
+
     def getMeasurementData(self, channel):
         """
         Get the measurement data from the instrument
 
+        Returns a numpy structured array with the fields `voltage`, `current` and `time`, converted to a list of
+        (voltage, current, time) when called remotely.
+
         :param channel:         SMU Channel
         :type channel:          int
+        :rtype:                 numpy.ndarray
         """
-        self.write(":FORM:ELEM:SENS VOLT,CURR,TIME")
-
-        # Use binary data format for speed
-        self.write(":FORM REAL64")
-
-        try:
-            import numpy as np
-
-            data = self.query_binary_values(":FETCH:ARR? (@{0})".format(channel), datatype='d', container=np.array)
-            np.reshape(data, (3, -1))
-
-            return data
-
-        except ImportError:
-            data = self.query_binary_values(":FETCH:ARR? (@{0})".format(channel), datatype='d')
-
-            import itertools
-            args = [iter(data)] * 3
-            return list(itertools.izip_longest(*args, fillvalue=0.0))
+        return self._queryBinary(":FETCH:ARR? (@{0})".format(channel))
 
     def setTraceBufferPoints(self, channel, data_points):
         """
@@ -585,7 +652,7 @@ class d_B29XX(labtronyx.DriverBase):
         self.write(":TRAC{0}:POIN {1}".format(channel, data_points))
 
         # Verify
-        if self.getTraceBufferPoints(channel) != data_points:
+        if self.getTraceBufferPoints(channel)[0] != data_points:
             raise RuntimeError('Set value failed verification')
 
     def getTraceBufferPoints(self, channel):
@@ -595,11 +662,11 @@ class d_B29XX(labtronyx.DriverBase):
         :param channel:         SMU Channel
         :type channel:          int
         :return:                Buffer size, number of points in the buffer
+        :rtype:                 tuple of int
         """
-        buf_size = self.query(":TRAC{0}:POIN?".format(channel))
-        buf_act = self.query(":TRAC{0}:POIN:ACT?".format(channel))
+        buf_size, buf_act = self.query(":TRAC{0}:POIN?;:TRAC{0}:POIN:ACT?".format(channel)).split(';')
 
-        return buf_size, buf_act
+        return int(float(buf_size)), int(float(buf_act))
 
     def enableTraceBuffer(self, channel):
         """
@@ -608,12 +675,13 @@ class d_B29XX(labtronyx.DriverBase):
         :param channel:         SMU Channel
         :type channel:          int
         """
-        self.write(":FORM:ELEM:SENS VOLT,CURR,TIME")
-        self.write(":TRAC{0}:FEED SENS".format(channel)) # Get data from the measurement unit
-        self.write(":TRAC{0}:TST:FORM ABS".format(channel)) # Absolute timestamps
+        with self.coalesce():
+            self.write(":FORM:ELEM:SENS VOLT,CURR,TIME")
+            self.write(":TRAC{0}:FEED SENS".format(channel)) # Get data from the measurement unit
+            self.write(":TRAC{0}:TST:FORM ABS".format(channel)) # Absolute timestamps
 
-        # Enable the trace buffer
-        self.write(":TRAC{0}:FEED:CONT NEXT".format(channel))
+            # Enable the trace buffer
+            self.write(":TRAC{0}:FEED:CONT NEXT".format(channel))
 
     def clearTraceBuffer(self, channel):
         """
@@ -630,17 +698,79 @@ class d_B29XX(labtronyx.DriverBase):
 
     def getTraceBuffer(self, channel, offset=0, size=None):
         """
-        Returns data in the trace buffer of the specified channel.
+        Returns data in the trace buffer of the specified channel. Data is transferred in the binary REAL64 format.
+
+        Returns a numpy structured array with the fields `voltage`, `current` and `time`, converted to a list of
+        (voltage, current, time) when called remotely.
+
+        To read the buffer incrementally while the acquisition continues, use the number of points in the buffer from
+        :func:`getTraceBufferPoints` as a cursor, or use :func:`iterTraceBuffer` locally.
 
         :param channel:         SMU Channel
         :type channel:          int
         :param offset:          Indicates the beginning index of the data
         :type offset:           int
-        :param size:            Number of data bytes to retrieve
+        :param size:            Number of data points to retrieve. Defaults to all data points after `offset`
         :type size:             int
-        :return:
+        :rtype:                 numpy.ndarray
+        """
+        if size is None:
+            return self._queryBinary(":TRAC{0}:DATA? {1}".format(channel, int(offset)))
+
+        elif size <= 0:
+            return numpy.empty(0, dtype=self.TRACE_DTYPE)
+
+        return self._queryBinary(":TRAC{0}:DATA? {1},{2}".format(channel, int(offset), int(size)))
+
+    @local_only
+    def iterTraceBuffer(self, channel, offset=0, chunk_size=10000, idle_timeout=1.0):
         """
-        return self.query(":TRAC{0}:DATA?".format(channel))
+        Drain the trace buffer incrementally while the acquisition continues. The number of data points in the buffer
+        is used as a cursor, and new data points are transferred in chunks of at most `chunk_size` points as soon as
+        they are available.
+
+        Iteration stops when the buffer is full, or when no new data points are recorded for `idle_timeout` seconds.
+
+        Example::
+
+            smu.enableTraceBuffer(1)
+            smu.startProgram(1)
+
+            for chunk in smu.iterTraceBuffer(1):
+                log.write(chunk.tobytes())
+
+        Returns a generator, so this method is only usable locally.
+
+        :param channel:         SMU Channel
+        :type channel:          int
+        :param offset:          Index of the first data point to transfer
+        :type offset:           int
+        :param chunk_size:      Maximum number of data points transferred at a time
+        :type chunk_size:       int
+        :param idle_timeout:    Time (in seconds) without new data points after which to stop
+        :type idle_timeout:     float
+        :returns:               generator of numpy structured arrays
+        """
+        buf_size = self.getTraceBufferPoints(channel)[0]
+        last_data = monotonic()
+
+        while offset < buf_size:
+            available = int(float(self.query(":TRAC{0}:POIN:ACT?".format(channel))))
+
+            if available > offset:
+                data = self.getTraceBuffer(channel, offset, min(chunk_size, available - offset))
+
+                if len(data) > 0:
+                    offset += len(data)
+                    last_data = monotonic()
+
+                    yield data
+                    continue
+
+            if monotonic() - last_data >= idle_timeout:
+                break
+
+            time.sleep(self.TRACE_POLL_INTERVAL)
 
     def setTriggerSource(self, channel, triggerSource):
         """
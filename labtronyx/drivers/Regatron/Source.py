@@ -67,7 +67,7 @@ class d_TopCon(labtronyx.DriverBase):
         
         full = header + frame
         
-        self.write(full)
+        self.write_raw(full)
         self.flush()
         
     def _recvFrame(self):
@@ -79,12 +79,12 @@ class d_TopCon(labtronyx.DriverBase):
         
         :returns: byte string, payload section of frame
         """
-        header = self.read(3)
+        header = self.read_raw(3)
         
         sync, len, checksum = struct.unpack('BBB', header)
         # TODO Verify checksum?
         
-        payload = self.read(len)
+        payload = self.read_raw(len)
         
         return payload
         
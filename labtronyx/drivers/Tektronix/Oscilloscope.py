@@ -24,15 +24,127 @@ Screenshots can be saved to the oscilloscope hard drive and must be retrieved
 using other means.
 """
 import labtronyx
+from labtronyx.common import ieee488
+from labtronyx.common.timing import poll
+from labtronyx.common.rpc import local_only
+from labtronyx.common.waveform import WaveformChannel, open_writer
 
+import re
 import time
-import struct
 import base64
-import csv
+import calendar
+import datetime
 
 import numpy
 
 
+def _parse_timestamps(resp):
+    # Parse FastFrame timestamps (e.g. "02 Mar 2016 14:41:44.437 180 765") into seconds relative to the first
+    # timestamp. Whole seconds and fractions are subtracted separately, so that sub-nanosecond resolution is preserved
+    stamps = re.findall(r'(\d{1,2}) (\w{3}) (\d{4}) (\d{1,2}):(\d{2}):(\d{2})(?:\.([\d ]*\d))?', resp)
+
+    seconds = numpy.empty(len(stamps), dtype=numpy.int64)
+    fractions = numpy.empty(len(stamps), dtype=numpy.float64)
+
+    for idx, (day, month, year, hour, minute, second, fraction) in enumerate(stamps):
+        stamp = datetime.datetime.strptime('%s %s %s %s:%s:%s' % (day, month, year, hour, minute, second),
+                                           '%d %b %Y %H:%M:%S')
+        seconds[idx] = calendar.timegm(stamp.timetuple())
+        fractions[idx] = float('0.' + fraction.replace(' ', '')) if fraction else 0.0
+
+    if len(stamps) == 0:
+        return fractions
+
+    return (seconds - seconds[0]) + (fractions - fractions[0])
+
+
+# Value returned for a measurement that could not be made
+_MEAS_INVALID = 9.9e37
+
+# Fields of each measurement slot, and the fields only included with statistics
+_MEAS_FIELDS = [('Type', 'TYPE'), ('Source', 'SOURCE1'), ('Units', 'UNITS'), ('Value', 'VALUE')]
+_MEAS_STATISTICS = [('Mean', 'MEAN'), ('Minimum', 'MINIMUM'), ('Maximum', 'MAXIMUM'), ('StdDev', 'STDDEV'),
+                    ('Count', 'COUNT')]
+
+
+def _set_measurement(driver, slots, kwargs):
+    # Configure a measurement slot, see setMeasurementSetup
+    slot = int(kwargs.get('Slot', 1))
+    if slot not in slots:
+        driver.logger.error("Invalid measurement slot: %s", slot)
+        return False
+
+    for key in ['Source', 'Source2']:
+        if key in kwargs and kwargs[key] not in driver.validWaveforms:
+            driver.logger.error("Invalid measurement source: %s", kwargs[key])
+            return False
+
+    prefix = 'MEASU:MEAS%i:' % slot
+
+    with driver.coalesce():
+        if 'Type' in kwargs:
+            driver.write(prefix + 'TYPE ' + str(kwargs['Type']))
+        if 'Source' in kwargs:
+            driver.write(prefix + 'SOURCE1 ' + kwargs['Source'])
+        if 'Source2' in kwargs:
+            driver.write(prefix + 'SOURCE2 ' + kwargs['Source2'])
+        if 'State' in kwargs:
+            driver.write(prefix + 'STATE ' + str(kwargs['State']))
+        if 'Statistics' in kwargs:
+            driver.write('MEASU:STATI:MODE ' + str(kwargs['Statistics']))
+
+    return True
+
+
+def _get_measurements(driver, slots, statistics):
+    # Read every enabled measurement slot with a single query, see getMeasurements
+    fields = _MEAS_FIELDS + (_MEAS_STATISTICS if statistics else [])
+
+    queries = []
+    for slot in slots:
+        queries.append('MEASU:MEAS%i:STATE?' % slot)
+        queries.extend(['MEASU:MEAS%i:%s?' % (slot, field) for _, field in fields])
+
+    resp = ieee488.split_response(driver.query(ieee488.join_commands(queries)))
+
+    if len(resp) != len(queries):
+        raise labtronyx.InvalidResponse("Expected %i measurement values, got %i" % (len(queries), len(resp)))
+
+    ret = {}
+
+    for idx, slot in enumerate(slots):
+        values = resp[idx * (len(fields) + 1):(idx + 1) * (len(fields) + 1)]
+
+        if not int(values[0]):
+            continue
+
+        meas = {}
+        for (key, _), value in zip(fields, values[1:]):
+            if key in ('Type', 'Source', 'Units'):
+                meas[key] = value.strip('"')
+            elif key == 'Count':
+                meas[key] = int(float(value))
+            else:
+                value = float(value)
+                meas[key] = float('nan') if abs(value) >= _MEAS_INVALID else value
+
+        ret['MEAS%i' % slot] = meas
+
+    return ret
+
+
+def _parse_headers(resp):
+    # Parse a response with headers enabled into a dict of header mnemonic to value. Headers after the first unit are
+    # relative to the previous header, so only the last mnemonic of each header is used
+    ret = {}
+
+    for unit in ieee488.split_response(resp):
+        header, _, value = unit.partition(' ')
+        ret[header.split(':')[-1].upper()] = value.strip()
+
+    return ret
+
+
 class d_2XXX(labtronyx.DriverBase):
     """
     Driver for Tektronix 2000 Series Oscilloscopes
@@ -40,7 +152,7 @@ class d_2XXX(labtronyx.DriverBase):
     author = 'KKENNEDY'
     version = '1.0'
     deviceType = 'Oscilloscope'
-    compatibleInterfaces = ['VISA']
+    compatibleInterfaces = ['VISA', 'Socket']
     compatibleInstruments = {
         'Tektronix': [# MSO2XXX
                      "MSO2002B", "MSO2004B", "MSO2012", "MSO2012B",
@@ -58,6 +170,14 @@ class d_2XXX(labtronyx.DriverBase):
         return identity[0] in vendors and identity[1] in cls.compatibleInstruments['Tektronix']
 
     validWaveforms = ['CH1', 'CH2', 'CH3', 'CH4', 'REF1', 'REF2', 'MATH1']
+
+    validMeasurementSlots = [1, 2, 3, 4]
+
+    def __init__(self, resource, **kwargs):
+        super(d_2XXX, self).__init__(resource, **kwargs)
+
+        self.data = {}
+        self.invalidateCache()
     
     def open(self):
         # Configure scope
@@ -68,9 +188,36 @@ class d_2XXX(labtronyx.DriverBase):
             self.write('HEADER OFF')
             
         self.data = {}
+        self.invalidateCache()
         
     def close(self):
         pass
+
+    def invalidateCache(self):
+        """
+        Discard the cached list of enabled waveforms. Waveforms enabled or disabled from the front panel or with direct
+        commands are not detected, call this method after changing the enabled waveforms.
+        """
+        self._enabled = None
+
+    def _queryHeaders(self, query):
+        # Query with headers enabled, so that each value in the response can be identified by its header
+        try:
+            return _parse_headers(self.query("HEADER 1;:VERBOSE 1;:%s;:HEADER 0" % query))
+
+        except:
+            # Other queries expect responses without headers
+            self.write('HEADER 0')
+            raise
+
+    def _getPreamble(self, ch):
+        # Get the preamble of a waveform with a single query. Selects the waveform as the data source
+        with self.coalesce():
+            self.write("DATA:SOURCE %s" % ch)
+            self.write("DATA:ENC RIB")
+            self.write("DATA:START 1")
+
+        return self._queryHeaders("WFMOUTPRE?;:WFMOUTPRE:RECORDLENGTH?")
     
     def statusBusy(self):
         """
@@ -87,30 +234,39 @@ class d_2XXX(labtronyx.DriverBase):
         
     def waitUntilReady(self, interval=1.0, timeout=10.0):
         """
-        Poll the oscilloscope until ready or until `timeout` seconds has passed
-        
-        :param interval: Polling interval in seconds
+        Wait until the oscilloscope has completed all pending operations or until `timeout` seconds has passed.
+
+        If the resource supports it, the resource waits for completion, see :func:`SCPIResourceMixin.wait_for_opc`.
+        Otherwise the oscilloscope is polled, starting with a short interval that backs off exponentially to
+        `interval`.
+
+        :param interval: Maximum polling interval in seconds
         :type interval: float
         :param timeout: Seconds until timeout occurs
         :type timeout: float
         :returns: bool - True if instrument becomes ready, False if timeout occurs
         """
         try:
-            lapsed = 0.0
-            while lapsed < timeout:
-                if not self.statusBusy():
-                    return True
-                time.sleep(interval)
-                lapsed += interval
-                
+            if hasattr(self.resource, 'wait_for_opc'):
+                self.wait_for_opc(timeout)
+                return True
+
+            if poll(lambda: not self.statusBusy(), timeout, maximum=interval):
+                return True
+
             self.logger.debug('Instrument was not ready before timeout occurred')
             return False
+
+        except labtronyx.InterfaceTimeout:
+            self.logger.debug('Instrument was not ready before timeout occurred')
+            return False
+
         except:
             self.logger.exception("An error occurred in waitUntilReady()")
             
     def getEnabledWaveforms(self):
         """
-        Get a list of the enabled waveforms.
+        Get a list of the enabled waveforms. The list is cached until :func:`invalidateCache` is called.
         
         Example::
         
@@ -119,19 +275,32 @@ class d_2XXX(labtronyx.DriverBase):
         
         :returns: list
         """
-        en_ch = []
-        
-        for ch in self.validWaveforms:
-            resp = self.query('SELECT:' + ch + '?')
-            if int(resp):
-                en_ch.append(ch)
-        
-        return en_ch
+        if self._enabled is None:
+            resp = self._queryHeaders('SELECT?')
+            en_ch = []
+
+            for ch in self.validWaveforms:
+                # Waveforms missing from the response are queried individually
+                state = resp[ch] if ch in resp else self.query('SELECT:' + ch + '?')
+                if int(state):
+                    en_ch.append(ch)
+
+            self._enabled = en_ch
+
+        return list(self._enabled)
     
     
-    def getWaveform(self):
+    def getWaveform(self, dtype='float64'):
         """
-        Get the waveform data from the oscilloscope
+        Get the waveform data from the oscilloscope. Samples are stored as numpy arrays, the time axis is always stored
+        with double precision.
+
+        The preamble of each waveform is read with a single query for each capture, so scale changes made from the front
+        panel are picked up. The list of enabled waveforms is cached, see :func:`invalidateCache`.
+
+        :param dtype: Data type of the scaled samples, 'float32' halves the memory used by each channel
+        :type dtype: str
+        :returns: dict of numpy arrays, converted to lists when called remotely
         """
         if not self.waitUntilReady(1.0, 10.0):
             self.logger.error("Unable to export waveform while oscilloscope is busy")
@@ -142,64 +311,109 @@ class d_2XXX(labtronyx.DriverBase):
         
         # Get the list of enabled waveforms before we begin
         enabledWaveforms = self.getEnabledWaveforms()
-        
-        # Record Length
-        self.write("DATA:SOURCE %s" % enabledWaveforms[0])
-        samples = int(self.query("WFMO:RECO?"))
-        self.logger.debug("Record Length: %i" % samples)
-        
-        # Time of the first point in the waveform
-        t_0 = float(self.query("WFMO:XZE?"))
-        self.logger.debug("Time of first point: %f" % t_0)
-        
-        # Horizontal units
-        x_scale = float(self.query("WFMO:XIN?"))
-        self.logger.debug("Time Scale: %f", x_scale)
-        
-        # Number of bytes per data point
-        data_width = int(self.query("WFMO:BYT_NR?"))
-        
-        self.data['Time'] = list(numpy.arange(t_0, samples-1) * x_scale)
-        
+
+        if len(enabledWaveforms) == 0:
+            self.logger.error("No waveforms are enabled")
+            return self.data
+
         for ch in enabledWaveforms:
-            self.write("DATA:SOURCE %s" % ch)
-            self.write("DATA:ENC SRP")
-            self.write("DATA:START 1")
-            self.write("DATA:STOP %i" % samples)
-            
+            # Selects the waveform as the data source
+            preamble = self._getPreamble(ch)
+
+            if 'Time' not in self.data:
+                # Record Length
+                samples = int(preamble['RECORDLENGTH'])
+                self.logger.debug("Record Length: %i" % samples)
+
+                # Time of the first point in the waveform
+                t_0 = float(preamble['XZERO'])
+                self.logger.debug("Time of first point: %f" % t_0)
+
+                # Horizontal units
+                x_scale = float(preamble['XINCR'])
+                self.logger.debug("Time Scale: %f", x_scale)
+
+                time_axis = numpy.arange(samples, dtype=numpy.float64)
+                time_axis *= x_scale
+                time_axis += t_0
+                self.data['Time'] = time_axis
+
             # Get scale factors for each channel
-            y_scale = float(self.query("WFMO:YMULT?"))
-            y_zero = float(self.query("WFMO:YZERO?"))
-            y_offset = float(self.query("WFMO:YOFF?"))
-            y_units = str(self.query("WFMO:YUNIT?"))
-            self.logger.debug("Y Units: %s" % y_units)
-            
+            y_scale = float(preamble['YMULT'])
+            y_zero = float(preamble['YZERO'])
+            y_offset = float(preamble['YOFF'])
+            self.logger.debug("Y Units: %s" % preamble['YUNIT'])
+
+            # Number of bytes per data point
+            data_width = int(preamble['BYT_NR'])
+
+            self.write("DATA:STOP %i" % samples)
+
             # Collect and process data
             self.logger.info("Processing Data for %s....", ch)
             self.write("CURVE?")
-            data_raw = self.read_raw()
-            
-            headerlen = 2 + int(data_raw[1])
-            header = data_raw[:headerlen]
-            data = data_raw[headerlen:-1]
-            elems = len(data) / data_width
-            
-            if data_width == 2:
-                data = struct.unpack('%sH' % elems, data)
-            elif data_width == 1:
-                data = struct.unpack('%sB' % elems, data)
-            else:
-                self.logger.error('Unhandled data width in getWaveform')
-                
-            # Utilize numpy if possible, its more efficient
-            data = numpy.array(data)
-                
-            data_scaled = (data - y_offset) * y_scale + y_zero
-            
-            self.data[ch] = data_scaled.tolist()
+
+            # RIBinary data points are signed, most significant byte first
+            data = self.read_block('>i%d' % data_width)
+
+            # Scale in place so that only one copy of the samples is made
+            data_scaled = data.astype(dtype)
+            data_scaled -= y_offset
+            data_scaled *= y_scale
+            data_scaled += y_zero
+
+            self.data[ch] = data_scaled
             
         return self.data
     
+    def setMeasurementSetup(self, **kwargs):
+        """
+        Configure a measurement slot. The oscilloscope updates the measurement on every acquisition, use
+        :func:`getMeasurements` to read all measurements at once instead of transferring the waveform.
+
+        :param Slot: Measurement slot - [1-4]
+        :type Slot: int
+        :param Type: Measurement type (e.g. 'RMS', 'FREQUENCY', 'RISE', 'PK2PK')
+        :type Type: str
+        :param Source: Waveform to measure
+        :type Source: str
+        :param Source2: Second waveform for measurements between two waveforms (e.g. 'DELAY', 'PHASE')
+        :type Source2: str
+        :param State: Measurement State - ['ON', 'OFF']
+        :type State: str
+        :param Statistics: Statistics mode, applies to all measurements - ['OFF', 'ALL']
+        :type Statistics: str
+        :returns: bool - True if successful, False otherwise
+        """
+        return _set_measurement(self, self.validMeasurementSlots, kwargs)
+
+    def getMeasurements(self, statistics=True):
+        """
+        Read all enabled measurements with a single query.
+
+        Example::
+
+            >> scope.setMeasurementSetup(Slot=1, Type='RMS', Source='CH1', State='ON')
+            >> scope.getMeasurements()
+            {'MEAS1': {'Type': 'RMS', 'Source': 'CH1', 'Units': 'V', 'Value': 0.707, 'Mean': 0.706, ...}}
+
+        Returned data has a key for each enabled measurement slot (e.g. 'MEAS1'), each with the following keys:
+
+            * 'Type' - Measurement Type
+            * 'Source' - Measured Waveform
+            * 'Units' - Measurement Units
+            * 'Value' - Value from the last acquisition
+            * 'Mean', 'Minimum', 'Maximum', 'StdDev' - Statistics, if `statistics` is True
+            * 'Count' - Number of acquisitions included in the statistics, if `statistics` is True
+
+        Measurements that could not be made are NaN.
+
+        :param statistics: Include measurement statistics
+        :type statistics: bool
+        :returns: dict
+        """
+        return _get_measurements(self, self.validMeasurementSlots, statistics)
+
     def saveScreenshot(self, filename, format="PNG"):
         """
         Save a screenshot of the oscilloscope to a file on the local computer.
@@ -227,7 +441,7 @@ class d_5XXX7XXX(labtronyx.DriverBase):
     author = 'KKENNEDY'
     version = '1.0'
     deviceType = 'Oscilloscope'
-    compatibleInterfaces = ['VISA']
+    compatibleInterfaces = ['VISA', 'Socket']
     compatibleInstruments = {
         'Tektronix': [# DPO5XXX Series
                     "DPO5054", "DPO5054B", "DPO5104", "DPO5104B",
@@ -259,6 +473,23 @@ class d_5XXX7XXX(labtronyx.DriverBase):
 
     validCursorTypes = ['HBARS', 'VBARS', 'SCREEN', 'WAVEFORM', 'XY']
 
+    validMeasurementSlots = [1, 2, 3, 4, 5, 6, 7, 8]
+
+    # Timeout (in seconds) for the search list query, which is not supported by all firmware versions
+    SEARCH_LIST_TIMEOUT = 1.0
+
+    def __init__(self, resource, **kwargs):
+        super(d_5XXX7XXX, self).__init__(resource, **kwargs)
+
+        self.data = {}
+        self.invalidateCache()
+
+        # Firmware support for the search list query, None until it has been tried
+        self._search_list = None
+
+        # FastFrame settings made with setFastFrameSetup
+        self._fastframe = {}
+
     def open(self):
         # Configure scope
         self.write('HEADER OFF')
@@ -268,19 +499,43 @@ class d_5XXX7XXX(labtronyx.DriverBase):
             self.write('HEADER OFF')
 
         self.data = {}
+        self.invalidateCache()
+        self._fastframe = {}
 
     def close(self):
         pass
 
+    def invalidateCache(self):
+        """
+        Discard the cached list of enabled waveforms, record length and waveform preambles. The cache is invalidated
+        by the setup methods of this driver. Changes made from the front panel or with direct commands are not
+        detected, call this method after changing the oscilloscope setup.
+        """
+        self._enabled = None
+        self._record_length = None
+        self._preambles = {}
+
+    def _queryHeaders(self, query):
+        # Query with headers enabled, so that each value in the response can be identified by its header
+        try:
+            return _parse_headers(self.query("HEADER 1;:VERBOSE 1;:%s;:HEADER 0" % query))
+
+        except:
+            # Other queries expect responses without headers
+            self.write('HEADER 0')
+            raise
+
     def defaultSetup(self):
         """
         Resets the Oscilloscope to the Default Setup
         """
+        self.invalidateCache()
+        self._fastframe = {}
         self.write("FAC")
 
     def getEnabledWaveforms(self):
         """
-        Get a list of the enabled waveforms.
+        Get a list of the enabled waveforms. The list is cached until the setup is changed.
 
         Example::
 
@@ -289,14 +544,19 @@ class d_5XXX7XXX(labtronyx.DriverBase):
 
         :returns: list
         """
-        en_ch = []
+        if self._enabled is None:
+            resp = self._queryHeaders('SELECT?')
+            en_ch = []
+
+            for ch in self.validWaveforms:
+                # Waveforms missing from the response are queried individually
+                state = resp[ch] if ch in resp else self.query('SELECT:' + ch + '?')
+                if int(state):
+                    en_ch.append(ch)
 
-        for ch in self.validWaveforms:
-            resp = self.query('SELECT:' + ch + '?')
-            if int(resp):
-                en_ch.append(ch)
+            self._enabled = en_ch
 
-        return en_ch
+        return list(self._enabled)
 
     def setAcquisitionSetup(self, **kwargs):
         """
@@ -365,6 +625,9 @@ class d_5XXX7XXX(labtronyx.DriverBase):
             Selection of some standard masks (for example, eye masks, which require option
             MTM) changes the acquisition mode to WFMDB.
         """
+        # Starting or stopping acquisition does not change the record
+        if any(key != 'State' for key in kwargs):
+            self.invalidateCache()
 
         if 'State' in kwargs:
             if kwargs['State'] == 'SINGLE':
@@ -517,6 +780,8 @@ class d_5XXX7XXX(labtronyx.DriverBase):
         :param Position: Horizontal Position - Percentage of screen
         :type Position: int between 0-100
         """
+        self.invalidateCache()
+
         if 'Mode' in kwargs:
             self.write('HOR:MODE ' + kwargs['Mode'])
         if 'SampleRate' in kwargs:
@@ -552,6 +817,8 @@ class d_5XXX7XXX(labtronyx.DriverBase):
         :param Bandwidth: Low-Pass Bandwidth Limit Filter (Megahertz) - ['FIVE', 'FULL', 'TWENTY', 'ONEFIFTY', 'TWOFIFTY']
         :type Bandwidth: str
         """
+        self.invalidateCache()
+
         if 'Waveform' in kwargs:
             if kwargs['Waveform'] not in self.validWaveforms:
                 return False
@@ -661,7 +928,7 @@ class d_5XXX7XXX(labtronyx.DriverBase):
             * 'Transition' (str) - Transition Trigger Condition - ['FASTERTHAN', 'SLOWERTHAN']
 
         """
-        if 'Search' in kwargs and int(kwargs['Search']) in range(1,8):
+        if 'Search' in kwargs and int(kwargs['Search']) in range(1, 9):
             if 'Type' in kwargs and kwargs['Type'] in self.validTriggerTypes:
                 if 'Enable' in kwargs:
                     self.write('SEARCH:SEARCH' + str(kwargs['Search']) + ':STATE ' + kwargs['Enable'])
@@ -693,84 +960,153 @@ class d_5XXX7XXX(labtronyx.DriverBase):
             self.logger.error('Must specify Search between 1-8')
             return False
 
-        # TODO: Make this not a static delay
-        time.sleep(5.0)
+        # Wait for the search to be applied to the current acquisition
+        if not self.waitUntilReady(1.0, 10.0):
+            self.logger.warning("Search setup did not complete before timeout")
 
         return True
 
     def getSearchMarks(self, **kwargs):
         """
-        Get a list of all mark locations. Manually iterates through all marks
-        on the oscilloscope and gets the location.
-
-        .. warning::
+        Get the times of all marks found by a search, relative to the trigger. Duplicate marks are removed.
 
-            Depending on the number of marks, this function can take some time
-            to complete
+        The mark table is read with a single `SEARCH:SEARCH<x>:LIST?` query. If the firmware does not support the
+        query, the search configuration is read back and transitions are located from the transferred waveform instead,
+        see :func:`findTransitions`.
 
         :param Search: Search slot number
         :type Search: int between 1-8
-        :returns: list of mark times (float)
+        :returns: numpy array of mark times, converted to a list when called remotely
         """
-        # TODO: More graceful way of doing this
-        if self.waitUntilReady(1.0, 10.0):
+        if 'Search' not in kwargs or int(kwargs['Search']) not in range(1, 9):
+            self.logger.error('Must specify Search between 1-8')
+            return numpy.array([])
 
-            if 'Search' in kwargs and int(kwargs['Search']) in range(1,8):
-                self.logger.debug('Looking for matches')
+        if not self.waitUntilReady(1.0, 10.0):
+            self.logger.error("Unable to get marks while oscilloscope is busy")
+            return numpy.array([])
 
-                matches = int(self.query('SEARCH:SEARCH' + str(int(kwargs['Search'])) + ':TOTAL?'))
-                total_marks = int(self.query("MARK:TOTAL?"))
+        search = 'SEARCH:SEARCH%i' % int(kwargs['Search'])
 
-                hor_scale = float(self.query('HOR:MODE:SCALE?'))
-                hor_pos = float(self.query('HOR:POS?'))
+        matches = int(self.query(search + ':TOTAL?'))
+        self.logger.debug("Expecting %i marks", matches)
 
-                all_marks = []
-                search_marks = []
+        if matches == 0:
+            return numpy.array([])
 
-                if matches > 0:
-                    self.logger.debug("Expecting %i marks", matches)
-                    # Convert the search marks to user marks
-                    self.write('SEARCH:SEARCH' + str(kwargs['Search']))
+        if self._search_list is not False:
+            try:
+                marks = self._getSearchList(search)
+                self._search_list = True
 
-                    # Seek Forward
-                    for dir in ['NEXT', 'PREV']:
-                        for i in range(1,total_marks+1):
-                            if  len(search_marks) < matches:
-                                mark_start = float(str(self.query('MARK:SELECTED:START?')).strip())
+                return marks
 
-                                if mark_start not in all_marks:
-                                    mark_owner = str(self.query('MARK:SELECTED:OWNER?')).strip()
-                                    seek_owner = 'SEARCH' + str(kwargs['Search'])
-                                    if mark_owner == seek_owner:
-                                        # Convert from percentage to time
-                                        mark_start = (mark_start - hor_pos) * (hor_scale / 10.0)
+            except (labtronyx.InterfaceTimeout, labtronyx.InvalidResponse, ValueError):
+                if self._search_list:
+                    raise
 
-                                        search_marks.append(mark_start)
-                                        self.logger.debug("Search Mark Found at " + str(mark_start))
+                self.logger.info("Search list query is not supported, locating marks from the waveform")
+                self._search_list = False
 
-                                all_marks.append(mark_start)
+                # Discard any partial response
+                self.clear()
 
-                                self.logger.debug("Mark Seek " + dir)
-                                self.write('MARK ' + dir)
+        return self._findSearchMarks(search)
 
-                                time.sleep(1.0)
+    def _getSearchList(self, search):
+        # Mark start positions are given as a percentage of the record, like MARK:SELECTED:START?
+        resp = self.query(search + ':LIST?', timeout=self.SEARCH_LIST_TIMEOUT)
+        hor_scale, hor_pos = ieee488.split_response(self.query('HOR:MODE:SCALE?;:HOR:POS?'))
 
-                        # Exit out of zoom mode
-                        self.write("ZOOM:MODE OFF")
+        # Marks are separated by ';', each with comma separated fields. The first numeric field is the start position
+        starts = []
+        for mark in ieee488.split_response(resp):
+            for field in mark.split(','):
+                field = field.strip().strip('"')
+                if len(field) > 0 and field[0] in '+-.0123456789':
+                    starts.append(float(field))
+                    break
 
-                        time.sleep(1.0)
-                else:
-                    self.logger.debug('No matches found')
+        if len(starts) == 0:
+            raise labtronyx.InvalidResponse("No marks in search list")
 
-                return search_marks
+        # Convert from percentage to time
+        return (numpy.unique(starts) - float(hor_pos)) * (float(hor_scale) / 10.0)
 
-            else:
-                self.logger.error('Must specify Search between 1-8')
-                return []
+    def _findSearchMarks(self, search):
+        # Locate the marks of a transition search from the transferred waveform
+        source = self.query(search + ':TRIG:A:PULSE:SOURCE?').strip()
+
+        high, low, slope, delta, when = ieee488.split_response(self.query(ieee488.join_commands([
+            search + ':TRIG:A:TRAN:THR:HIGH:%s?' % source,
+            search + ':TRIG:A:TRAN:THR:LOW:%s?' % source,
+            search + ':TRIG:A:TRAN:POL:%s?' % source,
+            search + ':TRIG:A:TRAN:DELTATIME?',
+            search + ':TRIG:A:TRAN:WHEN?'
+        ])))
+
+        return self.findTransitions(source, HighThreshold=float(high), LowThreshold=float(low), Slope=slope,
+                                    Delta=float(delta), Transition=when)
+
+    def findTransitions(self, ch, **kwargs):
+        """
+        Locate transitions between two threshold levels in a waveform. The waveform is transferred from the
+        oscilloscope and searched with vectorized numpy operations.
+
+        A transition starts at the last point beyond the starting threshold and ends at the first point beyond the
+        other threshold. The time of each transition is the time of its first point after the starting threshold.
+
+        :param ch: Waveform source - ['CH1', 'CH2', 'CH3', 'CH4', 'REF1', 'REF2', 'REF3', 'REF4', 'MATH1', 'MATH2', 'MATH3', 'MATH4']
+        :type ch: str
+        :param HighThreshold: High Threshold level
+        :type HighThreshold: float
+        :param LowThreshold: Low Threshold level
+        :type LowThreshold: float
+        :param Slope: Transition direction - ['EITHER', 'NEGATIVE', 'POSITIVE']
+        :type Slope: str
+        :param Delta: Transition time to compare with
+        :type Delta: float
+        :param Transition: Transition time condition - ['FASTERTHAN', 'SLOWERTHAN']
+        :type Transition: str
+        :returns: numpy array of transition times, converted to a list when called remotely
+        """
+        high = float(kwargs['HighThreshold'])
+        low = float(kwargs.get('LowThreshold', high))
+        slope = str(kwargs.get('Slope', 'EITHER')).upper()
+
+        samples = self.getRecordLength()
+        preamble = self._getPreamble(ch)
+        x_scale = float(preamble['XINCR'])
+        trigger_sample = int(preamble['PT_OFF'])
+
+        data = self._transferWaveform(ch, samples)
+
+        # Classify each point as below the low threshold (-1), above the high threshold (1) or between them (0)
+        level = (data > high).astype(numpy.int8) - (data < low).astype(numpy.int8)
+
+        # A transition is a change between the two outer levels, ignoring points between the thresholds
+        idx = numpy.flatnonzero(level)
+        changes = numpy.flatnonzero(level[idx[1:]] != level[idx[:-1]])
+
+        start = idx[changes]
+        end = idx[changes + 1]
+        rising = level[end] > 0
+
+        if slope.startswith('POS'):
+            keep = rising
+        elif slope.startswith('NEG'):
+            keep = ~rising
         else:
-            self.logger.error("Unable to get marks while oscilloscope is busy")
-            return []
+            keep = numpy.ones(len(start), dtype=bool)
 
+        if kwargs.get('Delta') is not None and kwargs.get('Transition') is not None:
+            duration = (end - start) * x_scale
+            if str(kwargs['Transition']).upper().startswith('FAST'):
+                keep &= duration < float(kwargs['Delta'])
+            else:
+                keep &= duration > float(kwargs['Delta'])
+
+        return numpy.unique((start[keep] + 1 - trigger_sample) * x_scale)
 
     def singleAcquisition(self):
         """
@@ -794,32 +1130,60 @@ class d_5XXX7XXX(labtronyx.DriverBase):
 
     def waitUntilReady(self, interval=1.0, timeout=10.0):
         """
-        Poll the oscilloscope until ready or until `timeout` seconds has passed
+        Wait until the oscilloscope has completed all pending operations or until `timeout` seconds has passed.
+
+        If the resource supports it, the resource waits for completion, see :func:`SCPIResourceMixin.wait_for_opc`.
+        Otherwise the oscilloscope is polled, starting with a short interval that backs off exponentially to
+        `interval`.
 
-        :param interval: Polling interval in seconds
+        :param interval: Maximum polling interval in seconds
         :type interval: float
         :param timeout: Seconds until timeout occurs
         :type timeout: float
         :returns: bool - True if instrument becomes ready, False if timeout occurs
         """
         try:
-            lapsed = 0.0
-            while lapsed < timeout:
-                if not self.statusBusy():
-                    return True
-                time.sleep(interval)
-                lapsed += interval
+            if hasattr(self.resource, 'wait_for_opc'):
+                self.wait_for_opc(timeout)
+                return True
+
+            if poll(lambda: not self.statusBusy(), timeout, maximum=interval):
+                return True
 
             self.logger.debug('Instrument was not ready before timeout occurred')
             return False
+
+        except labtronyx.InterfaceTimeout:
+            self.logger.debug('Instrument was not ready before timeout occurred')
+            return False
+
         except:
             self.logger.exception("An error occurred in waitUntilReady()")
 
-    def getWaveform(self):
+    def getRecordLength(self):
         """
-        Refreshes the raw waveform data from the oscilloscope.
+        Get the number of points in the waveform record. The record length is cached until the setup is changed.
 
-        :returns: bool - True if successful, False otherwise
+        :rtype: int
+        """
+        if self._record_length is None:
+            hor_scale, sample_rate = ieee488.split_response(self.query("HOR:MODE:SCALE?;:HOR:MODE:SAMPLERATE?"))
+
+            self._record_length = int(float(sample_rate) * float(hor_scale) * 10)
+
+        return self._record_length
+
+    def getWaveform(self, dtype='float64', chunk_size=1000000):
+        """
+        Refreshes the raw waveform data from the oscilloscope. Samples are stored as numpy arrays, the time axis is
+        always stored with double precision. Each channel is transferred in windows of `chunk_size` points, see
+        :func:`iterWaveform`.
+
+        :param dtype: Data type of the scaled samples, 'float32' halves the memory used by each channel
+        :type dtype: str
+        :param chunk_size: Number of points transferred at a time
+        :type chunk_size: int
+        :returns: dict of numpy arrays, converted to lists when called remotely
         """
         if not self.waitUntilReady(1.0, 10.0):
             self.logger.error("Unable to export waveform while oscilloscope is busy")
@@ -831,61 +1195,242 @@ class d_5XXX7XXX(labtronyx.DriverBase):
         # Get the list of enabled waveforms before we begin
         enabledWaveforms = self.getEnabledWaveforms()
 
+        if len(enabledWaveforms) == 0:
+            self.logger.error("No waveforms are enabled")
+            return self.data
+
         # Get time and trigger data
-        x_scale = float(self.query("WFMOUTPRE:XINCR?"))
-        hor_scale = float(self.query("HOR:MODE:SCALE?"))
-        sample_rate = float(self.query("HOR:MODE:SAMPLERATE?"))
-        samples = int(sample_rate * hor_scale * 10)
-        trigger_sample = int(self.query("WFMOUTPRE:PT_OFF?"))
+        preamble = self._getPreamble(enabledWaveforms[0])
+        x_scale = float(preamble['XINCR'])
+        samples = self.getRecordLength()
+        trigger_sample = int(preamble['PT_OFF'])
 
         self.data['Time'] = numpy.arange(-1 * trigger_sample, samples - trigger_sample) * x_scale
 
         self.logger.debug("Time Scale: %f", x_scale)
         self.logger.debug("Trigger position: %i", trigger_sample)
-        self.logger.debug("Sample Rate: %f", sample_rate)
-        self.logger.debug("Horizontal Scale: %f", hor_scale)
         self.logger.info("Expecting %i samples", samples)
 
         for ch in enabledWaveforms:
-            self.write("DATA:SOURCE %s" % ch)
-            self.write("DATA:ENC SRP")
-            self.write("DATA:START 1")
-            self.write("DATA:STOP %i" % samples)
+            self.logger.info("Processing Data for %s....", ch)
 
-            # Get scale factors for each channel
-            y_scale = float(self.query("WFMOUTPRE:YMULT?"))
-            y_zero = float(self.query("WFMOUTPRE:YZERO?"))
-            y_offset = float(self.query("WFMOUTPRE:YOFF?"))
+            self.data[ch] = self._transferWaveform(ch, samples, chunk_size, dtype)
 
-            # Get the number of bytes per data point
-            data_width = int(self.query("WFMOUTPRE:BYT_NR?"))
+        return self.data
 
-            # Collect and process data
-            self.logger.info("Processing Data for %s....", ch)
-            self.write("CURVE?")
-            data_raw = self.read_raw()
+    def _transferWaveform(self, ch, samples, chunk_size=1000000, dtype='float64'):
+        # Transfer a waveform into a single preallocated array
+        data = numpy.empty(samples, dtype=dtype)
+        received = 0
 
-            headerlen = 2 + int(data_raw[1])
-            header = data_raw[:headerlen]
-            data = data_raw[headerlen:-1]
-            elems = len(data) / data_width
+        for offset, chunk in self.iterWaveform(ch, samples, chunk_size, dtype):
+            data[offset:offset + len(chunk)] = chunk
+            received = offset + len(chunk)
 
-            if data_width == 2:
-                data = struct.unpack('%sH' % elems, data)
-            elif data_width == 1:
-                data = struct.unpack('%sB' % elems, data)
-            else:
-                self.logger.error('Unhandled data width in getWaveform')
+        return data[:received]
+
+    @local_only
+    def iterWaveform(self, ch, samples=None, chunk_size=1000000, dtype='float64', offset=0, retries=2):
+        """
+        Transfer the waveform of a channel in windows of `chunk_size` points, using successive `DATA:START` and
+        `DATA:STOP` ranges. Each window is scaled and yielded as soon as it is received, so processing can overlap with
+        the transfer and only one window needs to be held in memory.
 
-            # Utilize numpy if possible, its more efficient
-            data = numpy.array(data)
+        If a window times out, the device is cleared and the window is requested again, up to `retries` times. If the
+        generator raises, the transfer can be resumed by calling it again with `offset` set to the offset of the last
+        chunk received plus its length.
 
-            data_scaled = (data - y_offset) * y_scale + y_zero
+        Example::
 
-            self.data[ch] = data_scaled.tolist()
+            for offset, chunk in scope.iterWaveform('CH1', chunk_size=500000):
+                f.write(chunk.tobytes())
 
-        return self.data
+        Returns a generator, so this method is only usable locally.
+
+        :param ch: Waveform source - ['CH1', 'CH2', 'CH3', 'CH4', 'REF1', 'REF2', 'REF3', 'REF4', 'MATH1', 'MATH2', 'MATH3', 'MATH4']
+        :type ch: str
+        :param samples: Number of points in the record. Defaults to the record length
+        :type samples: int
+        :param chunk_size: Number of points transferred at a time
+        :type chunk_size: int
+        :param dtype: Data type of the scaled samples, or None for the raw data points
+        :type dtype: str
+        :param offset: Index of the first point to transfer
+        :type offset: int
+        :param retries: Number of times a window is requested again after a timeout
+        :type retries: int
+        :returns: generator of (offset, numpy.ndarray) tuples
+        """
+        if samples is None:
+            samples = self.getRecordLength()
+
+        channel = self._getChannelPreamble(ch)
+
+        while offset < samples:
+            stop = min(offset + chunk_size, samples)
+
+            data = self._readWindow(channel, offset, stop, retries)
+
+            yield offset, data if dtype is None else channel.scaled(data, dtype)
+
+            if len(data) < stop - offset:
+                # Record is shorter than expected
+                break
+
+            offset = stop
+
+    def _getPreamble(self, ch):
+        # Get the preamble of a waveform with a single query, cached until the setup changes
+        if ch not in self._preambles:
+            with self.coalesce():
+                self.write("DATA:SOURCE %s" % ch)
+                self.write("DATA:ENC RIB")
+                self.write("DATA:START 1")
+
+            self._preambles[ch] = self._queryHeaders("WFMOUTPRE?")
+
+        return self._preambles[ch]
+
+    def _getChannelPreamble(self, ch):
+        # Get the metadata needed to scale the data points of a waveform
+        preamble = self._getPreamble(ch)
+
+        # RIBinary data points are signed, most significant byte first
+        return WaveformChannel(ch,
+                               scale=float(preamble['YMULT']),
+                               offset=float(preamble['YOFF']),
+                               zero=float(preamble['YZERO']),
+                               units=preamble['YUNIT'].strip('"'),
+                               dtype='>i%d' % int(preamble['BYT_NR']))
+
+    def _readWindow(self, channel, start, stop, retries=2):
+        # Transfer the raw data points of a window, retrying after a timeout
+        for attempt in range(retries + 1):
+            try:
+                with self.coalesce():
+                    self.write("DATA:SOURCE %s" % channel.name)
+                    self.write("DATA:ENC RIB")
+
+                    # Data points are numbered from 1
+                    self.write("DATA:START %i" % (start + 1))
+                    self.write("DATA:STOP %i" % stop)
+
+                self.write("CURVE?")
+                return self.read_block(channel.dtype.str)
+
+            except labtronyx.InterfaceTimeout:
+                if attempt == retries:
+                    raise
+
+                self.logger.warning("Timeout transferring points %i to %i of %s, retrying", start + 1, stop,
+                                    channel.name)
+
+                # Discard the rest of the partial block
+                self.clear()
+
+    def setFastFrameSetup(self, **kwargs):
+        """
+        Set FastFrame (segmented acquisition) configuration. In FastFrame mode, each trigger acquires a frame and frames
+        are stored back to back until the frame count is reached.
+
+        :param State: FastFrame State - ['ON', 'OFF']
+        :type State: str
+        :param Count: Number of frames to acquire
+        :type Count: int
+        """
+        # The record only changes if the FastFrame settings are different from the last settings
+        if any(self._fastframe.get(key) != value for key, value in kwargs.items()):
+            self.invalidateCache()
+            self._fastframe.update(kwargs)
+
+        with self.coalesce():
+            if 'Count' in kwargs:
+                self.write('HOR:FASTFRAME:COUNT ' + str(int(kwargs['Count'])))
+            if 'State' in kwargs:
+                self.write('HOR:FASTFRAME:STATE ' + str(kwargs['State']))
+
+    def acquireFastFrame(self, frames, timeout=60.0, dtype='float64'):
+        """
+        Capture `frames` triggers with a single FastFrame acquisition. FastFrame is enabled, the oscilloscope is armed
+        once and all frames are transferred when the acquisition completes. See :func:`getFastFrame`.
+
+        FastFrame is left enabled, use :func:`setFastFrameSetup` to disable it.
+
+        :param frames: Number of frames to acquire
+        :type frames: int
+        :param timeout: Seconds to wait for all frames to be acquired
+        :type timeout: float
+        :param dtype: Data type of the scaled samples
+        :type dtype: str
+        :returns: dict, False if the acquisition did not complete before the timeout
+        """
+        self.setFastFrameSetup(State='ON', Count=frames)
+
+        with self.coalesce():
+            self.write("ACQ:STOPAFTER SEQUENCE")
+            self.write("ACQ:STATE 1")
+
+        if not self.waitUntilReady(1.0, timeout):
+            self.logger.error("FastFrame acquisition did not complete before timeout")
+            return False
+
+        return self.getFastFrame(dtype)
 
+    def getFastFrame(self, dtype='float64'):
+        """
+        Transfer the frames of the last FastFrame acquisition. All frames of a waveform are transferred in a single
+        block and returned as a 2-D array with a row for each frame.
+
+        Returned data has the following keys:
+
+            * 'Time' - Time axis of a frame
+            * 'Timestamps' - Trigger time of each frame in seconds, relative to the first frame
+            * One 2-D array (frames x samples) for each enabled waveform
+
+        :param dtype: Data type of the scaled samples
+        :type dtype: str
+        :returns: dict of numpy arrays, converted to lists when called remotely
+        """
+        enabledWaveforms = self.getEnabledWaveforms()
+
+        if len(enabledWaveforms) == 0:
+            self.logger.error("No waveforms are enabled")
+            return {}
+
+        frames = int(self.query("HOR:FASTFRAME:COUNT?"))
+        samples = self.getRecordLength()
+
+        preamble = self._getPreamble(enabledWaveforms[0])
+        x_scale = float(preamble['XINCR'])
+        trigger_sample = int(preamble['PT_OFF'])
+
+        ret = {
+            'Time': numpy.arange(-1 * trigger_sample, samples - trigger_sample) * x_scale,
+            'Timestamps': _parse_timestamps(
+                self.query("HOR:FASTFRAME:TIMESTAMP:ALL:%s? 1,%i" % (enabledWaveforms[0], frames)))
+        }
+
+        self.logger.info("Expecting %i frames of %i samples", frames, samples)
+
+        for ch in enabledWaveforms:
+            channel = self._getChannelPreamble(ch)
+
+            with self.coalesce():
+                self.write("DATA:SOURCE %s" % ch)
+                self.write("DATA:ENC RIB")
+                self.write("DATA:START 1")
+                self.write("DATA:STOP %i" % samples)
+                self.write("DATA:FRAMESTART 1")
+                self.write("DATA:FRAMESTOP %i" % frames)
+
+            self.write("CURVE?")
+            data = self.read_block(channel.dtype.str)
+
+            # Frames are sent back to back, discard an incomplete last frame
+            received = len(data) // samples if samples > 0 else 0
+            ret[ch] = channel.scaled(data[:received * samples], dtype).reshape(received, samples)
+
+        return ret
 
     def getPackedWaveform(self, ch):
         """
@@ -896,11 +1441,8 @@ class d_5XXX7XXX(labtronyx.DriverBase):
         :returns: binary data
         """
         if ch in self.validWaveforms and ch in self.data.keys():
-            d_list = self.data.get(ch)
-            points = len(d_list)
-
-            # Pack the data
-            packed = str(struct.pack('%sf' % points, *d_list))
+            # Pack the data as native single precision floats
+            packed = numpy.asarray(self.data.get(ch), dtype=numpy.float32).tobytes()
 
             # Base64 Encode the data
             enc = base64.b64encode(packed)
@@ -915,52 +1457,114 @@ class d_5XXX7XXX(labtronyx.DriverBase):
 
     def exportWaveform(self, **kwargs):
         """
-        Export the oscilloscope waveform to a .csv file.
+        Export the enabled waveforms to a file. Waveforms are streamed from the oscilloscope to the file in windows,
+        so the record is never held in memory. See :mod:`labtronyx.common.waveform` for the supported formats.
 
         :param Filename: Filename of output file
         :type Filename: str
+        :param Format: File format - ['csv', 'npy', 'npz', 'bin']. Defaults to the filename extension, or 'csv'
+        :type Format: str
+        :param ChunkSize: Number of points transferred at a time
+        :type ChunkSize: int
+        :param DataType: Data type of scaled values in csv, npy and npz files
+        :type DataType: str
         :returns: bool - True if successful, False otherwise
         """
+        if 'Filename' not in kwargs:
+            return True
 
-        # Refresh waveform data
-        if self.data == {}:
-            self.getWaveform()
+        filename = kwargs['Filename']
+        chunk_size = int(kwargs.get('ChunkSize', 1000000))
 
-        # Write data in columns in the CSV file
-        if 'Filename' in kwargs:
-            filename = kwargs['Filename']
-            # Verify file extension
-            if filename[-3:] != "csv":
-                filename = filename + '.csv'
-            try:
-                # Open Data file
-                f_telem = open(filename, 'wb')
-                csvfile = csv.writer(f_telem)
-                self.logger.debug("Opened file: %s", filename)
-
-                intersect = set(self.validWaveforms).intersection(set(self.data.keys()))
-
-                # Add an extra column for a time index
-                header = ['Time'] + list(intersect)
-                # Write header
-                csvfile.writerow(header)
-
-                # Write each row
-                time = self.data['Time']
-                for index in range(0, len(time)):
-                    row = [time[index]]
-                    for ch in intersect:
-                        row.append(self.data[ch][index])
-                    csvfile.writerow(row)
-                f_telem.close()
-
-            except:
-                self.logger.exception("Unable to export data to %s" % filename)
+        if not self.waitUntilReady(1.0, 10.0):
+            self.logger.error("Unable to export waveform while oscilloscope is busy")
+            return False
 
+        try:
+            channels = [self._getChannelPreamble(ch) for ch in self.getEnabledWaveforms()]
+
+            if len(channels) == 0:
+                self.logger.error("No waveforms are enabled")
                 return False
 
+            samples = self.getRecordLength()
+            preamble = self._getPreamble(channels[0].name)
+            x_scale = float(preamble['XINCR'])
+            trigger_sample = int(preamble['PT_OFF'])
+
+            with open_writer(filename, channels, samples, -1 * trigger_sample * x_scale, x_scale,
+                             fmt=kwargs.get('Format'), dtype=kwargs.get('DataType', 'float64')) as writer:
+                self.logger.debug("Opened file: %s", writer.filename)
+
+                # Transfer the same window of each channel, so that row oriented formats can be streamed
+                offset = 0
+                while offset < samples:
+                    stop = min(offset + chunk_size, samples)
+
+                    data = [self._readWindow(ch, offset, stop) for ch in channels]
+                    writer.write(offset, data)
+
+                    if min([len(col) for col in data] or [0]) < stop - offset:
+                        # Record is shorter than expected
+                        break
+
+                    offset = stop
+
+        except:
+            self.logger.exception("Unable to export data to %s" % filename)
+
+            return False
+
         return True
 
+    def setMeasurementSetup(self, **kwargs):
+        """
+        Configure a measurement slot. The oscilloscope updates the measurement on every acquisition, use
+        :func:`getMeasurements` to read all measurements at once instead of transferring the waveform.
+
+        :param Slot: Measurement slot - [1-8]
+        :type Slot: int
+        :param Type: Measurement type (e.g. 'RMS', 'FREQUENCY', 'RISE', 'PK2PK')
+        :type Type: str
+        :param Source: Waveform to measure
+        :type Source: str
+        :param Source2: Second waveform for measurements between two waveforms (e.g. 'DELAY', 'PHASE')
+        :type Source2: str
+        :param State: Measurement State - ['ON', 'OFF']
+        :type State: str
+        :param Statistics: Statistics mode, applies to all measurements - ['OFF', 'ALL']
+        :type Statistics: str
+        :returns: bool - True if successful, False otherwise
+        """
+        return _set_measurement(self, self.validMeasurementSlots, kwargs)
+
+    def getMeasurements(self, statistics=True):
+        """
+        Read all enabled measurements with a single query.
+
+        Example::
+
+            >> scope.setMeasurementSetup(Slot=1, Type='RMS', Source='CH1', State='ON')
+            >> scope.getMeasurements()
+            {'MEAS1': {'Type': 'RMS', 'Source': 'CH1', 'Units': 'V', 'Value': 0.707, 'Mean': 0.706, ...}}
+
+        Returned data has a key for each enabled measurement slot (e.g. 'MEAS1'), each with the following keys:
+
+            * 'Type' - Measurement Type
+            * 'Source' - Measured Waveform
+            * 'Units' - Measurement Units
+            * 'Value' - Value from the last acquisition
+            * 'Mean', 'Minimum', 'Maximum', 'StdDev' - Statistics, if `statistics` is True
+            * 'Count' - Number of acquisitions included in the statistics, if `statistics` is True
+
+        Measurements that could not be made are NaN.
+
+        :param statistics: Include measurement statistics
+        :type statistics: bool
+        :returns: dict
+        """
+        return _get_measurements(self, self.validMeasurementSlots, statistics)
+
     def saveScreenshot(self, **kwargs):
         """
         Save a screenshot of the oscilloscope display onto the oscilloscope.
@@ -971,6 +1575,8 @@ class d_5XXX7XXX(labtronyx.DriverBase):
         :type Format: str
         :param Palette: Color Palette - ['COLOR', 'INKSAVER', 'BLACKANDWHITE']
         :type Palette: str
+        :param Timeout: Seconds to wait for the export to complete. Default 10
+        :type Timeout: float
         :returns: bool - True if successful, False otherwise
         """
 
@@ -983,10 +1589,8 @@ class d_5XXX7XXX(labtronyx.DriverBase):
             if 'Palette' in kwargs:
                 self.write("EXPORT:PALETTE " + kwargs['Palette'])
 
-            self.write("EXPORT START")
-
-            # TODO: Make this not a static delay
-            time.sleep(2.0)
+            # Wait for the export to complete instead of a fixed delay
+            self.query("EXPORT START;*OPC?", timeout=kwargs.get('Timeout', 10.0))
 
             remote_filename = self.query("EXPORT:FILENAME?")
             self.logger.debug('Saved remote screenshot at %s', remote_filename)
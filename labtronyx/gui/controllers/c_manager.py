@@ -49,7 +49,8 @@ class ManagerController(BaseController):
                 self.refresh()
 
             elif event.event in [labtronyx.EventCodes.interface.created,
-                                 labtronyx.EventCodes.interface.destroyed]:
+                                 labtronyx.EventCodes.interface.destroyed,
+                                 labtronyx.EventCodes.interface.changed]:
                 self.refresh()
 
             elif event.event in [labtronyx.EventCodes.script.created,
@@ -19,7 +19,8 @@ class ResourceController(PluginController):
         if len(event.args) > 0 and event.args[0] == self._uuid:
             if event.event in [labtronyx.EventCodes.resource.driver_loaded,
                                labtronyx.EventCodes.resource.driver_unloaded,
-                               labtronyx.EventCodes.resource.changed]:
+                               labtronyx.EventCodes.resource.changed,
+                               labtronyx.EventCodes.resource.health_changed]:
                 self.update_properties()
 
             self.notifyViews(event)
@@ -345,7 +345,8 @@ class MainView(FrameViewBase):
             self.updateTree()
 
         elif event.event in [labtronyx.EventCodes.interface.created,
-                             labtronyx.EventCodes.interface.destroyed]:
+                             labtronyx.EventCodes.interface.destroyed,
+                             labtronyx.EventCodes.interface.changed]:
             self.updateTree()
 
         elif event.event in [labtronyx.EventCodes.resource.changed,
@@ -25,6 +25,7 @@ class ResourceInfoPanel(PanelViewBase):
         self._createField("Resource Type", "resourceType")
         self._createField("Device Type", "deviceType")
         self._createField("Driver", "driver")
+        self._createField("Health", "health")
 
         self.rightSizer = wx.BoxSizer(wx.VERTICAL)
         self.lst_methods = wx.ListBox(self, -1, style=wx.LB_SINGLE)
@@ -51,7 +52,8 @@ class ResourceInfoPanel(PanelViewBase):
     def _handleEvent(self, event):
         if event.event in [labtronyx.EventCodes.resource.driver_loaded,
                            labtronyx.EventCodes.resource.driver_unloaded,
-                           labtronyx.EventCodes.resource.changed]:
+                           labtronyx.EventCodes.resource.changed,
+                           labtronyx.EventCodes.resource.health_changed]:
             self.updateFields()
 
     def _createField(self, label, prop_key):
@@ -0,0 +1,457 @@
+"""
+The Replay interface creates resources that replay transcripts recorded from real instruments, so that drivers and
+scripts can be run and benchmarked deterministically without hardware.
+
+Recording a transcript::
+
+    instr.startRecording()
+    instr.open()
+    data = instr.getWaveform()
+    instr.close()
+    instr.stopRecording('scope.json')
+
+Replaying the transcript::
+
+    instr = manager.getResource('Replay', 'scope.json')
+    instr.configure(latency_scale=0.0)
+    instr.open()
+    data = instr.getWaveform()
+
+Each transfer made by the replay resource must match the next transfer in the transcript, otherwise an
+`InterfaceError` is raised. Responses are returned after the recorded latency of the transfer, multiplied by the
+`latency_scale` configuration parameter. Transfers that failed when they were recorded raise the same exception.
+"""
+import labtronyx
+from labtronyx.common import ieee488
+from labtronyx.common.trace import load_transcript
+from labtronyx.bases.scpi import SCPIResourceMixin
+
+import time
+
+
+class i_Replay(labtronyx.InterfaceBase):
+    """
+    Replay Interface
+
+    Resources are identified by the filename of a transcript.
+    """
+    version = '1.0'
+    interfaceName = 'Replay'
+    enumerable = False
+
+    @property
+    def resources(self):
+        return self.manager.plugin_manager.getPluginInstancesByBaseClass(r_Replay)
+
+    def getResource(self, resID):
+        """
+        Create a resource that replays a transcript.
+
+        :param resID:   Transcript filename
+        :type resID:    str
+        :return:        object
+        :raises:        ResourceUnavailable
+        :raises:        InterfaceError
+        """
+        if resID in self.resources_by_id:
+            raise labtronyx.InterfaceError("Resource instance already exists")
+
+        try:
+            transcript = load_transcript(resID)
+
+        except (IOError, ValueError, KeyError) as e:
+            raise labtronyx.ResourceUnavailable('Unable to load transcript %s: %s' % (resID, e))
+
+        res_obj = self.manager.plugin_manager.createPluginInstance(r_Replay.fqn, manager=self.manager,
+                                                                   resID=resID,
+                                                                   transcript=transcript,
+                                                                   logger=self.logger
+                                                                   )
+
+        self._addResource(res_obj)
+
+        return res_obj
+
+
+class r_Replay(SCPIResourceMixin, labtronyx.ResourceBase):
+    """
+    Replay Resource
+
+    Resource API is compatible with VISA resources, so the driver that was loaded when the transcript was recorded can
+    be used with the replay resource. Writes are coalesced as configured on the recorded resource.
+
+    :param transcript:  Transcript loaded with :func:`labtronyx.common.trace.load_transcript`
+    :type transcript:   dict
+    """
+    interfaceName = 'Replay'
+
+    def __init__(self, manager, resID, transcript, **kwargs):
+        super(r_Replay, self).__init__(manager, resID, **kwargs)
+
+        self._initSCPI()
+
+        self._properties = transcript['properties']
+        self._transfers = transcript['transfers']
+        self._position = 0
+        self._open = False
+
+        self._latency_scale = 1.0
+
+        # Coalesce writes the same way as the recorded resource
+        configuration = transcript.get('configuration', {})
+
+        self._coalesce_auto = bool(configuration.get('coalesce_writes', False))
+        self._coalesce_limit = int(configuration.get('coalesce_limit', self.COALESCE_LIMIT))
+
+        # The instrument was identified when the transcript was recorded
+        self._identity = [self._properties.get(key, '') for key in
+                          ['deviceVendor', 'deviceModel', 'deviceSerial', 'deviceFirmware']]
+        self.ready = True
+
+        self.logger.debug("Created Replay resource: %s", resID)
+
+    def getProperties(self):
+        """
+        Get the property dictionary for the Replay resource. Device properties are taken from the transcript.
+
+        :rtype: dict[str:object]
+        """
+        def_prop = labtronyx.ResourceBase.getProperties(self)
+        def_prop.update({
+            'resourceType': 'Replay',
+            'recordedResourceID': self._properties.get('resourceID', '')
+        })
+
+        return self._setIdentityProperties(def_prop)
+
+    #===========================================================================
+    # Resource State
+    #===========================================================================
+
+    def open(self):
+        """
+        Open the resource. If a driver is loaded, the driver will also be opened
+
+        :returns:       True if successful, False otherwise
+        """
+        self._open = True
+
+        return labtronyx.ResourceBase.open(self)
+
+    def isOpen(self):
+        """
+        Check if the resource is open
+
+        :return: bool
+        """
+        return self._open
+
+    def close(self):
+        """
+        Close the resource. If a driver is loaded, that driver is also closed
+
+        :returns: True if successful, False otherwise
+        """
+        if self.isOpen():
+            labtronyx.ResourceBase.close(self)
+
+            self._coalesce_buffer = []
+            self._open = False
+
+        return True
+
+    def rewind(self):
+        """
+        Restart the replay from the beginning of the transcript
+        """
+        with self._io_lock:
+            self._position = 0
+            self._coalesce_buffer = []
+
+    def clear(self):
+        """
+        Discard pending commands waiting to be coalesced. Device clears are not recorded, so nothing is replayed.
+        """
+        with self._io_lock:
+            self._coalesce_buffer = []
+
+    def _probe(self):
+        # Probes are not recorded, the next transfer is used as the trial
+        pass
+
+    def _getTimeout(self):
+        # Waits are replayed, there is no timeout
+        return None
+
+    def _waitSRQ(self, timeout):
+        # Status byte polls recorded from resources that poll with `*STB?` are replayed. Status byte reads of VISA
+        # sessions are not recorded, so the request is assumed to have occurred
+        while self._nextTransfer() == ('query', '*STB?'):
+            stb = int(self._replay('query', '*STB?'))
+            if stb & self.STB_RQS:
+                return stb
+
+        return self.STB_RQS
+
+    def wait_for_opc(self, timeout=None):
+        """
+        Replay a wait until all pending operations are complete. Transcripts recorded from resources that wait with
+        `*OPC?` and from resources that wait for a service request can both be replayed, see
+        :func:`SCPIResourceMixin.wait_for_opc`.
+
+        :param timeout:     Ignored
+        :type timeout:      float
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            if self._nextTransfer() == ('query', '*OPC?'):
+                self.query('*OPC?')
+
+            else:
+                self._waitOPCServiceRequest(timeout)
+
+    #===========================================================================
+    # Configuration
+    #===========================================================================
+
+    def configure(self, **kwargs):
+        """
+        Configure the replay. Configuration parameters of the recorded resource are accepted and ignored, so drivers
+        can configure the resource as usual.
+
+        :param latency_scale:   Multiplier for the recorded latency of each transfer. Use 0 to replay as fast as
+                                possible
+        :type latency_scale:    float
+        :param coalesce_writes: Coalesce all writes. Defaults to the configuration of the recorded resource
+        :type coalesce_writes:  bool
+        :param coalesce_limit:  Maximum size (in bytes) of a coalesced transfer. Defaults to the configuration of the
+                                recorded resource
+        :type coalesce_limit:   int
+        """
+        if 'latency_scale' in kwargs:
+            self._latency_scale = float(kwargs.pop('latency_scale'))
+
+        self._configureCoalescing(kwargs)
+
+    def getConfiguration(self):
+        """
+        Get the resource configuration
+
+        :return:                dict
+        """
+        ret = self._getCoalescingConfiguration()
+        ret.update({
+            'latency_scale': self._latency_scale,
+            'position': self._position,
+            'transfers': len(self._transfers)
+        })
+
+        return ret
+
+    #===========================================================================
+    # Data Transmission
+    #===========================================================================
+
+    def _nextTransfer(self):
+        # Direction and data of the next transfer in the transcript
+        if self._position < len(self._transfers):
+            entry = self._transfers[self._position]
+            return entry['direction'], entry['data']
+
+    def _replay(self, direction, data=None):
+        # Match the next transfer in the transcript and return the recorded response
+        if not self.isOpen():
+            raise labtronyx.ResourceNotOpen()
+
+        with self._traceTransfer(direction, data) as trace:
+            if self._position >= len(self._transfers):
+                raise labtronyx.InterfaceError("End of transcript reached")
+
+            entry = self._transfers[self._position]
+
+            if entry['direction'] != direction or (data is not None and entry['data'] != data):
+                raise labtronyx.InterfaceError("Transfer %d does not match transcript, expected %s %r, got %s %r" %
+                                               (self._position, entry['direction'], entry['data'], direction, data))
+
+            self._position += 1
+
+            latency = (entry['end'] - entry['start']) * self._latency_scale
+            if latency > 0:
+                time.sleep(latency)
+
+            if entry['outcome'] != 'ok':
+                exc_class = getattr(labtronyx, entry['outcome'], labtronyx.InterfaceError)
+                raise exc_class("Replayed failure from transcript")
+
+            trace.received(entry['response'])
+
+            return entry['response']
+
+    def _write(self, data):
+        self._replay('write', data)
+
+    def write_raw(self, data):
+        """
+        Send Binary-encoded data to the instrument without modification
+
+        :param data:        Data to send
+        :type data:         str
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+            self._replay('write', data)
+
+    def write_block(self, command, data, dtype='B'):
+        """
+        Send a command with binary data as an IEEE 488.2 definite length arbitrary block. See
+        :func:`r_VISA.write_block`. The write termination of the recorded resource is taken from the transcript.
+
+        :param command:     Command header
+        :type command:      str
+        :param data:        Data to send
+        :type data:         numpy.ndarray or list
+        :param dtype:       numpy data type of the block payload, including byte order (e.g. '>f8')
+        :type dtype:        str
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceError
+        """
+        message = '%s %s' % (command, ieee488.encode_block(data, dtype))
+
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+
+            transfer = self._nextTransfer()
+            if transfer is not None and transfer[0] == 'write' and transfer[1].startswith(message):
+                if transfer[1][len(message):].strip('\r\n') == '':
+                    message = transfer[1]
+
+            self._replay('write', message)
+
+    def read(self, termination=None, encoding=None, timeout=None):
+        """
+        Read ASCII-formatted data from the instrument.
+
+        :param termination: Ignored
+        :type termination:  str
+        :param encoding:    Ignored
+        :type encoding:     str
+        :param timeout:     Ignored
+        :type timeout:      float
+        :return:            str
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+            return self._replay('read')
+
+    def read_raw(self, size=None, timeout=None):
+        """
+        Read Binary-encoded data from the instrument.
+
+        :param size:        Ignored, the recorded response is returned
+        :type size:         int
+        :param timeout:     Ignored
+        :type timeout:      float
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+            return self._replay('read')
+
+    def read_block(self, dtype='B', into=None, timeout=None):
+        """
+        Read an IEEE 488.2 definite length arbitrary block from the instrument. See :func:`r_VISA.read_block`.
+
+        Returns a numpy array, so this method is only usable locally.
+
+        :param dtype:       numpy data type of the block payload, including byte order (e.g. '>i2')
+        :type dtype:        str
+        :param into:        Preallocated buffer to read the payload into
+        :type into:         bytearray, memoryview or numpy.ndarray
+        :param timeout:     Ignored
+        :type timeout:      float
+        :rtype:             numpy.ndarray
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+            payload = self._replay('read')
+
+            # Rebuild the block so that the payload is decoded exactly as it is from an instrument
+            length = str(len(payload))
+            block = [('#%d%s' % (len(length), length)) + payload]
+
+            def read_chunk(size):
+                chunk, block[0] = block[0][:size], block[0][size:]
+                return chunk
+
+            return ieee488.read_block(read_chunk, dtype, into)
+
+    def query(self, data, delay=None, timeout=None):
+        """
+        Retrieve ASCII-encoded data from the device given a prompt. Transcripts recorded from resources that implement
+        queries as a write followed by a read can also be replayed.
+
+        :param data:        Data to send
+        :type data:         str
+        :param delay:       Ignored, the recorded latency is used
+        :type delay:        float
+        :param timeout:     Ignored
+        :type timeout:      float
+        :returns:           str
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            data = self._joinPending(data)
+
+            if self._position < len(self._transfers) and self._transfers[self._position]['direction'] == 'write':
+                self._replay('write', data)
+                return self._replay('read')
+
+            return self._replay('query', data)
+
+    #===========================================================================
+    # Drivers
+    #===========================================================================
+
+    def loadDriver(self, driverName=None, force=False):
+        """
+        Load a Driver. If `driverName` is not specified, the driver that was loaded when the transcript was recorded
+        is loaded.
+
+        :param driverName:      Driver name to load
+        :type driverName:       str
+        :param force:           Force load driver by unloading existing driver
+        :returns:               True if successful, False otherwise
+        """
+        if driverName is None:
+            driverName = self._properties.get('driver')
+
+            if driverName is None:
+                return False
+
+        return labtronyx.ResourceBase.loadDriver(self, driverName, force)
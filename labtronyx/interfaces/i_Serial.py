@@ -2,10 +2,20 @@
 The Serial interface is a wrapper for the pyserial library.
 """
 import labtronyx
+from labtronyx.common import plugin
+from labtronyx.common import ieee488
+from labtronyx.common.buffer import ReceiveBuffer
+from labtronyx.common.futures import Future
+from labtronyx.common.rpc import local_only
 
 import time
 import os
 import errno
+import select
+import threading
+import collections
+import itertools
+import heapq
 
 import serial
 import serial.tools.list_ports
@@ -23,58 +33,79 @@ class i_Serial(labtronyx.InterfaceBase):
     interfaceName = 'Serial'
     enumerable = True
 
-    def enumerate(self):
-        """
-        Scans system for new resources and creates resource objects for them.
+    def __init__(self, manager, **kwargs):
+        super(i_Serial, self).__init__(manager, **kwargs)
+
+        # Instance variables
+        self._engine = None
+
+    def close(self):
         """
-        self.logger.debug("Enumerating Serial interface")
+        Stop the I/O engine and destroy all resource objects owned by the interface.
 
-        res_list = list(serial.tools.list_ports.comports())
+        :returns: True if successful, False otherwise
+        """
+        if self._engine is not None:
+            self._engine.stop()
+            self._engine = None
 
-        # Check for new resources
-        for resID, _, _ in res_list:
-            if resID not in self.resources_by_id:
-                try:
-                    self.getResource(resID)
+        return super(i_Serial, self).close()
 
-                except labtronyx.ResourceUnavailable:
-                    pass
-            
-    def prune(self):
+    @property
+    def engine(self):
         """
-        Remove any resources that are no longer found on the system
+        I/O engine used to process asynchronous requests for all serial resources. Started on first use. Serial ports
+        cannot be multiplexed on Windows, so None is returned on that platform.
+
+        :rtype: SerialEngine
         """
-        res_list = [resID for resID, _, _ in serial.tools.list_ports.comports()]
+        if self._engine is None and os.name != 'nt':
+            self._engine = SerialEngine(logger=self.logger)
+            self._engine.start()
 
-        for res_uuid, res_obj in self.resources.items():
-            resID = res_obj.resID
+        return self._engine
 
-            if resID not in res_list:
-                res_obj.close()
+    def list_devices(self):
+        """
+        Get the names of all serial ports on the system
 
-                self.manager.plugin_manager.destroyPluginInstance(res_uuid)
-                self.manager._publishEvent(labtronyx.EventCodes.resource.destroyed, res_obj.uuid)
+        :rtype:         list[str]
+        """
+        return [resID for resID, _, _ in serial.tools.list_ports.comports()]
 
     @property
     def resources(self):
         return self.manager.plugin_manager.getPluginInstancesByBaseClass(r_Serial)
 
-    @property
-    def resources_by_id(self):
-        return {res_obj.resID: res_obj for res_uuid, res_obj in self.resources.items()}
+    def createResource(self, resID):
+        """
+        Attempt to open a Serial instrument and create a resource object for it.
 
-    def openResource(self, resID):
-        # Instantiate the resource object
-        res_obj = self.manager.plugin_manager.createPluginInstance(r_Serial.fqn,
-                                                                   manager=self.manager,
-                                                                   resID=resID,
-                                                                   logger=self.logger
-                                                                   )
+        :return:        object
+        :raises:        ResourceUnavailable
+        :raises:        InterfaceError
+        """
+        try:
+            instrument = serial.Serial(port=resID, timeout=0)
 
-        # Signal new resource event
-        self.manager._publishEvent(labtronyx.EventCodes.resource.created, res_obj.uuid)
+            return self.manager.plugin_manager.createPluginInstance(r_Serial.fqn, manager=self.manager,
+                                                                    interface=self,
+                                                                    resID=resID,
+                                                                    instrument=instrument,
+                                                                    logger=self.logger
+                                                                    )
 
-        return res_obj
+        except (serial.SerialException, OSError) as e:
+            if os.name == 'nt':
+                # Windows implementation of PySerial does not set errno correctly
+                import ctypes
+                e.errno = ctypes.WinError().errno
+
+            if e.errno in [errno.ENOENT, errno.EACCES, errno.EBUSY]:
+                raise labtronyx.ResourceUnavailable('Serial resource error: %s' % resID)
+
+            else:
+                raise labtronyx.InterfaceError('Serial interface error [%i]: %s' % (e.errno, e.message))
 
     def getResource(self, resID):
         """
@@ -88,34 +119,223 @@ class i_Serial(labtronyx.InterfaceBase):
         if resID in self.resources_by_id:
             raise labtronyx.InterfaceError("Resource instance already exists")
 
+        res_obj = self.createResource(resID)
+
+        self._addResource(res_obj)
+
+        return res_obj
+
+
+class SerialRequest(object):
+    """
+    Outstanding asynchronous request for a serial resource
+
+    :param resource:        Serial resource
+    :type resource:         r_Serial
+    :param data:            Data to send, including any termination
+    :type data:             str
+    :param termination:     Termination sequence of the response
+    :type termination:      str
+    :param timeout:         Time (in seconds) to wait for the response once the data is sent
+    :type timeout:          float
+    """
+
+    def __init__(self, resource, data, termination, timeout):
+        self.resource = resource
+        self.data = data
+        self.termination = termination
+        self.timeout = timeout
+        self.deadline = None
+        self.future = Future()
+
+
+class SerialEngine(object):
+    """
+    Processes asynchronous requests for many serial ports from a single thread. The engine waits on the file
+    descriptors of all ports with outstanding requests using `select`, so dozens of ports can be serviced concurrently
+    without a thread per port.
+
+    Requests for the same resource are processed in the order they were submitted. While a request is outstanding,
+    the engine holds the I/O lock of the resource, so synchronous calls from other threads wait for it to complete.
+
+    :param logger:          Logger instance
+    :type logger:           logging.Logger
+    """
+    # Interval (in seconds) to retry requests for resources that are busy with synchronous operations
+    RETRY_INTERVAL = 0.01
+
+    def __init__(self, logger):
+        self.logger = logger
+
+        self._lock = threading.Lock()
+        self._queues = collections.OrderedDict()  # Pending requests by resource
+        self._counter = itertools.count()
+        self._active = {}  # Request in progress by resource, only accessed from the engine thread
+
+        self._wake_r, self._wake_w = os.pipe()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+
+        self._thread = threading.Thread(name='Labtronyx-Serial-Engine', target=self._run)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wakeup()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        # Fail any requests that were never started
+        with self._lock:
+            queues, self._queues = self._queues, collections.OrderedDict()
+
+        for req in [req for queue in queues.values() for _, _, req in queue]:
+            req.future.set_exception(labtronyx.InterfaceError("Serial I/O engine stopped"))
+
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def submit(self, resource, data, termination, timeout, priority=0):
+        """
+        Queue a request for a resource. Requests for the same resource are processed in priority order (lowest value
+        first), then in the order they were submitted.
+
+        :param resource:        Serial resource
+        :type resource:         r_Serial
+        :param data:            Data to send, including any termination
+        :type data:             str
+        :param termination:     Termination sequence of the response
+        :type termination:      str
+        :param timeout:         Time (in seconds) to wait for the response once the data is sent
+        :type timeout:          float
+        :param priority:        Priority, lower values are processed first
+        :type priority:         int
+        :rtype:                 labtronyx.common.futures.Future
+        """
+        req = SerialRequest(resource, data, termination, timeout)
+
+        with self._lock:
+            heapq.heappush(self._queues.setdefault(resource, []), (priority, next(self._counter), req))
+
+        self._wakeup()
+
+        return req.future
+
+    def _wakeup(self):
         try:
-            instrument = serial.Serial(port=resID, timeout=0)
+            os.write(self._wake_w, 'x')
+        except OSError:
+            pass
 
-            res_obj = self.manager.plugin_manager.createPluginInstance(r_Serial.fqn, manager=self.manager,
-                                                                       interface=self,
-                                                                       resID=resID,
-                                                                       instrument=instrument,
-                                                                       logger=self.logger
-                                                                       )
+    def _complete(self, req, result=None, exception=None):
+        del self._active[req.resource]
+        req.resource._io_lock.release()
 
-            # Signal new resource event
-            self.manager._publishEvent(labtronyx.EventCodes.resource.created, res_obj.uuid)
+        if exception is not None:
+            req.future.set_exception(exception)
+        else:
+            req.future.set_result(result)
 
-            return res_obj
+    def _activate(self):
+        """
+        Start the next pending request for each idle resource
 
-        except (serial.SerialException, OSError) as e:
-            if os.name == 'nt':
-                # Windows implementation of PySerial does not set errno correctly
-                import ctypes
-                e.errno = ctypes.WinError().errno
+        :returns:   True if any resource was busy and requests must be retried
+        """
+        busy = False
 
-            if e.errno in [errno.ENOENT, errno.EACCES, errno.EBUSY]:
-                raise labtronyx.ResourceUnavailable('Serial resource error: %s' % resID)
+        with self._lock:
+            for res_obj, queue in self._queues.items():
+                if res_obj in self._active:
+                    continue
+
+                if not res_obj._io_lock.acquire(False):
+                    busy = True
+                    continue
+
+                _, _, req = heapq.heappop(queue)
+                if len(queue) == 0:
+                    del self._queues[res_obj]
+
+                self._active[res_obj] = req
+
+        for res_obj, req in self._active.items():
+            if req.deadline is None:
+                try:
+                    res_obj.write_raw(req.data)
+                    req.deadline = time.time() + req.timeout
+
+                except labtronyx.LabtronyxException as e:
+                    self._complete(req, exception=e)
+
+        return busy
+
+    def _process(self):
+        """
+        Read any available data for active requests and complete requests that have received a response or timed out
+        """
+        now = time.time()
+
+        for res_obj, req in self._active.items():
+            if not res_obj.isOpen():
+                self._complete(req, exception=labtronyx.ResourceNotOpen())
+                continue
+
+            try:
+                res_obj._rx.fill()
+                msg = res_obj._rx.pop_until(req.termination)
+
+                if msg is not None:
+                    self._complete(req, result=msg.rstrip(res_obj.CR + res_obj.LF))
+
+                elif now > req.deadline:
+                    self._complete(req, exception=labtronyx.InterfaceTimeout("Timeout waiting for response"))
+
+            except SerialException as e:
+                if e == serial.portNotOpenError:
+                    self._complete(req, exception=labtronyx.ResourceNotOpen())
+                else:
+                    self._complete(req, exception=labtronyx.InterfaceError(e.strerror))
+
+    def _run(self):
+        while self._running:
+            try:
+                busy = self._activate()
+                self._process()
+
+                # Wait until a port is readable, a request is submitted or the next deadline
+                fds = []
+                timeout = self.RETRY_INTERVAL if busy else None
+
+                for res_obj, req in self._active.items():
+                    fds.append(res_obj.instrument.fileno())
+
+                    remaining = max(0, req.deadline - time.time())
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+
+                readable, _, _ = select.select(fds + [self._wake_r], [], [], timeout)
+
+                if self._wake_r in readable:
+                    os.read(self._wake_r, 4096)
+
+            except Exception:
+                self.logger.exception("Exception in Serial I/O engine")
+
+                # Fail all active requests so the engine can recover
+                for req in self._active.values():
+                    self._complete(req, exception=labtronyx.InterfaceError("Serial I/O engine error"))
+
+        # Fail requests in progress from this thread, which holds the I/O lock of each resource
+        for req in self._active.values():
+            self._complete(req, exception=labtronyx.InterfaceError("Serial I/O engine stopped"))
 
-            else:
-                raise labtronyx.InterfaceError('Serial interface error [%i]: %s' % (e.errno, e.message))
 
-        
 class r_Serial(labtronyx.ResourceBase):
     """
     Serial Resource Base class.
@@ -126,10 +346,18 @@ class r_Serial(labtronyx.ResourceBase):
     serial resources in the case that a VISA library is not available.
     """
     interfaceName = 'Serial'
+    interface = plugin.PluginDependency(pluginType='interface', interfaceName='Serial')
 
     CR = '\r'
     LF = '\n'
     termination = CR + LF
+    read_termination = LF
+
+    # Interval (in seconds) to poll for received data on platforms that cannot wait on the port
+    POLL_INTERVAL = 0.001
+
+    # Time (in seconds) without received data after which a clear is complete
+    CLEAR_QUIET_TIME = 0.1
 
     def __init__(self, manager, resID, **kwargs):
         assert (isinstance(manager, labtronyx.InstrumentManager))
@@ -141,6 +369,10 @@ class r_Serial(labtronyx.ResourceBase):
                                                             resID=resID)) > 0:
             raise labtronyx.InterfaceError("Resource already exists")
 
+        # Read timeout in seconds, the port itself is always non-blocking
+        self._timeout = 2.0
+        self._rx = ReceiveBuffer(self._rx_read, self._rx_wait)
+
         try:
             self.instrument = serial.Serial(port=resID, timeout=0)
 
@@ -186,6 +418,7 @@ class r_Serial(labtronyx.ResourceBase):
         """
         try:
             self.instrument.open()
+            self._rx.clear()
 
             # Restore instrument context
             self.configure()
@@ -242,10 +475,12 @@ class r_Serial(labtronyx.ResourceBase):
         """
         Configure Serial port parameters for the resource.
 
-        :param timeout:             Command timeout
-        :type timeout:              int
+        :param timeout:             Read timeout in seconds
+        :type timeout:              float
         :param write_termination:   Write termination
         :type write_termination:    str
+        :param read_termination:    Read termination
+        :type read_termination:     str
         :param baud_rate:           Serial Baudrate. Default 9600
         :type baud_rate:            int
         :param data_bits:           Number of bits per frame. Default 8.
@@ -255,24 +490,37 @@ class r_Serial(labtronyx.ResourceBase):
         :param stop_bits:           Number of stop bits. Default 1
         :type stop_bits:            int
         """
+        port_settings = {}
+
         if 'baud_rate' in kwargs:
-            self.instrument.setBaudrate(int(kwargs.get('baud_rate')))
+            port_settings['baudrate'] = int(kwargs.get('baud_rate'))
             
         if 'timeout' in kwargs:
-            self.instrument.setTimeout(float(kwargs.get('timeout')))
+            self._timeout = float(kwargs.get('timeout'))
             
         if 'data_bits' in kwargs:
-            self.instrument.setByteSize(int(kwargs.get('data_bits')))
+            port_settings['bytesize'] = int(kwargs.get('data_bits'))
             
         if 'parity' in kwargs:
-            self.instrument.setParity(kwargs.get('parity'))
+            port_settings['parity'] = kwargs.get('parity')
             
         if 'stop_bits' in kwargs:
-            self.instrument.setStopbits(int(kwargs.get('stop_bits')))
+            port_settings['stopbits'] = int(kwargs.get('stop_bits'))
             
         if 'write_termination' in kwargs:
             self.termination = kwargs.get('write_termination')
-            
+
+        if 'read_termination' in kwargs:
+            self.read_termination = kwargs.get('read_termination')
+
+        # Only settings that changed are applied. Reconfiguring an open port is a system call for each setting
+        settings = self.instrument.getSettingsDict()
+        changed = {key: value for key, value in port_settings.items() if settings.get(key) != value}
+
+        if len(changed) > 0:
+            settings.update(changed)
+            self.instrument.applySettingsDict(settings)
+
     def getConfiguration(self):
         """
         Get the resource configuration
@@ -287,7 +535,8 @@ class r_Serial(labtronyx.ResourceBase):
             'parity':       settings.get('parity'),
             'stop_bits':    settings.get('stopbits'),
             'write_termination': self.termination,
-            'timeout':      settings.get('timeout')
+            'read_termination': self.read_termination,
+            'timeout':      self._timeout
         }
         
     # ===========================================================================
@@ -308,19 +557,25 @@ class r_Serial(labtronyx.ResourceBase):
         :raises:        InterfaceTimeout
         :raises:        InterfaceError
         """
-        try:
-            self.logger.debug("Serial Write: %s", data)
-            self.instrument.write(data + self.termination)
+        with self._io_lock:
+            self._sessionUse()
+
+            self._last_command = data
+
+            with self._traceTransfer('write', data):
+                try:
+                    self.logger.debug("Serial Write: %s", data)
+                    self.instrument.write(data + self.termination)
             
-        except SerialException as e:
-            if e == serial.portNotOpenError:
-                raise labtronyx.ResourceNotOpen()
+                except SerialException as e:
+                    if e == serial.portNotOpenError:
+                        raise labtronyx.ResourceNotOpen()
 
-            elif e == serial.writeTimeoutError:
-                raise labtronyx.InterfaceTimeout()
+                    elif e == serial.writeTimeoutError:
+                        raise labtronyx.InterfaceTimeout()
 
-            else:
-                raise labtronyx.InterfaceError(e.strerror)
+                    else:
+                        raise labtronyx.InterfaceError(e.strerror)
             
     def write_raw(self, data):
         """
@@ -333,81 +588,182 @@ class r_Serial(labtronyx.ResourceBase):
         :raises:        InterfaceTimeout
         :raises:        InterfaceError
         """
-        try:
-            self.instrument.write(data)
+        with self._io_lock:
+            self._sessionUse()
+
+            self._last_command = None
+
+            with self._traceTransfer('write', data):
+                try:
+                    self.instrument.write(data)
             
-        except SerialException as e:
-            if e == serial.portNotOpenError:
-                raise labtronyx.ResourceNotOpen()
+                except SerialException as e:
+                    if e == serial.portNotOpenError:
+                        raise labtronyx.ResourceNotOpen()
 
-            elif e == serial.writeTimeoutError:
-                raise labtronyx.InterfaceTimeout()
+                    elif e == serial.writeTimeoutError:
+                        raise labtronyx.InterfaceTimeout()
 
-            else:
-                raise labtronyx.InterfaceError(e.strerror)
+                    else:
+                        raise labtronyx.InterfaceError(e.strerror)
     
-    def read(self, termination=None):
+    def _rx_read(self):
+        # Read everything waiting in the driver buffer without blocking
+        bytes_waiting = self.instrument.inWaiting()
+
+        if bytes_waiting > 0:
+            return self.instrument.read(bytes_waiting)
+        else:
+            return ''
+
+    def _rx_wait(self, timeout):
+        # Wait for the port to become readable instead of spinning. Windows ports cannot be used with select
+        if os.name != 'nt' and hasattr(self.instrument, 'fileno'):
+            select.select([self.instrument.fileno()], [], [], timeout)
+        else:
+            time.sleep(min(timeout, self.POLL_INTERVAL))
+
+    def write_block(self, command, data, dtype='B'):
+        """
+        Send a command with binary data as an IEEE 488.2 definite length arbitrary block. Termination character is
+        appended automatically.
+
+        :param command: Command header
+        :type command:  str
+        :param data:    Data to send
+        :type data:     numpy.ndarray or list
+        :param dtype:   numpy data type of the block payload, including byte order (e.g. '>f8')
+        :type dtype:    str
+        :raises:        ResourceNotOpen
+        :raises:        InterfaceTimeout
+        :raises:        InterfaceError
+        """
+        self.write_raw('%s %s%s' % (command, ieee488.encode_block(data, dtype), self.termination))
+
+    def read(self, termination=None, timeout=None):
         """
         Read string data from the instrument.
         
-        Reading stops when the device stops sending, or the termination 
-        characters sequence was detected.
+        Reading stops when the termination character sequence is detected. Received data is buffered, so any data
+        following the termination is returned by the next read.
         
         All line-ending characters are stripped from the end of the string.
 
-        :raises:        ResourceNotOpen
+        :param termination: Line termination. Defaults to the `read_termination` configuration
+        :type termination:  str
+        :param timeout:     Timeout (in seconds) for this read. Defaults to the adaptive or configured timeout
+        :type timeout:      float
+        :returns:           str
+        :raises:            ResourceNotOpen
+        :raises:            InterfaceTimeout
+        :raises:            InterfaceError
         """
-        try:
-            ret = ''
-            
-            if termination is None:
-                bytes_waiting = self.instrument.inWaiting()
-                ret += self.instrument.read(bytes_waiting)
-            
-            else:
-                ret += self.instrument.read(1)
-                while ret[-1] != self.termination[-1] or self.instrument.inWaiting() == 0:
-                    ret += self.instrument.read(1)
-                ret = ret[:-len(self.termination)]
-        
-            return ret
+        if termination is None:
+            termination = self.read_termination
+
+        with self._io_lock:
+            self._sessionUse()
+
+            with self._latencyTimer(timeout=timeout, default=self._timeout) as timer, \
+                    self._traceTransfer('read') as trace:
+                try:
+                    ret = self._rx.read_until(termination, time.time() + timer.timeout)
+                    ret = ret.rstrip(self.CR + self.LF)
+                    trace.received(ret)
+
+                    self.logger.debug("Serial Read: %s", ret)
+
+                    return ret
         
-        except SerialException as e:
-            if e == serial.portNotOpenError:
-                raise labtronyx.ResourceNotOpen()
-            else:
-                raise labtronyx.InterfaceError(e.strerror)
+                except SerialException as e:
+                    if e == serial.portNotOpenError:
+                        raise labtronyx.ResourceNotOpen()
+                    else:
+                        raise labtronyx.InterfaceError(e.strerror)
     
-    def read_raw(self, size=None):
+    def read_raw(self, size=None, timeout=None):
         """
         Read Binary-encoded data from the instrument.
         
-        No termination characters are stripped.
+        No termination characters are stripped. If `size` is not provided, all data received so far is returned.
         
         :param size:    Number of bytes to read
         :type size:     int
+        :param timeout: Timeout (in seconds) for this read. Defaults to the adaptive or configured timeout
+        :type timeout:  float
         :returns:       bytes
         :raises:        ResourceNotOpen
+        :raises:        InterfaceTimeout
+        :raises:        InterfaceError
         """
-        try:
-            ret = bytes()
-            
-            if size is None:
-                size = self.instrument.inWaiting()
-            
-            ret += self.instrument.read(size)
-            if len(ret) != len(size):
-                raise labtronyx.InterfaceTimeout("Timeout before requested bytes could be read")
-                
-            return ret
+        with self._io_lock:
+            self._sessionUse()
+
+            with self._latencyTimer(timeout=timeout, default=self._timeout) as timer, \
+                    self._traceTransfer('read') as trace:
+                try:
+                    if size is None:
+                        ret = self._rx.read_available()
+
+                    else:
+                        ret = self._rx.read_exact(size, time.time() + timer.timeout)
+
+                    trace.received(ret)
+
+                    return ret
         
-        except SerialException as e:
-            if e == serial.portNotOpenError:
-                raise labtronyx.ResourceNotOpen()
-            else:
-                raise labtronyx.InterfaceError(e.strerror)
-    
-    def query(self, data, delay=None):
+                except SerialException as e:
+                    if e == serial.portNotOpenError:
+                        raise labtronyx.ResourceNotOpen()
+                    else:
+                        raise labtronyx.InterfaceError(e.strerror)
+
+    def read_block(self, dtype='B', into=None, timeout=None):
+        """
+        Read an IEEE 488.2 definite length arbitrary block from the instrument. The payload is read in large chunks
+        directly into a single buffer and returned as a numpy array view, the message terminator is discarded.
+
+        Returns a numpy array, so this method is only usable locally.
+
+        :param dtype:   numpy data type of the block payload, including byte order (e.g. '>i2')
+        :type dtype:    str
+        :param into:    Preallocated buffer to read the payload into
+        :type into:     bytearray, memoryview or numpy.ndarray
+        :param timeout: Timeout (in seconds) for each chunk. Defaults to the adaptive or configured timeout
+        :type timeout:  float
+        :rtype:         numpy.ndarray
+        :raises:        ResourceNotOpen
+        :raises:        InterfaceTimeout
+        :raises:        InterfaceError
+        :raises:        InvalidResponse
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            with self._latencyTimer(timeout=timeout, default=self._timeout) as timer, \
+                    self._traceTransfer('read') as trace:
+
+                def read_chunk(size):
+                    # Timeout applies to each chunk, so long transfers are not cut off while data is still arriving
+                    return self._rx.read_some(size, time.time() + timer.timeout)
+
+                try:
+                    data = ieee488.read_block(read_chunk, dtype, into)
+
+                    # Discard the message terminator
+                    self._rx.read_until(self.read_termination, time.time() + timer.timeout)
+
+                    trace.received(data, data.nbytes)
+
+                    return data
+
+                except SerialException as e:
+                    if e == serial.portNotOpenError:
+                        raise labtronyx.ResourceNotOpen()
+                    else:
+                        raise labtronyx.InterfaceError(e.strerror)
+
+    def query(self, data, delay=None, timeout=None):
         """
         Retreive ASCII-encoded data from the device given a prompt.
         
@@ -417,15 +773,59 @@ class r_Serial(labtronyx.ResourceBase):
         :type data:     str
         :param delay:   delay (in seconds) between write and read operations.
         :type delay:    float
+        :param timeout: Timeout (in seconds) for the response. Defaults to the adaptive or configured timeout
+        :type timeout:  float
         :returns:       str
         :raises:        ResourceNotOpen
         :raises:        InterfaceTimeout
         :raises:        InterfaceError
         """
+        with self._io_lock:
+            self._sessionUse()
+
+            self.write(data)
+            if delay is not None:
+                time.sleep(delay)
+            return self.read(timeout=timeout)
+
+    @local_only
+    def query_async(self, data, priority=labtronyx.ResourceBase.PRIORITY_NORMAL, timeout=None, termination=None):
+        """
+        Send a prompt and retrieve the ASCII-encoded response asynchronously. Requests for all serial resources are
+        processed concurrently by a single I/O thread owned by the Serial interface. Requests for the same resource are
+        processed in priority order, then in the order they were submitted.
+
+        On platforms where serial ports cannot be multiplexed, the query is processed by the I/O worker of the resource
+        instead.
+
+        Returns a Future, so this method is only usable locally.
+
+        :param data:        Data to send
+        :type data:         str
+        :param priority:    Priority, lower values are processed first
+        :type priority:     int
+        :param timeout:     Time (in seconds) to wait for the response. Defaults to the `timeout` configuration
+        :type timeout:      float
+        :param termination: Response termination. Defaults to the `read_termination` configuration
+        :type termination:  str
+        :rtype:             labtronyx.common.futures.Future
+        """
+        if termination is None:
+            termination = self.read_termination
+
+        if timeout is None:
+            timeout = self._timeout
+
+        engine = self.interface.engine
+
+        if engine is None:
+            return self.submit('_query', (data, termination, timeout), priority=priority)
+
+        return engine.submit(self, data + self.termination, termination, timeout, priority)
+
+    def _query(self, data, termination, timeout):
         self.write(data)
-        if delay is not None:
-            time.sleep(delay)
-        return self.read()
+        return self.read(termination, timeout)
     
     def inWaiting(self):
         """
@@ -435,11 +835,35 @@ class r_Serial(labtronyx.ResourceBase):
         :raises:        InterfaceError
         """
         try:
-            return self.instrument.inWaiting()
+            return len(self._rx) + self.instrument.inWaiting()
 
         except serial.SerialException as e:
             raise labtronyx.InterfaceError(e.strerror)
 
+    def clear(self):
+        """
+        Discard any response the instrument is still sending. Received data is discarded until the instrument stops
+        sending. Use after a timeout part way through a response, so that the next query does not receive the rest of
+        the old response.
+
+        :raises:        ResourceNotOpen
+        :raises:        InterfaceError
+        """
+        with self._io_lock:
+            try:
+                self.instrument.flushInput()
+
+                discarded = self._rx.drain(self.CLEAR_QUIET_TIME)
+
+                if discarded > 0:
+                    self.logger.debug("Discarded %d bytes", discarded)
+
+            except SerialException as e:
+                if e == serial.portNotOpenError:
+                    raise labtronyx.ResourceNotOpen()
+                else:
+                    raise labtronyx.InterfaceError(e.strerror)
+
     def flush(self):
         """
         Flush the output buffer
@@ -0,0 +1,644 @@
+"""
+The Socket interface communicates with LXI instruments using raw SCPI over TCP, typically on port 5025. Raw sockets
+avoid the overhead of the VISA library and the VXI-11 RPC framing of each transfer, which makes query-heavy workloads
+several times faster.
+
+Resources are identified by the host name or address of the instrument and an optional port::
+
+    instr = manager.getResource('Socket', '192.168.0.10')
+    instr = manager.getResource('Socket', '192.168.0.10:5025')
+
+Connections are kept in a pool when resources are closed, so a resource that is opened and closed repeatedly does not
+reconnect each time.
+"""
+import labtronyx
+from labtronyx.common import plugin
+from labtronyx.common import ieee488
+from labtronyx.common.buffer import ReceiveBuffer
+from labtronyx.bases.scpi import SCPIResourceMixin
+
+import time
+import socket
+import select
+import threading
+
+
+class i_Socket(labtronyx.InterfaceBase):
+    """
+    Socket Interface
+
+    Raw SCPI over TCP. Instruments cannot be discovered, resources must be created using :func:`getResource`.
+    """
+    version = '1.0'
+    interfaceName = 'Socket'
+    enumerable = False
+
+    def __init__(self, manager, **kwargs):
+        super(i_Socket, self).__init__(manager, **kwargs)
+
+        # Instance variables
+        self._pool = ConnectionPool()
+
+    def close(self):
+        """
+        Destroy all resource objects owned by the interface and close all pooled connections.
+
+        :returns: True if successful, False otherwise
+        """
+        ret = super(i_Socket, self).close()
+
+        self._pool.close()
+
+        return ret
+
+    @property
+    def pool(self):
+        """
+        Connection pool shared by all socket resources
+
+        :rtype: ConnectionPool
+        """
+        return self._pool
+
+    @property
+    def resources(self):
+        return self.manager.plugin_manager.getPluginInstancesByBaseClass(r_Socket)
+
+    def getResource(self, resID):
+        """
+        Connect to an instrument. If successful, a socket resource is added to the list of known resources and the
+        object is returned.
+
+        :param resID:   Host name or address, with an optional port (`host:port`)
+        :type resID:    str
+        :return:        object
+        :raises:        ResourceUnavailable
+        :raises:        InterfaceError
+        """
+        if resID in self.resources_by_id:
+            raise labtronyx.InterfaceError("Resource instance already exists")
+
+        res_obj = self.manager.plugin_manager.createPluginInstance(r_Socket.fqn, manager=self.manager,
+                                                                   resID=resID,
+                                                                   logger=self.logger
+                                                                   )
+
+        self._addResource(res_obj)
+
+        return res_obj
+
+
+class ConnectionPool(object):
+    """
+    Pool of persistent TCP connections. Connections are returned to the pool when a resource is closed and reused when
+    a resource with the same address is opened again.
+
+    Connections are created with `TCP_NODELAY` set, so small commands are sent immediately instead of waiting to be
+    combined with later data, and with a large receive buffer for bulk transfers.
+
+    :param max_idle:        Maximum number of idle connections kept for each address
+    :type max_idle:         int
+    """
+    # Receive buffer size requested from the operating system
+    RECV_BUFFER_SIZE = 4 << 20
+
+    def __init__(self, max_idle=1):
+        self.max_idle = max_idle
+
+        self._lock = threading.Lock()
+        self._idle = {}
+
+    def acquire(self, address, timeout):
+        """
+        Get an idle connection to an address from the pool, or create a new connection.
+
+        :param address:     Host and port
+        :type address:      tuple
+        :param timeout:     Connection timeout (in seconds)
+        :type timeout:      float
+        :rtype:             socket.socket
+        :raises:            socket.error
+        """
+        while True:
+            with self._lock:
+                idle = self._idle.get(address, [])
+                sock = idle.pop() if len(idle) > 0 else None
+
+            if sock is None:
+                break
+
+            if self._isUsable(sock):
+                return sock
+
+            sock.close()
+
+        sock = socket.create_connection(address, timeout)
+
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.RECV_BUFFER_SIZE)
+        except socket.error:
+            # The operating system may limit the buffer size
+            pass
+
+        return sock
+
+    def release(self, address, sock):
+        """
+        Return a connection to the pool. The connection is closed if the pool is full.
+
+        :param address:     Host and port
+        :type address:      tuple
+        :param sock:        Connection
+        :type sock:         socket.socket
+        """
+        with self._lock:
+            idle = self._idle.setdefault(address, [])
+
+            if len(idle) < self.max_idle:
+                idle.append(sock)
+                return
+
+        sock.close()
+
+    def close(self):
+        """
+        Close all idle connections
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+
+        for conns in idle.values():
+            for sock in conns:
+                sock.close()
+
+    def _isUsable(self, sock):
+        # An idle connection must not be readable. Either the peer closed the connection, or there is unread data that
+        # would be mistaken for the response to the next command
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+            return len(readable) == 0
+
+        except (socket.error, select.error, ValueError):
+            return False
+
+
+class r_Socket(SCPIResourceMixin, labtronyx.ResourceBase):
+    """
+    Socket Resource
+
+    Resource API is compatible with VISA resources, so any driver written for a VISA resource should also work for
+    socket resources. Instruments are identified using the `*IDN?` query, and drivers are matched using the same
+    identity check as VISA resources.
+
+    Drivers derived from a socket resource do not need to provide values for the following property attributes as
+    they are derived from the identification string:
+
+       * deviceVendor
+       * deviceModel
+       * deviceSerial
+       * deviceFirmware
+    """
+    interfaceName = 'Socket'
+    interface = plugin.PluginDependency(pluginType='interface', interfaceName='Socket')
+
+    # Default SCPI raw socket port
+    DEFAULT_PORT = 5025
+
+    # Maximum number of bytes requested from the socket for each receive
+    RECV_SIZE = 1 << 20
+
+    # Identify using the configured timeout
+    IDENTIFY_TIMEOUT = None
+
+    # Time (in seconds) without received data after which a clear is complete
+    CLEAR_QUIET_TIME = 0.1
+
+    def __init__(self, manager, resID, **kwargs):
+        assert (isinstance(manager, labtronyx.InstrumentManager))
+
+        super(r_Socket, self).__init__(manager, resID, **kwargs)
+
+        self._initSCPI()
+
+        # Ensure resource doesn't already exist
+        if len(manager.plugin_manager.searchPluginInstances(pluginType='resource', interfaceName='Socket',
+                                                            resID=resID)) > 0:
+            raise labtronyx.InterfaceError("Resource already exists")
+
+        host, _, port = resID.partition(':')
+
+        try:
+            self._address = (host, int(port) if port else self.DEFAULT_PORT)
+
+        except ValueError:
+            raise labtronyx.ResourceUnavailable('Invalid Socket Resource Identifier: %s' % resID)
+
+        # Instance variables
+        self._sock = None
+        self._rx = ReceiveBuffer(self._rx_read, self._rx_wait)
+        self._conf = { # Default configuration
+                      'read_termination': '\n',
+                      'write_termination': '\n',
+                      'timeout': 2000
+                      }
+
+        # Make sure the instrument is reachable, the connection is kept in the pool for the first use
+        self.interface.pool.release(self._address, self._connect())
+
+        self.logger.debug("Created Socket resource: %s", resID)
+
+    def getProperties(self):
+        """
+        Get the property dictionary for the Socket resource.
+
+        :rtype: dict[str:object]
+        """
+        if not self.ready:
+            self.identify()
+
+        def_prop = labtronyx.ResourceBase.getProperties(self)
+        def_prop.update({
+            'resourceType': 'TCPIP'
+        })
+
+        # Set some default search parameters if driver has not already defined
+        return self._setIdentityProperties(def_prop)
+
+    #===========================================================================
+    # SCPI Specific
+    #===========================================================================
+
+    def clear(self):
+        """
+        Discard pending commands waiting to be coalesced, and any response the instrument is still sending. Raw sockets
+        have no device clear message, so received data is discarded until the instrument stops sending. Use after a
+        timeout part way through a response, so that the next query does not receive the rest of the old response.
+
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            self._coalesce_buffer = []
+
+            discarded = self._rx.drain(self.CLEAR_QUIET_TIME)
+
+            if discarded > 0:
+                self.logger.debug("Discarded %d bytes", discarded)
+
+    #===========================================================================
+    # Resource State
+    #===========================================================================
+
+    def _connect(self):
+        try:
+            return self.interface.pool.acquire(self._address, self._conf['timeout'] / 1000.0)
+
+        except socket.error as e:
+            raise labtronyx.ResourceUnavailable('Socket resource error: %s' % e)
+
+    def open(self):
+        """
+        Open the resource and prepare to receive commands. If a driver is loaded, the driver will also be opened
+
+        :returns:       True if successful, False otherwise
+        :raises:        ResourceUnavailable
+        """
+        if self._sock is None:
+            self._sock = self._connect()
+            self._rx.clear()
+
+            # Restore instrument context
+            self.configure()
+
+        # Call the base resource open function to call driver hooks
+        return labtronyx.ResourceBase.open(self)
+
+    def isOpen(self):
+        """
+        Check if the resource is open
+
+        :return: bool
+        """
+        return self._sock is not None
+
+    def close(self):
+        """
+        Close the resource. If a driver is loaded, that driver is also closed. The connection is returned to the pool
+        of the interface if no data is left unread.
+
+        :returns: True if successful, False otherwise
+        """
+        if self.isOpen():
+            # Close the driver
+            labtronyx.ResourceBase.close(self)
+
+            try:
+                # Send any commands still waiting to be coalesced
+                self.flush()
+
+            except labtronyx.InterfaceError:
+                self.logger.exception('Socket resource error while sending coalesced commands')
+
+            sock, self._sock = self._sock, None
+
+            if len(self._rx) > 0:
+                # Unread data would be received as the response to the next command
+                sock.close()
+            else:
+                self.interface.pool.release(self._address, sock)
+
+        return True
+
+    def lock(self):
+        return False
+
+    def unlock(self):
+        return False
+
+    # ===========================================================================
+    # Configuration
+    # ===========================================================================
+
+    def configure(self, **kwargs):
+        """
+        Configure resource parameters to alter transmission characteristics or data interpretation
+
+        :param timeout:             Command timeout (in milliseconds). Floats are assumed to be in seconds
+        :type timeout:              int
+        :param write_termination:   Write termination
+        :type write_termination:    str
+        :param read_termination:    Read termination
+        :type read_termination:     str
+        :param coalesce_writes:     Coalesce consecutive writes until the next read or query
+        :type coalesce_writes:      bool
+        :param coalesce_limit:      Maximum size (in bytes) of a coalesced transfer
+        :type coalesce_limit:       int
+        """
+        if 'timeout' in kwargs:
+            timeout = kwargs.get('timeout')
+            if type(timeout) == float:
+                # assume this is seconds
+                kwargs['timeout'] = int(timeout * 1000)
+
+        self._configureCoalescing(kwargs)
+
+        for key in ['timeout', 'read_termination', 'write_termination']:
+            if key in kwargs:
+                self._conf[key] = kwargs[key]
+
+        if self.isOpen():
+            self._sock.settimeout(self._conf['timeout'] / 1000.0)
+
+    def getConfiguration(self):
+        """
+        Get the resource configuration
+
+        :return: dict
+        """
+        ret = dict(self._conf)
+        ret.update(self._getCoalescingConfiguration())
+
+        return ret
+
+    # ===========================================================================
+    # Data Transmission
+    # ===========================================================================
+
+    def _send(self, data):
+        if self._sock is None:
+            raise labtronyx.ResourceNotOpen()
+
+        try:
+            self._sock.sendall(data)
+
+        except socket.timeout:
+            raise labtronyx.InterfaceTimeout("Timeout while sending data")
+
+        except socket.error as e:
+            raise labtronyx.InterfaceError('Socket error: %s' % e)
+
+    def _rx_read(self):
+        # Receive everything that is waiting on the socket without blocking
+        if self._sock is None:
+            raise labtronyx.ResourceNotOpen()
+
+        try:
+            readable, _, _ = select.select([self._sock], [], [], 0)
+
+            if len(readable) == 0:
+                return ''
+
+            data = self._sock.recv(self.RECV_SIZE)
+
+        except (socket.error, select.error) as e:
+            raise labtronyx.InterfaceError('Socket error: %s' % e)
+
+        if len(data) == 0:
+            raise labtronyx.InterfaceError("Connection closed by instrument")
+
+        return data
+
+    def _rx_wait(self, timeout):
+        select.select([self._sock], [], [], timeout)
+
+    def _deadline(self, timeout=None):
+        if timeout is None:
+            timeout = self._conf['timeout'] / 1000.0
+
+        return time.time() + timeout
+
+    def _write(self, data):
+        with self._traceTransfer('write', data):
+            self._send(data + self._conf['write_termination'])
+
+            self.logger.debug("Socket Write: %s", data)
+
+    def write_raw(self, data):
+        """
+        Send Binary-encoded data to the instrument without modification
+
+        :param data:        Data to send
+        :type data:         str
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+
+            self._last_command = None
+
+            with self._traceTransfer('write', data):
+                self._send(data)
+
+    def write_block(self, command, data, dtype='B'):
+        """
+        Send a command with binary data as an IEEE 488.2 definite length arbitrary block. Termination character is
+        appended automatically.
+
+        :param command:     Command header
+        :type command:      str
+        :param data:        Data to send
+        :type data:         numpy.ndarray or list
+        :param dtype:       numpy data type of the block payload, including byte order (e.g. '>f8')
+        :type dtype:        str
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        self.write_raw('%s %s%s' % (command, ieee488.encode_block(data, dtype), self._conf['write_termination']))
+
+    def read(self, termination=None, encoding=None, timeout=None):
+        """
+        Read ASCII-formatted data from the instrument.
+
+        Reading stops when the termination character sequence is detected. Received data is buffered, so any data
+        following the termination is returned by the next read. All line-ending characters are stripped from the end of
+        the string.
+
+        :param termination: Line termination. Defaults to the `read_termination` configuration
+        :type termination:  str
+        :param encoding:    Encoding
+        :type encoding:     str
+        :param timeout:     Timeout (in seconds) for this read. Defaults to the adaptive or configured timeout
+        :type timeout:      float
+        :return:            str
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        if termination is None:
+            termination = self._conf['read_termination']
+
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+
+            with self._latencyTimer(timeout=timeout) as timer, self._traceTransfer('read') as trace:
+                data = self._rx.read_until(termination, self._deadline(timer.timeout)).rstrip('\r\n')
+
+                if encoding is not None:
+                    data = data.decode(encoding)
+
+                trace.received(data)
+
+                self.logger.debug("Socket Read: %s", data)
+
+                return data
+
+    def read_raw(self, size=None, timeout=None):
+        """
+        Read Binary-encoded data directly from the instrument.
+
+        If `size` is not provided, data is read until the read termination is received. The termination is included
+        in the returned data.
+
+        :param size:        Number of bytes to read
+        :type size:         int
+        :param timeout:     Timeout (in seconds) for this read. Defaults to the adaptive or configured timeout
+        :type timeout:      float
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+
+            with self._latencyTimer(timeout=timeout) as timer, self._traceTransfer('read') as trace:
+                if size is None:
+                    termination = self._conf['read_termination']
+                    ret = self._rx.read_until(termination, self._deadline(timer.timeout)) + termination
+
+                else:
+                    ret = self._rx.read_exact(size, self._deadline(timer.timeout))
+
+                trace.received(ret)
+
+                return ret
+
+    def read_block(self, dtype='B', into=None, timeout=None):
+        """
+        Read an IEEE 488.2 definite length arbitrary block from the instrument. The payload is read in large chunks
+        directly into a single buffer and returned as a numpy array view, the message terminator is discarded.
+
+        Returns a numpy array, so this method is only usable locally.
+
+        :param dtype:       numpy data type of the block payload, including byte order (e.g. '>i2')
+        :type dtype:        str
+        :param into:        Preallocated buffer to read the payload into
+        :type into:         bytearray, memoryview or numpy.ndarray
+        :param timeout:     Timeout (in seconds) for each chunk. Defaults to the adaptive or configured timeout
+        :type timeout:      float
+        :rtype:             numpy.ndarray
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        :raises:            labtronyx.InvalidResponse
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+
+            with self._latencyTimer(timeout=timeout) as timer, self._traceTransfer('read') as trace:
+
+                def read_chunk(size):
+                    # Timeout applies to each chunk, so long transfers are not cut off while data is still arriving
+                    return self._rx.read_some(size, self._deadline(timer.timeout))
+
+                data = ieee488.read_block(read_chunk, dtype, into)
+
+                # Discard the message terminator
+                self._rx.read_until(self._conf['read_termination'], self._deadline(timer.timeout))
+
+                trace.received(data, data.nbytes)
+
+                self.logger.debug("Socket Read Block: %d bytes", data.nbytes)
+
+                return data
+
+    def query(self, data, delay=None, timeout=None):
+        """
+        Retrieve ASCII-encoded data from the device given a prompt.
+
+        A combination of write(data) and read()
+
+        :param data:        Data to send
+        :type data:         str
+        :param delay:       delay (in seconds) between write and read operations.
+        :type delay:        float
+        :param timeout:     Timeout (in seconds) for the response. Defaults to the adaptive or configured timeout
+        :type timeout:      float
+        :returns:           str
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            data = self._joinPending(data)
+
+            self._last_command = data
+
+            with self._latencyTimer(data, timeout) as timer, self._traceTransfer('query', data) as trace:
+                self._send(data + self._conf['write_termination'])
+
+                if delay is not None:
+                    time.sleep(delay)
+
+                ret_data = self._rx.read_until(self._conf['read_termination'],
+                                               self._deadline(timer.timeout)).rstrip('\r\n')
+                trace.received(ret_data)
+
+                self.logger.debug("Socket Query: %s returned: %s", data, ret_data)
+
+                return ret_data
@@ -5,6 +5,9 @@ VISA Interface module for Labtronyx
 """
 import labtronyx
 from labtronyx.common import plugin
+from labtronyx.common import ieee488
+from labtronyx.common.timing import monotonic
+from labtronyx.bases.scpi import SCPIResourceMixin
 
 import time
 
@@ -59,66 +62,46 @@ class i_VISA(labtronyx.InterfaceBase):
 
         return False
 
-    def enumerate(self):
+    def list_devices(self):
         """
-        Identify all devices known to the VISA driver and create resource objects for valid resources
-        """
-        if self.__resource_manager is None:
-            raise labtronyx.InterfaceError("Interface not open")
-
-        self.logger.debug("Enumerating VISA interface")
-
-        try:
-            new_res_list = [res for res in self.__resource_manager.list_resources() if res not in self.resources_by_id]
-
-            # Check for new resources
-            for resID in new_res_list:
-                try:
-                    self.openResource(resID)
-
-                except labtronyx.ResourceUnavailable:
-                    pass
-
-        except visa.VisaIOError as e:
-            # Exception thrown when there are no resources
-            self.logger.exception('VISA Exception during enumeration')
+        Get the identifiers of all devices known to the VISA driver
 
-    def prune(self):
-        """
-        Close any resources that are no longer known to the VISA interface
+        :rtype:         list[str]
+        :raises:        labtronyx.InterfaceError
         """
         if self.__resource_manager is None:
             raise labtronyx.InterfaceError("Interface not open")
 
         try:
-            # Get a fresh list of resources
-            res_list = self.__resource_manager.list_resources()
+            return self.__resource_manager.list_resources()
+
         except visa.VisaIOError:
             # Exception thrown when there are no resources
-            res_list = []
-
-        for res_uuid, res_obj in self.resources.items():
-            resID = res_obj.resID
-
-            if resID not in res_list:
-                res_obj.close()
-
-                self.manager.plugin_manager.destroyPluginInstance(res_uuid)
-                self.manager._publishEvent(labtronyx.EventCodes.resource.destroyed, res_obj.uuid)
+            return []
 
     @property
     def resources(self):
         return self.manager.plugin_manager.getPluginInstancesByBaseClass(r_VISA)
 
-    @property
-    def resources_by_id(self):
-        return {res_obj.resID: res_obj for res_uuid, res_obj in self.resources.items()}
-
     @property
     def resource_manager(self):
         return self.__resource_manager
 
-    def openResource(self, resID):
+    def createResource(self, resID):
+        """
+        Attempt to open a VISA instrument and create a resource object for it.
+
+        :return:        object
+        :raises:        labtronyx.ResourceUnavailable
+        :raises:        labtronyx.InterfaceError
+        """
+        return self.manager.plugin_manager.createPluginInstance(r_VISA.fqn,
+                                                                manager=self.manager,
+                                                                resID=resID,
+                                                                logger=self.logger
+                                                                )
+
+    def getResource(self, resID):
         """
         Attempt to open a VISA instrument. If successful, a VISA resource is added to the list of known resources and
         the object is returned.
@@ -127,23 +110,26 @@ class i_VISA(labtronyx.InterfaceBase):
         :raises:        labtronyx.ResourceUnavailable
         :raises:        labtronyx.InterfaceError
         """
-        # Instantiate the resource object
-        res_obj = self.manager.plugin_manager.createPluginInstance(r_VISA.fqn,
-                                                                   manager=self.manager,
-                                                                   resID=resID,
-                                                                   logger=self.logger
-                                                                   )
+        res_obj = self.createResource(resID)
 
-        # Signal new resource event
-        self.manager._publishEvent(labtronyx.EventCodes.resource.created, res_obj.uuid)
+        self._addResource(res_obj)
 
         return res_obj
 
-    def getResource(self, resID):
-        return self.openResource(resID)
+    def openResource(self, resID):
+        """
+        Attempt to open a VISA instrument.
+
+        :deprecated:    Deprecated by :func:`getResource`
+
+        :return:        object
+        :raises:        labtronyx.ResourceUnavailable
+        :raises:        labtronyx.InterfaceError
+        """
+        return self.getResource(resID)
 
 
-class r_VISA(labtronyx.ResourceBase):
+class r_VISA(SCPIResourceMixin, labtronyx.ResourceBase):
     """
     VISA Resource Base class.
     
@@ -186,6 +172,8 @@ class r_VISA(labtronyx.ResourceBase):
 
         super(r_VISA, self).__init__(manager, resID, **kwargs)
 
+        self._initSCPI()
+
         # Ensure dependency was resolved correctly
         if not isinstance(self.interface, i_VISA):
             raise labtronyx.InterfaceError("VISA Interface is not enabled")
@@ -201,20 +189,20 @@ class r_VISA(labtronyx.ResourceBase):
             self.logger.debug("Created VISA resource: %s", resID)
 
             # Instance variables
-            self._identity = []
             self._conf = { # Default configuration
                           'read_termination': '\r',
                           'write_termination': '\r\n',
                           'timeout': 2000
                           }
+            self._applied = {} # Configuration applied to the open session
+            self._session_profile = None # Configuration of a newly opened session
             self._resourceType = self.RES_TYPES.get(self.instrument.interface_type, 'VISA')
+            self._srq_events = None # Service request events are supported by the session
+            self._srq_delivered = False # A service request event has been received in this session
 
             # Instrument is created in the open state, but we do not want to lock the VISA instrument
             self.close()
 
-            # Set a flag to initialize the resource when it is used
-            self.ready = False
-
         # except AttributeError:
         #     raise labtronyx.ResourceUnavailable('Invalid VISA Resource Identifier: %s' % resID)
 
@@ -244,112 +232,113 @@ class r_VISA(labtronyx.ResourceBase):
         })
 
         # Set some default search parameters if driver has not already defined
-        def_prop.setdefault('deviceVendor', self._VISA_vendor)
-        def_prop.setdefault('deviceModel', self._VISA_model)
-        def_prop.setdefault('deviceSerial', self._VISA_serial)
-        def_prop.setdefault('deviceFirmware', self._VISA_firmware)
-
-        return def_prop
+        return self._setIdentityProperties(def_prop)
 
     #===========================================================================
     # VISA Specific
     #===========================================================================
 
-    def identify(self):
-        """
-        Query the resource to find out what instrument it is. Uses the standard SCPI query string `*IDN?`. Will attempt
-        to load a driver using the information returned.
-        """
-        start_state = self.isOpen()
-        if not start_state:
-            self.open()
+    def _waitSRQ(self, timeout):
+        # Many sessions accept service request events but never deliver them, so events are only waited on once one
+        # has been received. Until then the status byte is polled
+        try:
+            if self._enableSRQEvents() and self._srq_delivered:
+                stb = self._waitSRQEvent(timeout)
 
-        self.logger.debug("Identifying VISA Resource: %s", self.resID)
+                if stb is None:
+                    # The request may have occurred without an event
+                    stb = self._pollSRQ()
 
-        # Reset identity data
-        self._identity = []
-        self._VISA_vendor = ''
-        self._VISA_model = ''
-        self._VISA_firmware = ''
-        self._VISA_serial = ''
+                    if stb is not None:
+                        self.logger.debug("Service request event was not delivered, polling the status byte")
+                        self._srq_delivered = False
 
-        try:
-            # Set the timeout really low
-            start_timeout = self.instrument.timeout
-            self.instrument.timeout = 250
-            #self.instrument.
+                return stb
 
-            scpi_ident = self.query("*IDN?")
-            self._identity = scpi_ident.strip().split(',')
+            stb = SCPIResourceMixin._waitSRQ(self, timeout)
 
-            # Set the timeout back to what it was
-            self.instrument.timeout = start_timeout
+            if stb is not None and self._srq_events:
+                self._srq_delivered = self._pendingSRQEvent()
 
-            if len(self._identity) >= 4:
-                self._VISA_vendor = self._identity[0].strip()
-                self._VISA_model = self._identity[1].strip()
-                self._VISA_serial = self._identity[2].strip()
-                self._VISA_firmware = self._identity[3].strip()
+            return stb
 
-                self.logger.debug("Identified VISA Resource: %s", self.resID)
-                self.logger.debug("Vendor: %s", self._VISA_vendor)
-                self.logger.debug("Model:  %s", self._VISA_model)
-                self.logger.debug("Serial: %s", self._VISA_serial)
-                self.logger.debug("F/W:    %s", self._VISA_firmware)
+        except visa.InvalidSession:
+            raise labtronyx.ResourceNotOpen()
 
+        except visa.VisaIOError as e:
+            if e.abbreviation in ["VI_ERROR_TMO"]:
+                raise labtronyx.InterfaceTimeout(e.description)
             else:
-                self.logger.debug("VISA Resource responded to identify in non-standard way: %s", scpi_ident)
+                raise labtronyx.InterfaceError(e.description)
 
-        except labtronyx.InterfaceTimeout:
-            self.logger.debug("Resource did not respond to Identify: %s", self.resID)
+    def _readStatusByte(self):
+        return self.instrument.read_stb()
 
-        # Attempt to find a suitable driver if one is not already loaded
-        if self._driver is None:
-            self.loadDriver()
+    def _useServiceRequests(self):
+        return self._srq_delivered
 
-        if start_state == False:
-            self.close()
+    def _pendingSRQEvent(self):
+        # Check for a queued service request event without waiting
+        response = self.instrument.wait_on_event(pyvisa.constants.VI_EVENT_SERVICE_REQ, 0, capture_timeout=True)
 
-        self.ready = True
+        return not response.timed_out
 
-    def getIdentity(self, section=None):
-        """
-        Get the comma-delimited identity string returned from `*IDN?` command on resource enumeration
+    def _enableSRQEvents(self):
+        # Enable queueing of service request events the first time they are needed in a session. Returns False if the
+        # session does not support them
+        if self._srq_events is None:
+            try:
+                self.instrument.enable_event(pyvisa.constants.VI_EVENT_SERVICE_REQ, pyvisa.constants.VI_QUEUE)
+                self._srq_events = True
 
-        :param section: Section of comma-split identity
-        :type section:  int
-        :rtype:         str
-        """
-        if not self.ready:
-            self.identify()
+            except (visa.VisaIOError, NotImplementedError, AttributeError):
+                self._srq_events = False
 
-        if section is None:
-            return self._identity
-        elif len(self._identity) > section:
-            return self._identity[section]
-        else:
-            return ''
+        if self._srq_events:
+            self.instrument.discard_events(pyvisa.constants.VI_EVENT_SERVICE_REQ, pyvisa.constants.VI_QUEUE)
 
-    def getStatusByte(self):
-        """
-        Read the Status Byte Register (STB). Interpretation of the status byte varies by instrument
+        return self._srq_events
 
-        :return:
-        """
-        return self.query('*STB?')
+    def _waitSRQEvent(self, timeout):
+        # Wait for a service request event from this instrument. Returns the status byte, or None on timeout
+        deadline = monotonic() + timeout if timeout is not None else None
 
-    def trigger(self):
-        """
-        Trigger the instrument using the common trigger command `*TRG`. Behavior varies by instrument
-        """
-        self.write('*TRG')
+        while True:
+            if deadline is None:
+                remaining = pyvisa.constants.VI_TMO_INFINITE
+            else:
+                remaining = int(max(deadline - monotonic(), 0) * 1000)
 
-    def reset(self):
+            response = self.instrument.wait_on_event(pyvisa.constants.VI_EVENT_SERVICE_REQ, remaining,
+                                                     capture_timeout=True)
+            if response.timed_out:
+                return None
+
+            # Another device on the bus may have requested service
+            stb = self.instrument.read_stb()
+            if stb & self.STB_RQS:
+                return stb
+
+    def clear(self):
         """
-        Reset the instrument. Behavior varies by instrument, typically this will reset the instrument to factory
-        default settings.
+        Send a device clear to the instrument. Pending commands waiting to be coalesced are discarded, and the
+        instrument abandons any response it is sending. Use after a timeout part way through a response, so that the
+        next query does not receive the rest of the old response.
+
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceError
         """
-        self.write('*RST')
+        with self._io_lock:
+            self._coalesce_buffer = []
+
+            try:
+                self.instrument.clear()
+
+            except visa.InvalidSession:
+                raise labtronyx.ResourceNotOpen()
+
+            except visa.VisaIOError as e:
+                raise labtronyx.InterfaceError(e.description)
 
     # ===========================================================================
     # Serial Specific
@@ -393,6 +382,12 @@ class r_VISA(labtronyx.ResourceBase):
         try:
             self.instrument.open()
 
+            # A new session starts with the configuration in the session profile
+            if self._session_profile is None:
+                self._session_profile = self._readSessionProfile()
+
+            self._applied = dict(self._session_profile)
+
             # Restore instrument context
             self.configure()
 
@@ -426,9 +421,19 @@ class r_VISA(labtronyx.ResourceBase):
             labtronyx.ResourceBase.close(self)
 
             try:
+                # Send any commands still waiting to be coalesced
+                self.flush()
+
                 # Close the instrument
+                self._applied = {}
+                self._srq_events = None
+                self._srq_delivered = False
                 self.instrument.close()
 
+            except labtronyx.InterfaceError:
+                self.logger.exception('VISA resource error while sending coalesced commands')
+                return False
+
             except visa.VisaIOError as e:
                 self.logger.exception('VISA resource error on close: %s', e.abbreviation)
                 return False
@@ -454,14 +459,18 @@ class r_VISA(labtronyx.ResourceBase):
 
         All VISA Resources
 
-        :param timeout:             Command timeout
-        :type timeout:              float
+        :param timeout:             Command timeout (in milliseconds). Floats are assumed to be in seconds
+        :type timeout:              int
         :param write_termination:   Write termination
         :type write_termination:    str
         :param read_termination:    Read termination
         :type read_termination:     str
         :param query_delay:         Delay between write and read commands in a query
         :type query_delay:          int
+        :param coalesce_writes:     Coalesce consecutive writes until the next read or query
+        :type coalesce_writes:      bool
+        :param coalesce_limit:      Maximum size (in bytes) of a coalesced transfer
+        :type coalesce_limit:       int
 
         Serial Resources
 
@@ -496,7 +505,7 @@ class r_VISA(labtronyx.ResourceBase):
             timeout = kwargs.get('timeout')
             if type(timeout) == float:
                 # assume this is seconds
-                timeout = int(timeout * 100)
+                timeout = int(timeout * 1000)
                 kwargs['timeout'] = timeout
 
         if 'parity' in kwargs:
@@ -518,16 +527,73 @@ class r_VISA(labtronyx.ResourceBase):
         if 'stopbits' in kwargs:
             kwargs['stopbits'] = int(kwargs.get('stopbits'))
 
+        # Write coalescing is handled by the resource, not the VISA library
+        self._configureCoalescing(kwargs)
+
         # Save any new configuration keys
         self._conf.update(kwargs)
 
         # If resource is open, apply configuration
         if self.isOpen():
-            for key, value in self._conf.items():
-                if hasattr(self.instrument, key):
-                    setattr(self.instrument, key, value)
-                else:
-                    self._conf.pop(key)
+            self._applyConfiguration()
+
+    def _applyConfiguration(self):
+        # Only set attributes that differ from what has already been applied to the session, each attribute set is a
+        # call into the VISA library
+        for key, value in self._conf.items():
+            if key in self._applied and self._applied[key] == value:
+                continue
+
+            if hasattr(type(self.instrument), key):
+                setattr(self.instrument, key, value)
+                self._applied[key] = value
+
+            else:
+                self._conf.pop(key)
+
+    def _applyTimeout(self, timeout=None):
+        # Set the session timeout (in seconds) for a single transfer, or restore the configured timeout if None. The
+        # session is only updated if the timeout differs from the timeout already applied
+        if timeout is None:
+            value = self._conf.get('timeout')
+        else:
+            value = int(timeout * 1000)
+
+        if self._applied.get('timeout') != value:
+            self.instrument.timeout = value
+            self._applied['timeout'] = value
+
+    def _readSessionProfile(self):
+        # Read the configured attributes from a newly opened session
+        profile = {}
+
+        for key in self._conf:
+            if hasattr(type(self.instrument), key):
+                try:
+                    profile[key] = getattr(self.instrument, key)
+                except (visa.VisaIOError, AttributeError):
+                    pass
+
+        return profile
+
+    def getSessionProfile(self):
+        """
+        Get the configuration of a newly opened session. The profile is read once, when the resource is first opened.
+        Each time the resource is opened, only configuration that differs from the profile is applied to the session.
+
+        :return: dict
+        """
+        return dict(self._session_profile or {})
+
+    def setSessionProfile(self, profile):
+        """
+        Set the configuration of a newly opened session. Can be used to share a profile read from another resource of
+        the same type, so that the profile is not read from this resource.
+
+        :param profile:     Session configuration
+        :type profile:      dict
+        """
+        self._session_profile = dict(profile)
 
     def getConfiguration(self):
         """
@@ -535,7 +601,7 @@ class r_VISA(labtronyx.ResourceBase):
 
         :return: dict
         """
-        ret = {}
+        ret = self._getCoalescingConfiguration()
 
         for key in self.CONFIG_KEYS:
             if hasattr(self.instrument, key):
@@ -547,26 +613,18 @@ class r_VISA(labtronyx.ResourceBase):
     # Data Transmission
     # ===========================================================================
 
-    def write(self, data):
-        """
-        Send ASCII-encoded data to the instrument. Termination character is appended automatically, according to
-        `write_termination` property.
-        
-        :param data:        Data to send
-        :type data:         str
-        :raises:            labtronyx.ResourceNotOpen
-        :raises:            labtronyx.InterfaceError
-        """
-        try:
-            self.instrument.write(data)
+    def _write(self, data):
+        with self._traceTransfer('write', data):
+            try:
+                self.instrument.write(data)
 
-            self.logger.debug("VISA Write: %s", data)
+                self.logger.debug("VISA Write: %s", data)
 
-        except visa.InvalidSession:
-            raise labtronyx.ResourceNotOpen()
+            except visa.InvalidSession:
+                raise labtronyx.ResourceNotOpen()
 
-        except visa.VisaIOError as e:
-            raise labtronyx.InterfaceError(e.description)
+            except visa.VisaIOError as e:
+                raise labtronyx.InterfaceError(e.description)
 
     def write_raw(self, data):
         """
@@ -577,18 +635,42 @@ class r_VISA(labtronyx.ResourceBase):
         :raises:            labtronyx.ResourceNotOpen
         :raises:            labtronyx.InterfaceError
         """
-        try:
-            self.instrument.write_raw(data)
+        with self._io_lock:
+            self._sessionUse()
 
-            self.logger.debug("VISA Write: %s", data)
+            self.flush()
 
-        except visa.InvalidSession:
-            raise labtronyx.ResourceNotOpen()
+            self._last_command = None
 
-        except visa.VisaIOError as e:
-            raise labtronyx.InterfaceError(e.description)
+            with self._traceTransfer('write', data):
+                try:
+                    self.instrument.write_raw(data)
+
+                    self.logger.debug("VISA Write: %s", data)
 
-    def read(self, termination=None, encoding=None):
+                except visa.InvalidSession:
+                    raise labtronyx.ResourceNotOpen()
+
+                except visa.VisaIOError as e:
+                    raise labtronyx.InterfaceError(e.description)
+
+    def write_block(self, command, data, dtype='B'):
+        """
+        Send a command with binary data as an IEEE 488.2 definite length arbitrary block. Termination character is
+        appended automatically.
+
+        :param command:     Command header
+        :type command:      str
+        :param data:        Data to send
+        :type data:         numpy.ndarray or list
+        :param dtype:       numpy data type of the block payload, including byte order (e.g. '>f8')
+        :type dtype:        str
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceError
+        """
+        self.write_raw('%s %s%s' % (command, ieee488.encode_block(data, dtype), self.instrument.write_termination))
+
+    def read(self, termination=None, encoding=None, timeout=None):
         """
         Read ASCII-formatted data from the instrument.
         
@@ -599,68 +681,160 @@ class r_VISA(labtronyx.ResourceBase):
         :type termination:  str
         :param encoding:    Encoding
         :type encoding:     str
+        :param timeout:     Timeout (in seconds) for this read. Defaults to the adaptive or configured timeout
+        :type timeout:      float
         :return:            str
         :raises:            labtronyx.ResourceNotOpen
         :raises:            labtronyx.InterfaceTimeout
         :raises:            labtronyx.InterfaceError
         """
-        try:
-            data = self.instrument.read(termination, encoding)
+        with self._io_lock:
+            self._sessionUse()
 
-            self.logger.debug("VISA Read: %s", data)
+            self.flush()
 
-            return data
+            with self._latencyTimer(timeout=timeout) as timer, self._traceTransfer('read') as trace:
+                try:
+                    self._applyTimeout(timer.timeout)
 
-        except visa.InvalidSession:
-            raise labtronyx.ResourceNotOpen()
+                    data = self.instrument.read(termination, encoding)
+                    trace.received(data)
 
-        except visa.VisaIOError as e:
-            if e.abbreviation in ["VI_ERROR_TMO"]:
-                raise labtronyx.InterfaceTimeout(e.description)
-            else:
-                raise labtronyx.InterfaceError(e.description)
+                    self.logger.debug("VISA Read: %s", data)
+
+                    return data
 
-    def read_raw(self, size=None):
+                except visa.InvalidSession:
+                    raise labtronyx.ResourceNotOpen()
+
+                except visa.VisaIOError as e:
+                    if e.abbreviation in ["VI_ERROR_TMO"]:
+                        raise labtronyx.InterfaceTimeout(e.description)
+                    else:
+                        raise labtronyx.InterfaceError(e.description)
+
+    def read_raw(self, size=None, timeout=None):
         """
         Read Binary-encoded data directly from the instrument.
         
         :param size:        Number of bytes to read
         :type size:         int
+        :param timeout:     Timeout (in seconds) for this read. Defaults to the adaptive or configured timeout
+        :type timeout:      float
         :raises:            labtronyx.ResourceNotOpen
         :raises:            labtronyx.InterfaceTimeout
         :raises:            labtronyx.InterfaceError
         """
-        ret = bytes()
+        with self._io_lock:
+            self._sessionUse()
 
-        try:
-            if type(self.instrument) == pyvisa.resources.serial.SerialInstrument:
-                # There is a bug in PyVISA that forces a low-level call (hgrecco/pyvisa #93)
-                with self.instrument.ignore_warning(pyvisa.constants.VI_SUCCESS_MAX_CNT):
-                    if size is None:
-                        num_bytes = self.instrument.bytes_in_buffer
-                        chunk, status = self.instrument.visalib.read(self.instrument.session, num_bytes)
-                        ret += chunk
+            self.flush()
+
+            ret = bytes()
+
+            with self._latencyTimer(timeout=timeout) as timer, self._traceTransfer('read') as trace:
+                try:
+                    self._applyTimeout(timer.timeout)
+
+                    if type(self.instrument) == pyvisa.resources.serial.SerialInstrument:
+                        # There is a bug in PyVISA that forces a low-level call (hgrecco/pyvisa #93)
+                        with self.instrument.ignore_warning(pyvisa.constants.VI_SUCCESS_MAX_CNT):
+                            if size is None:
+                                num_bytes = self.instrument.bytes_in_buffer
+                                chunk, status = self.instrument.visalib.read(self.instrument.session, num_bytes)
+                                ret += chunk
+
+                            else:
+                                while len(ret) < size:
+                                    chunk, status = self.instrument.visalib.read(self.instrument.session,
+                                                                                 size - len(ret))
+                                    ret += chunk
 
                     else:
-                        while len(ret) < size:
-                            chunk, status = self.instrument.visalib.read(self.instrument.session, size - len(ret))
-                            ret += chunk
+                        ret = self.instrument.read_raw()
 
-                return ret
+                    trace.received(ret)
 
-            else:
-                return self.instrument.read_raw()
+                    return ret
 
-        except visa.InvalidSession:
-            raise labtronyx.ResourceNotOpen
+                except visa.InvalidSession:
+                    raise labtronyx.ResourceNotOpen
 
-        except visa.VisaIOError as e:
-            if e.abbreviation in ["VI_ERROR_TMO"]:
-                raise labtronyx.InterfaceTimeout(e.description)
-            else:
-                raise labtronyx.InterfaceError(e.description)
+                except visa.VisaIOError as e:
+                    if e.abbreviation in ["VI_ERROR_TMO"]:
+                        raise labtronyx.InterfaceTimeout(e.description)
+                    else:
+                        raise labtronyx.InterfaceError(e.description)
+
+    def read_block(self, dtype='B', into=None, timeout=None):
+        """
+        Read an IEEE 488.2 definite length arbitrary block from the instrument. The payload is read in large chunks
+        directly into a single buffer and returned as a numpy array view, the message terminator is discarded.
+
+        Returns a numpy array, so this method is only usable locally.
+
+        :param dtype:       numpy data type of the block payload, including byte order (e.g. '>i2')
+        :type dtype:        str
+        :param into:        Preallocated buffer to read the payload into
+        :type into:         bytearray, memoryview or numpy.ndarray
+        :param timeout:     Timeout (in seconds) for each chunk. Defaults to the adaptive or configured timeout
+        :type timeout:      float
+        :rtype:             numpy.ndarray
+        :raises:            labtronyx.ResourceNotOpen
+        :raises:            labtronyx.InterfaceTimeout
+        :raises:            labtronyx.InterfaceError
+        :raises:            labtronyx.InvalidResponse
+        """
+        with self._io_lock:
+            self._sessionUse()
+
+            self.flush()
+
+            last_status = [None]
+
+            def read_chunk(size):
+                chunk, last_status[0] = self.instrument.visalib.read(self.instrument.session, size)
+                return chunk
+
+            with self._latencyTimer(timeout=timeout) as timer, self._traceTransfer('read') as trace:
+                try:
+                    self._applyTimeout(timer.timeout)
+
+                    # Termination characters may appear anywhere in binary data, so they are disabled while the
+                    # payload is read and reads continue until the count is satisfied
+                    termchar_en = self.instrument.get_visa_attribute(pyvisa.constants.VI_ATTR_TERMCHAR_EN)
+
+                    with self.instrument.ignore_warning(pyvisa.constants.VI_SUCCESS_MAX_CNT,
+                                                        pyvisa.constants.VI_SUCCESS_TERM_CHAR):
+                        self.instrument.set_visa_attribute(pyvisa.constants.VI_ATTR_TERMCHAR_EN,
+                                                           pyvisa.constants.VI_FALSE)
+                        try:
+                            data = ieee488.read_block(read_chunk, dtype, into)
+
+                        finally:
+                            self.instrument.set_visa_attribute(pyvisa.constants.VI_ATTR_TERMCHAR_EN, termchar_en)
+
+                        # Discard the message terminator unless the device signaled END with the last payload byte
+                        term = self.instrument.read_termination or ''
+                        if last_status[0] != pyvisa.constants.StatusCode.success and len(term) > 0:
+                            read_chunk(len(term))
+
+                    trace.received(data, data.nbytes)
+
+                    self.logger.debug("VISA Read Block: %d bytes", data.nbytes)
+
+                    return data
+
+                except visa.InvalidSession:
+                    raise labtronyx.ResourceNotOpen
+
+                except visa.VisaIOError as e:
+                    if e.abbreviation in ["VI_ERROR_TMO"]:
+                        raise labtronyx.InterfaceTimeout(e.description)
+                    else:
+                        raise labtronyx.InterfaceError(e.description)
 
-    def query(self, data, delay=None):
+    def query(self, data, delay=None, timeout=None):
         """
         Retrieve ASCII-encoded data from the device given a prompt.
         
@@ -670,71 +844,36 @@ class r_VISA(labtronyx.ResourceBase):
         :type data:         str
         :param delay:       delay (in seconds) between write and read operations.
         :type delay:        float
+        :param timeout:     Timeout (in seconds) for the response. Defaults to the adaptive or configured timeout
+        :type timeout:      float
         :returns:           str
         :raises:            labtronyx.ResourceNotOpen
         :raises:            labtronyx.InterfaceTimeout
         :raises:            labtronyx.InterfaceError
         """
-        try:
-            ret_data = self.instrument.query(data)
+        with self._io_lock:
+            self._sessionUse()
 
-            self.logger.debug("VISA Query: %s returned: %s", data, ret_data)
+            data = self._joinPending(data)
 
-            return ret_data
-
-        except visa.InvalidSession:
-            raise labtronyx.ResourceNotOpen
-
-        except visa.VisaIOError as e:
-            if e.abbreviation in ["VI_ERROR_TMO"]:
-                raise labtronyx.InterfaceTimeout(e.description)
-            else:
-                raise labtronyx.InterfaceError(e.description)
-
-    # ===========================================================================
-    # Drivers
-    # ===========================================================================
+            self._last_command = data
 
-    def loadDriver(self, driverName=None, force=False):
-        """
-        Load a Driver.
-
-        VISA supports enumeration and will thus search for a compatible driver. A `driverName` can be specified to load
-        a specific driver, even if it may not be compatible with this resource. If more than one compatible driver is
-        found, no driver will be loaded.
-        
-        On startup, the resource will attempt to load a valid driver automatically. This function only needs to be
-        called to override the default driver. :func:`unloadDriver` must be called before loading a new driver for a
-        resource.
-
-        :param driverName:      Driver name to load
-        :type driverName:       str
-        :returns:               True if successful, False otherwise
-        """
-        if driverName is None:
-            self.logger.debug("Searching for suitable drivers")
+            with self._latencyTimer(data, timeout) as timer, self._traceTransfer('query', data) as trace:
+                try:
+                    self._applyTimeout(timer.timeout)
 
-            # Search for a compatible model
-            driverClasses = self.manager.plugin_manager.getPluginsByType('driver')
-            validDrivers = []
+                    ret_data = self.instrument.query(data, delay)
+                    trace.received(ret_data)
 
-            # Iterate through all driver classes to find compatible driver
-            for driver_fqn, driverCls in driverClasses.items():
-                try:
-                    if driverCls.VISA_validResource(self._identity):
-                        validDrivers.append(driver_fqn)
-                        self.logger.debug("Found match: %s", driver_fqn)
-                except:
-                    pass
+                    self.logger.debug("VISA Query: %s returned: %s", data, ret_data)
 
-            # Only auto-load a model if a single model was found
-            if len(validDrivers) == 1:
-                labtronyx.ResourceBase.loadDriver(self, validDrivers[0], force)
-                return True
+                    return ret_data
 
-            else:
-                self.logger.debug("Unable to load driver, more than one match found")
-                return False
+                except visa.InvalidSession:
+                    raise labtronyx.ResourceNotOpen
 
-        else:
-            return labtronyx.ResourceBase.loadDriver(self, driverName, force)
\ No newline at end of file
+                except visa.VisaIOError as e:
+                    if e.abbreviation in ["VI_ERROR_TMO"]:
+                        raise labtronyx.InterfaceTimeout(e.description)
+                    else:
+                        raise labtronyx.InterfaceError(e.description)
@@ -7,6 +7,22 @@ import labtronyx
 from labtronyx.bases import ResourceBase, DriverBase, InterfaceBase
 
 
+def make_resource(responses=None, default='0'):
+    # Mock resource that answers queries from `responses`. Callable values are called for each query, and updates to
+    # the dict are seen by later queries
+    if responses is None:
+        responses = {}
+
+    def query(cmd, **kwargs):
+        resp = responses.get(cmd, default)
+        return resp() if callable(resp) else resp
+
+    res = mock.MagicMock()
+    res.query.side_effect = query
+
+    return res
+
+
 def test_drivers():
     manager = labtronyx.InstrumentManager()
 
@@ -60,4 +76,563 @@ def test_driver_integration():
     assert_false(driver.close.called)
 
     res.unloadDriver()
-    assert_true(driver.close.called)
\ No newline at end of file
+    assert_true(driver.close.called)
+
+
+def test_tektronix_waveform():
+    import numpy
+    from labtronyx.drivers.Tektronix.Oscilloscope import d_2XXX
+
+    responses = {
+        'HEADER 1;:VERBOSE 1;:SELECT?;:HEADER 0': ':SELECT:CH1 1;CH2 0;CH3 0;CH4 0;MATH 0;REF1 0;REF2 0',
+        'HEADER 1;:VERBOSE 1;:WFMOUTPRE?;:WFMOUTPRE:RECORDLENGTH?;:HEADER 0':
+            ':WFMOUTPRE:BYT_NR 2;BIT_NR 16;ENCDG BINARY;BN_FMT RI;BYT_OR MSB;WFID "Ch1, DC coupling; 1.0V/div";'
+            'NR_PT 4;XUNIT "s";XINCR 1.0E-3;XZERO -1.0E-3;PT_OFF 0;YUNIT "V";YMULT 0.5;YOFF -2.0;YZERO 1.0;'
+            ':WFMOUTPRE:RECORDLENGTH 4'
+    }
+
+    res = make_resource(responses)
+    res.read_block.return_value = numpy.array([-2, -1, 0, 300], dtype='>i2')
+
+    driver = d_2XXX(res)
+    data = driver.getWaveform(dtype='float32')
+
+    # Signed, big-endian data points
+    res.read_block.assert_called_with('>i2')
+    assert_true(mock.call('DATA:ENC RIB') in res.write.call_args_list)
+
+    assert_equal(data['Time'].tolist(), [-1.0e-3, 0.0, 1.0e-3, 2.0e-3])
+    assert_equal(data['CH1'].dtype, numpy.float32)
+    assert_equal(data['CH1'].tolist(), [1.0, 1.5, 2.0, 152.0])
+
+    # Waveforms missing from the SELECT? response are queried individually
+    assert_true(mock.call('SELECT:MATH1?') in res.query.call_args_list)
+
+    # The preamble is read for each capture, the enabled waveforms are cached until the cache is invalidated
+    res.query.reset_mock()
+    driver.getWaveform()
+    assert_equal([c[0][0] for c in res.query.call_args_list if 'WFMOUTPRE' in c[0][0] or 'SELECT' in c[0][0]],
+                 ['HEADER 1;:VERBOSE 1;:WFMOUTPRE?;:WFMOUTPRE:RECORDLENGTH?;:HEADER 0'])
+
+    driver.invalidateCache()
+    driver.getWaveform()
+    assert_true(mock.call('HEADER 1;:VERBOSE 1;:SELECT?;:HEADER 0') in res.query.call_args_list)
+
+    # Headers are turned off if a query with headers fails
+    res.query.side_effect = labtronyx.InterfaceTimeout()
+    res.write.reset_mock()
+    assert_raises(labtronyx.InterfaceTimeout, driver._getPreamble, 'CH1')
+    res.write.assert_called_with('HEADER 0')
+
+
+def test_tektronix_waveform_windows():
+    import numpy
+    from labtronyx.drivers.Tektronix.Oscilloscope import d_5XXX7XXX
+
+    responses = {
+        'HEADER 1;:VERBOSE 1;:WFMOUTPRE?;:HEADER 0':
+            ':WFMOUTPRE:BYT_NR 1;YUNIT "V";YMULT 2.0;YOFF 1.0;YZERO 0.0'
+    }
+    record = numpy.arange(10, dtype='>i1')
+    window = {}
+
+    def write(cmd):
+        if cmd.startswith('DATA:START'):
+            window['start'] = int(cmd.split()[1]) - 1
+        elif cmd.startswith('DATA:STOP'):
+            window['stop'] = int(cmd.split()[1])
+
+    # Third window times out once
+    failures = [4]
+
+    def read_block(dtype):
+        if window['start'] in failures:
+            failures.remove(window['start'])
+            raise labtronyx.InterfaceTimeout()
+        return record[window['start']:window['stop']]
+
+    res = make_resource(responses)
+    res.write.side_effect = write
+    res.read_block.side_effect = read_block
+
+    driver = d_5XXX7XXX(res)
+    chunks = list(driver.iterWaveform('CH1', samples=10, chunk_size=4))
+
+    assert_equal([offset for offset, chunk in chunks], [0, 4, 8])
+    assert_equal(numpy.concatenate([chunk for offset, chunk in chunks]).tolist(), ((record - 1.0) * 2.0).tolist())
+    assert_equal(res.clear.call_count, 1)
+
+    # Resume part way through the record
+    chunks = list(driver.iterWaveform('CH1', samples=10, chunk_size=4, offset=6))
+    assert_equal([offset for offset, chunk in chunks], [6])
+    assert_equal(chunks[0][1].tolist(), [10.0, 12.0, 14.0, 16.0])
+
+
+def test_tektronix_export():
+    import os
+    import shutil
+    import tempfile
+    import numpy
+    from labtronyx.common.waveform import load_waveform
+    from labtronyx.drivers.Tektronix.Oscilloscope import d_5XXX7XXX
+
+    responses = {
+        'HEADER 1;:VERBOSE 1;:SELECT?;:HEADER 0':
+            ':SELECT:CH1 1;CH2 1;CH3 0;CH4 0;MATH1 0;MATH2 0;MATH3 0;MATH4 0;REF1 0;REF2 0;REF3 0;REF4 0;CONTROL CH1',
+        'HOR:MODE:SCALE?;:HOR:MODE:SAMPLERATE?': '1.0;0.5',
+        'HEADER 1;:VERBOSE 1;:WFMOUTPRE?;:HEADER 0':
+            ':WFMOUTPRE:BYT_NR 2;XINCR 0.1;PT_OFF 1;YUNIT "V";YMULT 0.5;YOFF 0.0;YZERO 0.0'
+    }
+    record = {'CH1': numpy.arange(5, dtype='>i2'), 'CH2': numpy.arange(5, 10, dtype='>i2')}
+    window = {}
+
+    def write(cmd):
+        key, _, value = cmd.partition(' ')
+        window[key] = value
+
+    def read_block(dtype):
+        return record[window['DATA:SOURCE']][int(window['DATA:START']) - 1:int(window['DATA:STOP'])]
+
+    res = make_resource(responses)
+    res.write.side_effect = write
+    res.read_block.side_effect = read_block
+
+    driver = d_5XXX7XXX(res)
+    driver.waitUntilReady = mock.MagicMock(return_value=True)
+
+    time_axis = [-0.1, 0.0, 0.1, 0.2, 0.3]
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        for fmt in ['csv', 'npy', 'npz', 'bin']:
+            filename = os.path.join(tempdir, 'capture')
+            assert_true(driver.exportWaveform(Filename=filename, Format=fmt, ChunkSize=2))
+            filename += '.' + fmt
+
+            if fmt == 'csv':
+                data = numpy.loadtxt(filename, delimiter=',', skiprows=1)
+                assert_equal(data.shape, (5, 3))
+                assert_true(numpy.allclose(data[:, 0], time_axis))
+                assert_equal(data[:, 2].tolist(), (record['CH2'] * 0.5).tolist())
+
+            elif fmt == 'npy':
+                data = numpy.load(filename)
+                assert_true(numpy.allclose(data[0], time_axis))
+                assert_equal(data[1].tolist(), (record['CH1'] * 0.5).tolist())
+
+            elif fmt == 'npz':
+                data = numpy.load(filename)
+                assert_equal(data['CH2'].tolist(), (record['CH2'] * 0.5).tolist())
+                assert_equal(data['channels'].tolist(), ['CH1', 'CH2'])
+                assert_equal(float(data['dt']), 0.1)
+                data.close()
+
+            else:
+                data = load_waveform(filename)
+                assert_equal(data['channels'][0].units, 'V')
+                assert_equal(data['channels'][0].dtype, numpy.dtype('>i2'))
+                assert_equal(data['CH1'].tolist(), (record['CH1'] * 0.5).tolist())
+                assert_true(abs(data['t0'] + 0.1) < 1e-12)
+
+    finally:
+        shutil.rmtree(tempdir)
+
+    # Enabled waveforms and preambles are only queried once, until the setup changes
+    assert_equal(res.query.call_count, 4)
+
+    driver.setVerticalSetup(Waveform='CH1', Scale=1.0)
+    driver.getEnabledWaveforms()
+    assert_equal(res.query.call_count, 5)
+
+
+def test_tektronix_single_acquisition():
+    import numpy
+    from labtronyx.drivers.Tektronix.Oscilloscope import d_5XXX7XXX
+
+    responses = {
+        'HEADER 1;:VERBOSE 1;:SELECT?;:HEADER 0': ':SELECT:CH1 1;CH2 0;CH3 0;CH4 0;MATH1 0;MATH2 0;MATH3 0;MATH4 0;'
+                                                  'REF1 0;REF2 0;REF3 0;REF4 0',
+        'HOR:MODE:SCALE?;:HOR:MODE:SAMPLERATE?': '0.4;1.0',
+        'HEADER 1;:VERBOSE 1;:WFMOUTPRE?;:HEADER 0':
+            ':WFMOUTPRE:BYT_NR 1;XINCR 1.0;PT_OFF 0;YUNIT "V";YMULT 1.0;YOFF 0.0;YZERO 0.0'
+    }
+
+    res = make_resource(responses)
+    res.read_block.return_value = numpy.arange(4, dtype='>i1')
+
+    driver = d_5XXX7XXX(res)
+    driver.waitUntilReady = mock.MagicMock(return_value=True)
+
+    for capture in range(2):
+        driver.singleAcquisition()
+        data = driver.getWaveform()
+        assert_equal(data['CH1'].tolist(), [0.0, 1.0, 2.0, 3.0])
+
+    # Arming a single acquisition does not change the record, the second capture only transfers the waveform
+    assert_equal(sorted(c[0][0] for c in res.query.call_args_list), sorted(responses.keys()))
+
+    # Changing the acquisition mode does
+    driver.setAcquisitionSetup(Mode='Average')
+    driver.getWaveform()
+    assert_equal(res.query.call_count, 6)
+
+
+def test_tektronix_fastframe():
+    import numpy
+    from labtronyx.drivers.Tektronix.Oscilloscope import d_5XXX7XXX
+
+    responses = {
+        'HEADER 1;:VERBOSE 1;:SELECT?;:HEADER 0': ':SELECT:CH1 1;CH2 0;CH3 0;CH4 0;MATH1 0;MATH2 0;MATH3 0;MATH4 0;'
+                                                  'REF1 0;REF2 0;REF3 0;REF4 0',
+        'HOR:FASTFRAME:COUNT?': '3',
+        'HOR:MODE:SCALE?;:HOR:MODE:SAMPLERATE?': '0.4;1.0',
+        'HEADER 1;:VERBOSE 1;:WFMOUTPRE?;:HEADER 0':
+            ':WFMOUTPRE:BYT_NR 1;XINCR 1.0;PT_OFF 1;YUNIT "V";YMULT 2.0;YOFF 0.0;YZERO 0.0',
+        'HOR:FASTFRAME:TIMESTAMP:ALL:CH1? 1,3': '"02 Mar 2016 23:59:59.999 999 999","03 Mar 2016 00:00:00.000 000 001",'
+                                                '"03 Mar 2016 00:00:01.000 000 000"'
+    }
+
+    res = make_resource(responses)
+    # Incomplete last frame is discarded
+    res.read_block.return_value = numpy.arange(14, dtype='>i1')
+
+    driver = d_5XXX7XXX(res)
+    driver.waitUntilReady = mock.MagicMock(return_value=True)
+
+    data = driver.acquireFastFrame(3)
+
+    assert_true(mock.call('HOR:FASTFRAME:COUNT 3') in res.write.call_args_list)
+    assert_true(mock.call('HOR:FASTFRAME:STATE ON') in res.write.call_args_list)
+    assert_true(mock.call('DATA:FRAMESTOP 3') in res.write.call_args_list)
+    assert_equal(res.read_block.call_count, 1)
+
+    assert_equal(data['CH1'].shape, (3, 4))
+    assert_equal(data['CH1'][2].tolist(), [16.0, 18.0, 20.0, 22.0])
+    assert_equal(data['Time'].tolist(), [-1.0, 0.0, 1.0, 2.0])
+    assert_true(numpy.allclose(data['Timestamps'], [0.0, 2e-9, 1.000000001], rtol=0, atol=1e-12))
+
+    # Repeated acquisitions with the same number of frames use the cached preamble
+    driver.acquireFastFrame(3)
+    preamble_queries = [c for c in res.query.call_args_list if 'WFMOUTPRE' in c[0][0]]
+    assert_equal(len(preamble_queries), 1)
+
+    driver.acquireFastFrame(2)
+    preamble_queries = [c for c in res.query.call_args_list if 'WFMOUTPRE' in c[0][0]]
+    assert_equal(len(preamble_queries), 2)
+
+
+def test_tektronix_measurements():
+    from labtronyx.drivers.Tektronix.Oscilloscope import d_5XXX7XXX
+
+    slots = {
+        1: ['1', 'RMS', 'CH1', '"V"', '0.707', '0.706', '0.7', '0.71', '0.002', '100'],
+        2: ['1', 'FREQUENCY', 'CH2', '"Hz"', '9.91E37', '1.0E3', '999.0', '1001.0', '0.5', '100']
+    }
+
+    def query(cmd):
+        resp = []
+        for slot in range(1, 9):
+            resp.extend(slots.get(slot, ['0'] + ['0'] * 9))
+        # Single query for all slots
+        assert_equal(len(cmd.split(';')), 80)
+        return ';'.join(resp)
+
+    res = mock.MagicMock()
+    res.query.side_effect = query
+
+    driver = d_5XXX7XXX(res)
+
+    assert_true(driver.setMeasurementSetup(Slot=2, Type='FREQUENCY', Source='CH2', State='ON'))
+    assert_true(mock.call('MEASU:MEAS2:TYPE FREQUENCY') in res.write.call_args_list)
+    assert_false(driver.setMeasurementSetup(Slot=9, Type='RMS'))
+
+    meas = driver.getMeasurements()
+
+    assert_equal(res.query.call_count, 1)
+    assert_equal(sorted(meas.keys()), ['MEAS1', 'MEAS2'])
+    assert_equal(meas['MEAS1']['Units'], 'V')
+    assert_equal(meas['MEAS1']['Value'], 0.707)
+    assert_equal(meas['MEAS1']['Count'], 100)
+    assert_true(meas['MEAS2']['Value'] != meas['MEAS2']['Value'])
+    assert_equal(meas['MEAS2']['Mean'], 1.0e3)
+
+
+def test_tektronix_search_marks():
+    import numpy
+    from labtronyx.drivers.Tektronix.Oscilloscope import d_5XXX7XXX
+
+    responses = {
+        'SEARCH:SEARCH1:TOTAL?': '3',
+        'SEARCH:SEARCH1:LIST?': '"SEARCH1",60.0,61.0;"SEARCH1",50.0,51.0;"SEARCH1",60.0,61.0',
+        'HOR:MODE:SCALE?;:HOR:POS?': '1.0;50.0',
+    }
+
+    res = make_resource(responses)
+
+    driver = d_5XXX7XXX(res)
+    driver.waitUntilReady = mock.MagicMock(return_value=True)
+
+    # Marks are read in bulk and deduplicated
+    marks = driver.getSearchMarks(Search=1)
+    assert_true(numpy.allclose(marks, [0.0, 1.0]))
+
+    # Firmware without the list query falls back to locating transitions in the waveform
+    responses.update({
+        'HOR:MODE:SCALE?;:HOR:MODE:SAMPLERATE?': '1.0;1.0',
+        'HEADER 1;:VERBOSE 1;:WFMOUTPRE?;:HEADER 0':
+            ':WFMOUTPRE:BYT_NR 1;XINCR 1.0;PT_OFF 0;YUNIT "V";YMULT 1.0;YOFF 0.0;YZERO 0.0',
+        'SEARCH:SEARCH1:TRIG:A:PULSE:SOURCE?': 'CH1',
+        'SEARCH:SEARCH1:TRIG:A:TRAN:THR:HIGH:CH1?;:SEARCH:SEARCH1:TRIG:A:TRAN:THR:LOW:CH1?;'
+        ':SEARCH:SEARCH1:TRIG:A:TRAN:POL:CH1?;:SEARCH:SEARCH1:TRIG:A:TRAN:DELTATIME?;'
+        ':SEARCH:SEARCH1:TRIG:A:TRAN:WHEN?': '8;2;POSITIVE;2.5;FASTERTHAN'
+    })
+
+    def query(cmd, **kwargs):
+        if cmd.endswith(':LIST?'):
+            raise labtronyx.InterfaceTimeout()
+        return responses.get(cmd, '0')
+
+    res.query.side_effect = query
+    # Fast rising edge at 2, slow rising edge at 7, falling edge at 5
+    res.read_block.return_value = numpy.array([0, 0, 10, 10, 10, 0, 0, 5, 5, 10], dtype='>i1')
+
+    driver = d_5XXX7XXX(res)
+    driver.waitUntilReady = mock.MagicMock(return_value=True)
+
+    marks = driver.getSearchMarks(Search=1)
+    assert_equal(marks.tolist(), [2.0])
+    assert_equal(res.clear.call_count, 1)
+
+    edges = driver.findTransitions('CH1', HighThreshold=8, LowThreshold=2)
+    assert_equal(edges.tolist(), [2.0, 5.0, 7.0])
+
+
+def test_b29xx_trace_buffer():
+    import numpy
+    from labtronyx.drivers.Agilent.SMU import d_B29XX
+
+    trace = numpy.zeros(6, dtype=d_B29XX.TRACE_DTYPE)
+    trace['voltage'] = numpy.arange(6)
+    trace['current'] = numpy.arange(6) * 1e-6
+    trace['time'] = numpy.arange(6) * 0.1
+
+    # Points recorded in the trace buffer each time it is checked
+    recorded = [2, 2, 5, 6]
+    request = {}
+
+    def query(cmd):
+        if cmd == ':TRAC1:POIN?;:TRAC1:POIN:ACT?':
+            return '+6;+0'
+        return str(recorded.pop(0) if len(recorded) > 1 else recorded[0])
+
+    def write(cmd):
+        if cmd.startswith(':TRAC1:DATA?'):
+            request['range'] = [int(x) for x in cmd.split()[1].split(',')]
+
+    def read_block(dtype):
+        offset, size = request['range']
+        return trace[offset:offset + size]
+
+    res = mock.MagicMock()
+    res.query.side_effect = query
+    res.write.side_effect = write
+    res.read_block.side_effect = read_block
+
+    driver = d_B29XX(res)
+    driver.TRACE_POLL_INTERVAL = 0.001
+
+    data = driver.getTraceBuffer(1, 1, 2)
+    res.read_block.assert_called_with(d_B29XX.TRACE_DTYPE)
+    assert_true(mock.call(':FORM REAL64') in res.write.call_args_list)
+    assert_equal(data['voltage'].tolist(), [1.0, 2.0])
+
+    chunks = list(driver.iterTraceBuffer(1, chunk_size=2))
+    assert_equal([len(chunk) for chunk in chunks], [2, 2, 2])
+    assert_equal(numpy.concatenate(chunks)['time'].tolist(), trace['time'].tolist())
+
+
+def test_b29xx_source_list():
+    import numpy
+    from labtronyx.common import ieee488
+    from labtronyx.drivers.Agilent.SMU import d_B29XX
+
+    points = numpy.linspace(0.0, 1.0, 1201)
+    assert_equal(ieee488.encode_block([1.0], '>f8'), '#18' + '\x3f\xf0' + '\x00' * 6)
+
+    def make_list_resource(list_points, error='+0,"No error"'):
+        return make_resource({':SOUR1:FUNC:MODE?': 'VOLT',
+                              ':SOUR1:LIST:VOLT:POIN?': lambda: str(list_points[0]),
+                              ':SYST:ERR?': error})
+
+    # Binary block upload
+    res = make_list_resource([len(points)])
+    driver = d_B29XX(res)
+    driver._mode_source = {}
+    driver.setSourceList(1, points)
+
+    res.write_block.assert_called_once_with(':SOUR1:LIST:VOLT', mock.ANY, '>f8')
+    assert_equal(res.write_block.call_args[0][1].tolist(), points.tolist())
+
+    # Instrument does not accept binary lists, so the list is sent as chunked ASCII appends
+    list_points = [0]
+    res = make_list_resource(list_points)
+
+    def write(cmd):
+        if cmd.startswith(':SOUR1:LIST:VOLT'):
+            list_points[0] = len(points)
+
+    res.write.side_effect = write
+
+    driver = d_B29XX(res)
+    driver._mode_source = {}
+    driver.setSourceList(1, points)
+
+    writes = [c[0][0] for c in res.write.call_args_list if c[0][0].startswith(':SOUR1:LIST:VOLT')]
+    assert_equal(len(writes), 3)
+    assert_true(writes[1].startswith(':SOUR1:LIST:VOLT:APP '))
+    assert_equal([float(x) for w in writes for x in w.split(' ')[1].split(',')], points.tolist())
+
+    # Binary support is only probed once
+    driver.setSourceList(1, points)
+    assert_equal(res.write_block.call_count, 1)
+
+    # A rejected block leaves the previous list in place, even if it has the same number of points
+    list_points = [len(points)]
+    res = make_list_resource(list_points, error='-104,"Data type error"')
+
+    driver = d_B29XX(res)
+    driver._mode_source = {}
+    driver.setSourceList(1, points)
+
+    assert_equal(driver._binary_lists, False)
+    writes = [c[0][0] for c in res.write.call_args_list if c[0][0].startswith(':SOUR1:LIST:VOLT')]
+    assert_equal(len(writes), 3)
+
+    # Once binary lists are known to work, a rejected block is an error
+    driver._binary_lists = True
+    assert_raises(RuntimeError, driver.setSourceList, 1, points)
+
+
+def test_3441xa_burst():
+    import numpy
+    from labtronyx.drivers.Agilent.Multimeter import d_3441XA
+
+    # Readings become available in reading memory over time
+    blocks = [numpy.arange(3, dtype='>f8'), numpy.array([], dtype='>f8'), numpy.arange(3, 5, dtype='>f8')]
+
+    res = mock.MagicMock()
+    res.query.return_value = '+0,"No error"'
+    res.read_block.side_effect = lambda dtype: blocks.pop(0)
+
+    driver = d_3441XA(res)
+    driver.BURST_POLL_INTERVAL = 0.001
+
+    data = driver.getBurst(5, sample_interval=0.5, timestamps=True)
+
+    assert_true(mock.call('FORM REAL,64') in res.write.call_args_list)
+    assert_true(mock.call('SAMP:COUN 5') in res.write.call_args_list)
+    assert_true(mock.call('SAMP:TIM 0.5') in res.write.call_args_list)
+    # Only the remaining readings are requested
+    assert_equal(res.write.call_args_list[-5], mock.call('R? 2'))
+
+    assert_equal(data['value'].tolist(), [0.0, 1.0, 2.0, 3.0, 4.0])
+    assert_equal(data['time'].tolist(), [0.0, 0.5, 1.0, 1.5, 2.0])
+
+    # Continuous bursts are streamed until stopped
+    res.read_block.side_effect = lambda dtype: numpy.ones(2, dtype='>f8')
+    driver.startBurst(2, triggers=0)
+    assert_true(mock.call('TRIG:COUN INF') in res.write.call_args_list)
+
+    stream = driver.iterBurst(block_size=2)
+    assert_equal([len(next(stream)) for x in range(3)], [2, 2, 2])
+    driver.abortBurst()
+
+    # No readings before the timeout
+    res.read_block.side_effect = lambda dtype: numpy.array([], dtype='>f8')
+    assert_raises(labtronyx.InterfaceTimeout, driver.getBurst, 1, timeout=0.01)
+
+    # Single ASCII readings are restored after a burst
+    for samples in [3, 2]:
+        blocks = [numpy.arange(2, dtype='>f8')]
+        res.read_block.side_effect = lambda dtype: blocks.pop(0) if blocks else numpy.array([], dtype='>f8')
+        try:
+            driver.getBurst(samples, timeout=0.01)
+        except labtronyx.InterfaceTimeout:
+            pass
+
+        writes = [c[0][0] for c in res.write.call_args_list]
+        assert_equal(writes[-4:], ['FORM ASC', 'SAMP:COUN 1', 'TRIG:COUN 1', 'SAMP:SOUR IMM'])
+
+        res.query.return_value = '+1.5E+00'
+        assert_equal(driver.getMeasurement(), 1.5)
+        res.query.return_value = '+0,"No error"'
+
+
+def test_335xx_arbitrary():
+    import numpy
+    from labtronyx.drivers.Agilent.FunctionGenerator import d_335XX
+
+    t = numpy.arange(100) / 100.0
+    wave = numpy.sin(2 * numpy.pi * t)
+
+    res = mock.MagicMock()
+    res.getProperties.return_value = {'deviceModel': '33522B'}
+    res.query.return_value = '"EXP_RISE.ARB"'
+
+    driver = d_335XX(res)
+    driver.open()
+    res.write.assert_any_call('FORM:BORD NORM')
+
+    # Floating point data is scaled to big-endian DAC codes
+    name = driver.uploadArbitraryWaveform(1, wave)
+    assert_true(driver.ARB_NAME_RE.match(name))
+
+    cmd, dac, dtype = res.write_block.call_args[0]
+    assert_equal(cmd, 'SOUR1:DATA:ARB:DAC %s,' % name)
+    assert_equal(dtype, '>i2')
+    assert_equal(dac.dtype.str, '>i2')
+    assert_equal(dac.max(), 32767)
+    assert_equal(dac.min(), -32767)
+
+    # Uploads of data already in volatile memory are skipped
+    assert_equal(driver.uploadArbitraryWaveform(1, wave), name)
+    assert_equal(driver.uploadArbitraryWaveform(1, numpy.round(wave * 32767).astype(int)), name)
+    assert_equal(res.write_block.call_count, 1)
+
+    # The other channel has separate memory
+    driver.uploadArbitraryWaveform(2, wave)
+    assert_equal(res.write_block.call_count, 2)
+
+    # Named waveforms keep their name when the upload is skipped
+    assert_equal(driver.uploadArbitraryWaveform(1, wave[::2], name='MYWAVE'), 'MYWAVE')
+    assert_equal(driver.uploadArbitraryWaveform(1, wave[::2], name='MYWAVE'), 'MYWAVE')
+    assert_equal(res.write_block.call_count, 3)
+
+    # Names in use by different data are rejected
+    assert_raises(ValueError, driver.uploadArbitraryWaveform, 1, -wave, name=name)
+    assert_raises(ValueError, driver.uploadArbitraryWaveform, 1, wave[:4])
+
+    # Waveforms uploaded in a previous session are known by name
+    session = mock.MagicMock()
+    session.getProperties.return_value = {'deviceModel': '33521B'}
+    session.query.return_value = '"EXP_RISE.ARB","%s"' % name.lower()
+
+    other = d_335XX(session)
+    other.open()
+    assert_equal(other.uploadArbitraryWaveform(1, wave), name)
+    assert_equal(session.write_block.call_count, 0)
+
+    # Sequences
+    driver.uploadSequence(1, 'seq', [name, (name, 5, 'repeatTilTrig')])
+    cmd, block = res.write_block.call_args[0]
+    assert_equal(cmd, 'SOUR1:DATA:SEQ')
+    assert_equal(block.tobytes(), '"seq","%s",1,repeat,maintain,10,"%s",5,repeatTilTrig,maintain,10' % (name, name))
+
+    driver.uploadSequence(1, 'seq', [name, (name, 5, 'repeatTilTrig')])
+    assert_equal(res.write_block.call_count, 4)
+    assert_raises(ValueError, driver.uploadSequence, 1, 'seq2', [(name, 1, 'forever')])
+
+    # Clearing volatile memory forgets uploaded waveforms
+    driver.clearArbitraryWaveforms(1)
+    driver.uploadArbitraryWaveform(1, wave)
+    assert_equal(res.write_block.call_count, 5)
@@ -1,11 +1,13 @@
 import unittest
 from nose.tools import * # PEP8 asserts
 import os
+import time
 
 import mock
 
 import labtronyx
 from labtronyx.bases import ResourceBase, InterfaceBase
+from labtronyx.common.breaker import CircuitBreaker
 
 
 def test_interfaces():
@@ -43,6 +45,98 @@ def test_interface_integration():
     manager._close()
 
 
+def make_transcript(transfers):
+    return {
+        'properties': {'resourceID': 'DEBUG'},
+        'transfers': [{'direction': direction, 'data': data, 'response': response, 'bytes': 0,
+                       'start': 0.0, 'end': 0.0, 'outcome': 'ok'} for direction, data, response in transfers]
+    }
+
+
+def test_replay_wait_for_opc():
+    from labtronyx.interfaces.i_Replay import r_Replay
+
+    manager = labtronyx.InstrumentManager()
+
+    # Recorded from a VISA resource waiting for a service request, and from a socket resource
+    transcript = make_transcript([('query', '*ESE?;*SRE?;*ESR?', '+4;+16;+0'),
+                                  ('write', '*ESE 1;*SRE 32;*OPC', ''),
+                                  ('query', '*ESR?', '+1'),
+                                  ('write', '*ESE 4;*SRE 16', ''),
+                                  ('query', '*OPC?', '1')])
+
+    res = r_Replay(manager=manager, resID='DEBUG', transcript=transcript)
+    res.configure(latency_scale=0)
+    res.open()
+
+    res.wait_for_opc()
+    res.wait_for_opc()
+    assert_equal(res.getConfiguration()['position'], 5)
+
+    # Status byte polls
+    res = r_Replay(manager=manager, resID='DEBUG2', transcript=make_transcript([('query', '*STB?', '0'),
+                                                                               ('query', '*STB?', '96')]))
+    res.configure(latency_scale=0)
+    res.open()
+
+    assert_equal(res.wait_for_srq(), 96)
+
+    manager._close()
+
+
+def test_replay_write_block():
+    import numpy
+    from labtronyx.interfaces.i_Replay import r_Replay
+
+    manager = labtronyx.InstrumentManager()
+
+    transcript = make_transcript([('write', 'DATA:ARB:DAC W1, #14\x00\x01\x7f\xff\r\n', ''),
+                                  ('write', 'DATA:ARB:DAC W2, #14\x00\x01\x7f\xff\n', '')])
+
+    res = r_Replay(manager=manager, resID='DEBUG', transcript=transcript)
+    res.configure(latency_scale=0)
+    res.open()
+
+    # Write termination is taken from the transcript
+    res.write_block('DATA:ARB:DAC W1,', numpy.array([1, 32767], dtype='>i2'), '>i2')
+    res.write_block('DATA:ARB:DAC W2,', [1, 32767], '>i2')
+
+    res.rewind()
+    assert_raises(labtronyx.InterfaceError, res.write_block, 'DATA:ARB:DAC W1,', [1, 32766], '>i2')
+
+    manager._close()
+
+
+def test_replay_coalesce_limit():
+    from labtronyx.interfaces.i_Replay import r_Replay
+
+    manager = labtronyx.InstrumentManager()
+
+    # Recorded with a small coalescing limit
+    transcript = make_transcript([('write', 'SYST:A 1;:SYST:B 2', ''), ('write', 'SYST:C 3', '')])
+    transcript['configuration'] = {'coalesce_limit': 20}
+
+    res = r_Replay(manager=manager, resID='DEBUG', transcript=transcript)
+    res.configure(latency_scale=0)
+    res.open()
+
+    def session():
+        with res.coalesce():
+            res.write('SYST:A 1')
+            res.write('SYST:B 2')
+            res.write('SYST:C 3')
+
+    session()
+    assert_equal(res.getConfiguration()['position'], 2)
+
+    # Configuration overrides the recorded limit
+    res.rewind()
+    res.configure(coalesce_limit=1024)
+    assert_raises(labtronyx.InterfaceError, session)
+
+    manager._close()
+
+
 class VISA_Sim_Tests(unittest.TestCase):
 
     @classmethod
@@ -86,6 +180,425 @@ class VISA_Sim_Tests(unittest.TestCase):
         self.check_get_configuration(test_res)
         self.check_ops_error_while_closed(test_res)
 
+    def test_reconcile(self):
+        res_id = 'USB0::2391::12345::SIM::0::INSTR'
+        devices = self.i_visa.list_devices()
+        self.i_visa.enumerate()
+
+        # Nothing changed since the last enumeration
+        self.assertEqual(self.i_visa.reconcile(), ([], []))
+
+        res_uuid = self.i_visa.resources_by_id[res_id].uuid
+
+        self.i_visa.list_devices = lambda: [dev for dev in devices if dev != res_id]
+        try:
+            with mock.patch.object(self.manager, '_publishEvent') as publish:
+                created, destroyed = self.i_visa.reconcile()
+
+        finally:
+            del self.i_visa.list_devices
+
+        self.assertEqual(created, [])
+        self.assertEqual(destroyed, [res_uuid])
+        self.assertNotIn(res_id, self.i_visa.resources_by_id)
+        self.assertEqual(publish.call_args_list, [
+            mock.call(labtronyx.EventCodes.resource.destroyed, res_uuid),
+            mock.call(labtronyx.EventCodes.interface.changed, 'VISA', [], [res_uuid])
+        ])
+
+        with mock.patch.object(self.manager, '_publishEvent') as publish:
+            created, destroyed = self.i_visa.reconcile()
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(destroyed, [])
+        self.assertEqual(self.i_visa.resources_by_id[res_id].uuid, created[0])
+        self.assertEqual(publish.call_args_list, [
+            mock.call(labtronyx.EventCodes.resource.created, created[0]),
+            mock.call(labtronyx.EventCodes.interface.changed, 'VISA', created, [])
+        ])
+
+        # Deprecated alias of getResource
+        self.i_visa._destroyResource(self.i_visa.resources_by_id[res_id])
+        res_obj = self.i_visa.openResource(res_id)
+        self.assertEqual(res_obj.resID, res_id)
+        self.assertIs(self.i_visa.resources_by_id[res_id], res_obj)
+
+    def test_reconcile_not_implemented(self):
+        # Errors raised by the hooks are not mistaken for a missing hook
+        with mock.patch.object(type(self.i_visa), 'list_devices', side_effect=NotImplementedError):
+            with self.assertRaises(NotImplementedError):
+                self.i_visa.refresh()
+
+        # Interfaces without enumeration hooks cannot be reconciled
+        interface = InterfaceBase(self.manager)
+        with self.assertRaises(NotImplementedError):
+            interface.reconcile()
+
+        interface.refresh()
+
+    def test_read_block(self):
+        test_res = self.manager.findResources(interfaceName='VISA', resourceID='USB0::2391::12345::SIM::0::INSTR')[0]
+        test_res.open()
+
+        try:
+            test_res.write('CURV?')
+            data = test_res.read_block('>u2')
+            self.assertEqual(data.tolist(), [0x4142, 0x4344, 0x4546, 0x4748])
+
+            # Read into a preallocated buffer
+            buf = bytearray(16)
+            test_res.write('CURV?')
+            data = test_res.read_block('B', into=buf)
+            self.assertEqual(data.tobytes(), 'ABCDEFGH')
+            self.assertEqual(str(buf[:8]), 'ABCDEFGH')
+
+            # Message terminator must be consumed
+            self.assertEqual(test_res.query('*IDN?'), 'TASTY TESTER,ALPHA-1,12345,SIM')
+
+            # Termination characters in the payload do not end the block
+            test_res.write('CURV:TERM?')
+            self.assertEqual(test_res.read_block('B').tobytes(), 'A\r')
+            self.assertEqual(test_res.query('*IDN?'), 'TASTY TESTER,ALPHA-1,12345,SIM')
+
+        finally:
+            test_res.close()
+
+    def test_trace(self):
+        import tempfile
+        import csv
+
+        test_res = self.manager.findResources(interfaceName='VISA', resourceID='USB0::2391::12345::SIM::0::INSTR')[0]
+        test_res.open()
+
+        try:
+            test_res.query('*IDN?')
+            self.assertEqual(test_res.getTrace(), [])
+
+            test_res.enableTrace(size=3, data_length=4)
+            test_res.query('*IDN?')
+            test_res.write('CURV?')
+            test_res.read_block()
+
+            trace = test_res.getTrace()
+            self.assertEqual([entry['direction'] for entry in trace], ['query', 'write', 'read'])
+            self.assertEqual(trace[0]['data'], '*IDN...')
+            self.assertEqual(trace[0]['response'], 'TAST...')
+            self.assertEqual(trace[0]['bytes'], 5 + 30)
+            self.assertEqual(trace[2]['bytes'], 8)
+            for entry in trace:
+                self.assertEqual(entry['outcome'], 'ok')
+                self.assertLessEqual(entry['start'], entry['end'])
+
+            # Ring buffer
+            test_res.write('*CLS')
+            self.assertEqual(len(test_res.getTrace()), 3)
+            self.assertEqual(test_res.getTrace()[-1]['data'], '*CLS')
+
+            fd, filename = tempfile.mkstemp(suffix='.csv')
+            os.close(fd)
+            try:
+                test_res.exportTrace(filename)
+                with open(filename, 'rb') as f:
+                    self.assertEqual(len(list(csv.DictReader(f))), 3)
+            finally:
+                os.remove(filename)
+
+            # Failed transfers are recorded
+            test_res.close()
+            self.assertRaises(labtronyx.ResourceNotOpen, test_res.write, '*CLS')
+            self.assertEqual(test_res.getTrace()[-1]['outcome'], 'ResourceNotOpen')
+
+            test_res.disableTrace()
+            self.assertEqual(test_res.getTrace(), [])
+
+        finally:
+            test_res.disableTrace()
+            test_res.close()
+
+    def test_record_replay(self):
+        import tempfile
+
+        test_res = self.manager.findResources(interfaceName='VISA', resourceID='USB0::2391::12345::SIM::0::INSTR')[0]
+
+        fd, filename = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+
+        def session(res):
+            res.open()
+            try:
+                idn = res.query('*IDN?')
+                res.write('CURV?')
+                block = res.read_block('>u2').tolist()
+                with res.coalesce():
+                    res.write('SYST:A 1')
+                    res.write('SYST:B 2')
+                    res.write('*CLS')
+                    coalesced = res.query('SYST:C?')
+                return idn, block, coalesced
+            finally:
+                res.close()
+
+        try:
+            test_res.startRecording()
+            expected = session(test_res)
+            transcript = test_res.stopRecording(filename)
+            self.assertEqual(len(transcript['transfers']), 4)
+            self.assertEqual(transcript['properties']['resourceID'], 'USB0::2391::12345::SIM::0::INSTR')
+            self.assertEqual(transcript['configuration'], {'coalesce_writes': False, 'coalesce_limit': 1024})
+
+            replay_res = self.manager.getResource('Replay', filename)
+            try:
+                self.assertEqual(replay_res.getProperties()['deviceSerial'], test_res.getProperties()['deviceSerial'])
+
+                replay_res.configure(latency_scale=0)
+                self.assertEqual(session(replay_res), expected)
+
+                # Transfers that do not match the transcript
+                replay_res.rewind()
+                replay_res.open()
+                self.assertRaises(labtronyx.InterfaceError, replay_res.query, '*RST')
+
+            finally:
+                self.manager.plugin_manager.destroyPluginInstance(replay_res.uuid)
+
+        finally:
+            os.remove(filename)
+
+    def test_adaptive_timeout(self):
+        test_res = self.manager.findResources(interfaceName='VISA', resourceID='USB0::2391::12345::SIM::0::INSTR')[0]
+        test_res.enableAdaptiveTimeout(samples=3)
+        test_res.open()
+
+        try:
+            for x in range(3):
+                self.assertEqual(test_res.query('*IDN?'), 'TASTY TESTER,ALPHA-1,12345,SIM')
+
+            stats = test_res.getLatencyStatistics()
+            self.assertEqual(stats['*IDN?']['samples'], 3)
+
+            # Timeout is set from the observed latency
+            test_res.query('*IDN?')
+            self.assertEqual(test_res._applied['timeout'], int(stats['*IDN?']['timeout'] * 1000))
+
+            # Explicit timeout takes priority
+            test_res.query('*IDN?', timeout=1.5)
+            self.assertEqual(test_res._applied['timeout'], 1500)
+
+            # Configured timeout is restored when adaptive timeouts are disabled
+            test_res.disableAdaptiveTimeout()
+            test_res.query('*IDN?')
+            self.assertEqual(test_res._applied['timeout'], test_res.getConfiguration()['timeout'])
+            self.assertEqual(test_res.getLatencyStatistics(), {})
+
+        finally:
+            test_res.close()
+            test_res.disableAdaptiveTimeout()
+
+    def test_circuit_breaker(self):
+        test_res = self.manager.findResources(interfaceName='VISA', resourceID='USB0::2391::12345::SIM::0::INSTR')[0]
+        test_res.open()
+
+        try:
+            # Disabled by default, expected timeouts do not make the resource fail fast
+            for x in range(5):
+                with self.assertRaises(labtronyx.InterfaceTimeout):
+                    test_res.read(timeout=0.01)
+
+            self.assertEqual(test_res.getHealth(), 'closed')
+            self.assertEqual(test_res.query('*IDN?'), 'TASTY TESTER,ALPHA-1,12345,SIM')
+
+        finally:
+            test_res.close()
+
+        test_res.enableCircuitBreaker(threshold=2, reset_timeout=0.2)
+        test_res.open()
+
+        try:
+            for x in range(2):
+                with self.assertRaises(labtronyx.InterfaceTimeout):
+                    test_res.read(timeout=0.05)
+
+            self.assertEqual(test_res.getProperties()['health'], 'open')
+
+            # Fail fast while open
+            start = time.time()
+            with self.assertRaises(labtronyx.InterfaceTimeout):
+                test_res.query('*IDN?')
+            self.assertLess(time.time() - start, 0.05)
+
+            # Background probe closes the breaker
+            time.sleep(0.5)
+            self.assertEqual(test_res.getHealth(), 'closed')
+            self.assertEqual(test_res.query('*IDN?'), 'TASTY TESTER,ALPHA-1,12345,SIM')
+
+        finally:
+            test_res.close()
+            test_res.disableCircuitBreaker()
+
+    def test_circuit_breaker_trial(self):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0.0)
+        breaker.timeout()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        # Only one transfer is allowed through while half-open
+        breaker.allow()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(labtronyx.InterfaceTimeout):
+            breaker.allow()
+
+        # Trial failed without timing out, the next transfer is the trial
+        breaker.release()
+        breaker.allow()
+        breaker.success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.allow()
+        breaker.allow()
+
+    def test_wait_for_srq(self):
+        test_res = self.manager.findResources(interfaceName='VISA', resourceID='USB0::2391::12345::SIM::0::INSTR')[0]
+        test_res.open()
+
+        try:
+            # Status byte is polled if the session does not support service request events
+            with mock.patch.object(test_res.instrument, 'enable_event', side_effect=NotImplementedError), \
+                    mock.patch.object(test_res.instrument, 'read_stb', side_effect=[0, 0, 0x50]):
+                self.assertEqual(test_res.wait_for_srq(1.0), 0x50)
+
+            with mock.patch.object(test_res.instrument, 'read_stb', return_value=0):
+                with self.assertRaises(labtronyx.InterfaceTimeout):
+                    test_res.wait_for_srq(0.01)
+
+            def patch_events(delivered, stb):
+                test_res._srq_events = None
+                return mock.patch.multiple(test_res.instrument, enable_event=mock.DEFAULT,
+                                           discard_events=mock.DEFAULT,
+                                           wait_on_event=mock.Mock(return_value=mock.Mock(timed_out=not delivered)),
+                                           read_stb=mock.Mock(side_effect=stb))
+
+            # Events that are accepted but never delivered are not waited on
+            with patch_events(False, [0, 0x50]):
+                self.assertEqual(test_res.wait_for_srq(1.0), 0x50)
+                test_res.instrument.wait_on_event.assert_called_once_with(mock.ANY, 0, capture_timeout=True)
+            self.assertFalse(test_res._srq_delivered)
+
+            # Events are waited on once one has been delivered
+            with patch_events(True, [0x50, 0x50]):
+                self.assertEqual(test_res.wait_for_srq(1.0), 0x50)
+                self.assertTrue(test_res._srq_delivered)
+
+                self.assertEqual(test_res.wait_for_srq(1.0), 0x50)
+                self.assertNotEqual(test_res.instrument.wait_on_event.call_args[0][1], 0)
+
+            # The status byte is checked if no event is delivered, and polled from then on
+            with patch_events(False, [0x50]):
+                self.assertEqual(test_res.wait_for_srq(0.01), 0x50)
+            self.assertFalse(test_res._srq_delivered)
+
+        finally:
+            test_res.close()
+
+    def test_wait_for_opc(self):
+        test_res = self.manager.findResources(interfaceName='VISA', resourceID='USB0::2391::12345::SIM::0::INSTR')[0]
+        test_res.open()
+
+        try:
+            # The *OPC? query is used until a service request event has been delivered
+            with mock.patch.object(test_res, 'query', return_value='1') as mock_query:
+                test_res.wait_for_opc(1.0)
+                mock_query.assert_called_once_with('*OPC?', timeout=1.0)
+
+            test_res._srq_delivered = True
+
+            with mock.patch.object(test_res, 'query', return_value='+4;+16;+0') as mock_query, \
+                    mock.patch.object(test_res, 'write') as mock_write, \
+                    mock.patch.object(test_res, 'wait_for_srq', side_effect=[0x60, labtronyx.InterfaceTimeout]):
+                test_res.wait_for_opc(1.0)
+
+                mock_query.assert_any_call('*ESE?;*SRE?;*ESR?')
+                self.assertEqual(mock_write.call_args_list, [mock.call('*ESE 1;*SRE 32;*OPC'),
+                                                             mock.call('*ESE 4;*SRE 16')])
+
+                # Event enables are restored if the operation does not complete
+                mock_write.reset_mock()
+                with self.assertRaises(labtronyx.InterfaceTimeout):
+                    test_res.wait_for_opc(0.01)
+                self.assertEqual(mock_write.call_args_list[-1], mock.call('*ESE 4;*SRE 16'))
+
+        finally:
+            test_res.close()
+
+    def test_coalesce(self):
+        test_res = self.manager.findResources(interfaceName='VISA', resourceID='USB0::2391::12345::SIM::0::INSTR')[0]
+        test_res.open()
+
+        try:
+            with mock.patch.object(test_res.instrument, 'write', wraps=test_res.instrument.write) as mock_write:
+                with test_res.coalesce():
+                    test_res.write('SYST:A 1')
+                    test_res.write('SYST:B 2')
+                    test_res.write('*CLS')
+
+                    self.assertFalse(mock_write.called)
+
+                    # Pending commands are sent with the query
+                    self.assertEqual(test_res.query('SYST:C?'), 'COALESCED')
+
+            # Automatic mode
+            test_res.configure(coalesce_writes=True)
+            test_res.write('SYST:A 1')
+            test_res.write('SYST:B 2')
+            test_res.write('*CLS')
+            self.assertEqual(test_res.query('SYST:C?'), 'COALESCED')
+
+        finally:
+            test_res.configure(coalesce_writes=False)
+            test_res.close()
+
+    def test_coalesce_threads(self):
+        import threading
+
+        test_res = self.manager.findResources(interfaceName='VISA', resourceID='USB0::2391::12345::SIM::0::INSTR')[0]
+        test_res.open()
+
+        try:
+            with mock.patch.object(test_res.instrument, 'write') as mock_write:
+                thread = threading.Thread(target=test_res.write, args=('SYST:C 3',))
+
+                with test_res.coalesce():
+                    test_res.write('SYST:A 1')
+
+                    # Writes from other threads are not coalesced with the commands of this context
+                    thread.start()
+                    time.sleep(0.1)
+
+                    test_res.write('SYST:B 2')
+
+                thread.join(1.0)
+
+                self.assertEqual(mock_write.call_args_list, [mock.call('SYST:A 1;:SYST:B 2'), mock.call('SYST:C 3')])
+
+        finally:
+            test_res.close()
+
+    def test_configure_changes_only(self):
+        test_res = self.manager.findResources(interfaceName='VISA', resourceID='USB0::2391::12345::SIM::0::INSTR')[0]
+        test_res.open()
+
+        try:
+            with mock.patch.object(test_res.instrument, 'set_visa_attribute',
+                                   wraps=test_res.instrument.set_visa_attribute) as mock_set:
+                test_res.configure(timeout=2000)
+                self.assertFalse(mock_set.called)
+
+                test_res.configure(timeout=1000)
+                self.assertEqual(mock_set.call_count, 1)
+
+        finally:
+            test_res.configure(timeout=2000)
+            test_res.close()
+
+        self.assertIn('timeout', test_res.getSessionProfile())
+
     def check_get_configuration(self, test_res):
         # Get configuration
         res_conf = test_res.getConfiguration()
@@ -191,4 +704,241 @@ class Serial_Tests(unittest.TestCase):
 
         test_res.configure(**conf)
 
-        self.assertDictContainsSubset(conf, test_res.getConfiguration())
\ No newline at end of file
+        self.assertDictContainsSubset(conf, test_res.getConfiguration())
+
+    def test_buffered_read(self):
+        if not hasattr(os, 'openpty'):
+            self.skipTest("Pseudo-terminals not supported")
+
+        master, slave = os.openpty()
+
+        i_serial = [int_obj for int_obj in self.manager.interfaces.values() if int_obj.interfaceName == 'Serial'][0]
+        test_res = i_serial.getResource(os.ttyname(slave))
+        test_res.open()
+
+        try:
+            # Terminated messages split across reads
+            os.write(master, 'HELLO\r\nWOR')
+            self.assertEqual(test_res.read(), 'HELLO')
+            os.write(master, 'LD\r\n')
+            self.assertEqual(test_res.read(), 'WORLD')
+
+            # Fixed length frames
+            os.write(master, '\xA5\x02\x00\x01\x02')
+            self.assertEqual(test_res.read_raw(3), '\xA5\x02\x00')
+            self.assertEqual(test_res.read_raw(2), '\x01\x02')
+
+            # Binary blocks
+            os.write(master, '#14ABCD\r\n')
+            self.assertEqual(test_res.read_block('B').tobytes(), 'ABCD')
+
+            test_res.configure(timeout=0.1)
+            with self.assertRaises(labtronyx.InterfaceTimeout):
+                test_res.read()
+
+        finally:
+            test_res.close()
+            self.manager.plugin_manager.destroyPluginInstance(test_res.uuid)
+            os.close(master)
+            os.close(slave)
+
+    def test_query_async(self):
+        if not hasattr(os, 'openpty'):
+            self.skipTest("Pseudo-terminals not supported")
+
+        i_serial = [int_obj for int_obj in self.manager.interfaces.values() if int_obj.interfaceName == 'Serial'][0]
+
+        ptys = [os.openpty() for i in range(4)]
+        resources = [i_serial.getResource(os.ttyname(slave)) for master, slave in ptys]
+
+        try:
+            for test_res in resources:
+                test_res.open()
+
+            futures = [test_res.query_async('*IDN?') for test_res in resources]
+
+            # Respond in reverse order to make sure ports are serviced independently
+            for idx, (master, slave) in reversed(list(enumerate(ptys))):
+                self.assertEqual(os.read(master, 64), '*IDN?\r\n')
+                os.write(master, 'DEVICE %d\r\n' % idx)
+
+            for idx, future in enumerate(futures):
+                self.assertEqual(future.result(timeout=2.0), 'DEVICE %d' % idx)
+
+            # No response
+            future = resources[0].query_async('*IDN?', timeout=0.1)
+            with self.assertRaises(labtronyx.InterfaceTimeout):
+                future.result(timeout=2.0)
+
+        finally:
+            for test_res in resources:
+                test_res.close()
+                self.manager.plugin_manager.destroyPluginInstance(test_res.uuid)
+
+            for master, slave in ptys:
+                os.close(master)
+                os.close(slave)
+
+    def test_query_async_engine_stopped(self):
+        if not hasattr(os, 'openpty'):
+            self.skipTest("Pseudo-terminals not supported")
+
+        import select
+        import threading
+
+        master, slave = os.openpty()
+
+        i_serial = [int_obj for int_obj in self.manager.interfaces.values() if int_obj.interfaceName == 'Serial'][0]
+        test_res = i_serial.getResource(os.ttyname(slave))
+
+        try:
+            test_res.open()
+
+            engine = i_serial.engine
+            future = test_res.query_async('*IDN?')
+
+            # The request is in progress once it has been sent
+            self.assertEqual(os.read(master, 64), '*IDN?\r\n')
+
+            i_serial._engine = None
+            engine.stop()
+
+            with self.assertRaises(labtronyx.InterfaceError):
+                future.result(timeout=2.0)
+
+            # The resource can be used after the engine has stopped
+            result = {}
+            thread = threading.Thread(target=lambda: result.update(resp=test_res.query('*IDN?')))
+            thread.setDaemon(True)
+            thread.start()
+
+            readable, _, _ = select.select([master], [], [], 2.0)
+            self.assertEqual(readable, [master])
+            self.assertEqual(os.read(master, 64), '*IDN?\r\n')
+            os.write(master, 'DEVICE\r\n')
+
+            thread.join(2.0)
+            self.assertEqual(result.get('resp'), 'DEVICE')
+
+        finally:
+            test_res.close()
+            self.manager.plugin_manager.destroyPluginInstance(test_res.uuid)
+            os.close(master)
+            os.close(slave)
+
+
+class FakeSCPIServer(object):
+    """
+    Minimal raw socket SCPI instrument. Responds to queries using a dictionary of responses.
+    """
+    RESPONSES = {
+        '*IDN?': 'FAKE INSTRUMENTS,MODEL 1,12345,1.0',
+        'CURV?': '#18ABCDEFGH',
+        'SYST:A 1;:SYST:B 2;*CLS;:SYST:C?': 'COALESCED'
+    }
+
+    def __init__(self):
+        import socket
+        import threading
+
+        self.connections = 0
+        self.commands = []
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(4)
+        self.port = self.sock.getsockname()[1]
+
+        self.thread = threading.Thread(target=self._accept)
+        self.thread.setDaemon(True)
+        self.thread.start()
+
+    def close(self):
+        self.sock.close()
+
+    def _accept(self):
+        import socket
+        import threading
+
+        while True:
+            try:
+                conn, addr = self.sock.accept()
+            except socket.error:
+                return
+
+            self.connections += 1
+
+            thread = threading.Thread(target=self._serve, args=(conn,))
+            thread.setDaemon(True)
+            thread.start()
+
+    def _serve(self, conn):
+        f = conn.makefile('rb')
+
+        for line in f:
+            cmd = line.rstrip('\n')
+            self.commands.append(cmd)
+
+            if cmd in self.RESPONSES:
+                conn.sendall(self.RESPONSES[cmd] + '\n')
+
+        conn.close()
+
+
+class Socket_Tests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.manager = labtronyx.InstrumentManager()
+        cls.server = FakeSCPIServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.manager._close()
+        cls.server.close()
+
+    def setUp(self):
+        if 'Socket' not in self.manager.listInterfaces():
+            self.skipTest('Socket interface not enabled')
+
+    def test_get_resource_invalid(self):
+        with self.assertRaises(labtronyx.ResourceUnavailable):
+            self.manager.getResource('Socket', '127.0.0.1:1')
+
+    def test_resource_api(self):
+        test_res = self.manager.getResource('Socket', '127.0.0.1:%d' % self.server.port)
+
+        try:
+            self.assertEqual(test_res.getProperties().get('deviceVendor'), 'FAKE INSTRUMENTS')
+
+            test_res.open()
+            self.assertEqual(test_res.query('*IDN?'), 'FAKE INSTRUMENTS,MODEL 1,12345,1.0')
+
+            test_res.write('CURV?')
+            self.assertEqual(test_res.read_block('>u2').tolist(), [0x4142, 0x4344, 0x4546, 0x4748])
+
+            with test_res.coalesce():
+                test_res.write('SYST:A 1')
+                test_res.write('SYST:B 2')
+                test_res.write('*CLS')
+                self.assertEqual(test_res.query('SYST:C?'), 'COALESCED')
+
+            # No response
+            test_res.configure(timeout=100)
+            with self.assertRaises(labtronyx.InterfaceTimeout):
+                test_res.query('NOTHING?')
+
+            test_res.configure(timeout=2000)
+            test_res.close()
+
+            with self.assertRaises(labtronyx.ResourceNotOpen):
+                test_res.write('*CLS')
+
+            # Connection is reused
+            test_res.open()
+            test_res.write('*CLS')
+            self.assertEqual(test_res.query('*IDN?'), 'FAKE INSTRUMENTS,MODEL 1,12345,1.0')
+            self.assertEqual(self.server.connections, 1)
+
+        finally:
+            test_res.close()
+            self.manager.plugin_manager.destroyPluginInstance(test_res.uuid)
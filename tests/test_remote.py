@@ -355,4 +355,41 @@ class Remote_Tests(unittest.TestCase):
 
         else:
             time_delta = self.time_set - time_publish
-            self.assertLess(time_delta, 1.0)
\ No newline at end of file
+            self.assertLess(time_delta, 1.0)
+
+
+def test_rpc_local_only():
+    import json
+    from labtronyx.common.rpc import local_only
+    from labtronyx.common.server import create_server
+
+    class Target(object):
+        def getValue(self):
+            return 1
+
+        @local_only
+        def iterValues(self):
+            yield 1
+
+    manager = mock.MagicMock()
+    manager.plugin_manager.getPluginInstance.return_value = Target()
+
+    client = create_server(manager, 0).test_client()
+
+    # Local only methods are not listed
+    methods = json.loads(client.get('/rpc/target').data)['methods']
+    assert_equal(methods, ['getValue'])
+
+    # Local only methods are not dispatched
+
+    def call(method):
+        req = '{"jsonrpc": "2.0", "method": "%s", "params": [], "id": 1}' % method
+        resp = client.post('/rpc/target', data=req, headers={'Content-Type': 'application/json'})
+        return jsonrpc.decode(resp.data)
+
+    _, rpc_resp, rpc_err = call('getValue')
+    assert_equal(rpc_resp[0].result, 1)
+
+    _, rpc_resp, rpc_err = call('iterValues')
+    assert_equal(len(rpc_resp), 0)
+    assert_equal(len(rpc_err), 1)
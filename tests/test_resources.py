@@ -1,4 +1,6 @@
 import unittest
+import threading
+import time
 from nose.tools import * # PEP8 asserts
 
 import mock
@@ -34,4 +36,116 @@ def test_resource_integration():
     manager.plugin_manager._plugins_instances[res.uuid] = res
 
     dev = manager.findInstruments(resourceID='DEBUG')
-    assert_equal(len(dev), 1)
\ No newline at end of file
+    assert_equal(len(dev), 1)
+
+
+def test_resource_submit():
+    manager = labtronyx.InstrumentManager()
+
+    res = ResourceBase(manager=manager, resID='DEBUG')
+    res.interfaceName = 'Test'
+
+    executed = []
+    res.write = lambda data: executed.append(data)
+
+    # Block the I/O worker until all operations have been queued
+    started = threading.Event()
+    release = threading.Event()
+    res.block = lambda: started.set() or release.wait()
+
+    res.submit('block')
+    started.wait(1.0)
+
+    futures = [res.write_async('BULK', priority=res.PRIORITY_BULK),
+               res.write_async('NORMAL'),
+               res.write_async('INTERACTIVE', priority=res.PRIORITY_INTERACTIVE),
+               res.write_async('EXPIRED', priority=res.PRIORITY_INTERACTIVE, timeout=0.0)]
+    release.set()
+
+    for future in futures[:3]:
+        future.result(timeout=1.0)
+
+    assert_raises(labtronyx.InterfaceTimeout, futures[3].result, 1.0)
+    assert_equal(executed, ['INTERACTIVE', 'NORMAL', 'BULK'])
+
+    res.close()
+    manager._close()
+
+
+def test_resource_close_in_flight():
+    manager = labtronyx.InstrumentManager()
+
+    res = ResourceBase(manager=manager, resID='DEBUG')
+    res.interfaceName = 'Test'
+    res.echo = lambda data: data
+
+    closing = threading.Event()
+
+    class GatedLock(object):
+        # The I/O worker waits until the closing thread has taken the lock, if it takes the lock at all
+        def __init__(self):
+            self._lock = threading.RLock()
+
+        def __enter__(self):
+            if threading.current_thread().name.startswith('Labtronyx-IO'):
+                closing.wait(0.5)
+            else:
+                closing.set()
+            self._lock.acquire()
+
+        def __exit__(self, *args):
+            self._lock.release()
+
+    res._io_lock = GatedLock()
+
+    # Operation has been taken from the queue when the resource is released
+    future = res.submit('echo', ('DATA',))
+    time.sleep(0.05)
+
+    closer = threading.Thread(target=res.requestRelease)
+    closer.setDaemon(True)
+    closer.start()
+
+    # The operation in progress completes before the resource is closed
+    closer.join(2.0)
+    assert_false(closer.is_alive())
+    assert_equal(future.result(timeout=1.0), 'DATA')
+
+    manager._close()
+
+
+def test_resource_session_manager():
+    manager = labtronyx.InstrumentManager()
+
+    res = ResourceBase(manager=manager, resID='DEBUG')
+    res.interfaceName = 'Test'
+
+    state = {'open': False}
+    res.isOpen = lambda: state['open']
+    res.open = mock.Mock(side_effect=lambda: state.update(open=True))
+    res.close = mock.Mock(side_effect=lambda: state.update(open=False))
+
+    res.enableSessionManager(idle_timeout=0.1)
+
+    # Opened on first use, closed when idle
+    res._sessionUse()
+    assert_true(res.isOpen())
+    time.sleep(0.3)
+    assert_false(res.isOpen())
+    assert_equal(res.open.call_count, 1)
+
+    # Kept open while in use by nested users
+    with res:
+        with res:
+            pass
+        time.sleep(0.3)
+        assert_true(res.isOpen())
+
+    # Released immediately on request
+    with res:
+        res.requestRelease()
+        assert_true(res.isOpen())
+    assert_false(res.isOpen())
+
+    res.disableSessionManager()
+    manager._close()